@@ -1,28 +1,108 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from fastapi.responses import JSONResponse
+from typing import Any, Callable, Union
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.orm.exc import StaleDataError
+from starlette.concurrency import run_in_threadpool
 from config.settings import settings
 
-engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+from app.db_pool import async_database_url, build_engines, build_replica_engines, configure_sqlite, engine_options, instrument_engine, uses_sqlite_profile
+from app.db_routing import RecentWriters, RoutingSession, client_keys
+
+# With the SQLite profile, engine is the single writer connection and read_engine a pool of readers; otherwise they are the same engine.
+engine, read_engine = build_engines(settings.DATABASE_URL)
+local_readers = [read_engine] if read_engine is not engine else []
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)  # get_db picks the readers per request.
 Base = declarative_base()
 
-# Importing model modules to ensure declarative models are registered with Base.metadata
-import app.models.user  # Registering User model
-import app.models.chef  # Registering Chef model
-import app.models.client  # Registering Client model
-import app.models.booking  # Registering Booking model
+AnySession = Union[Session, AsyncSession]
+
+# With DATABASE_ASYNC, requests talk to the database through aiosqlite/asyncpg on the event loop instead of a threadpool worker.
+async_engine = create_async_engine(async_database_url(settings.DATABASE_URL), **engine_options(settings.DATABASE_URL, is_async=True)) if settings.DATABASE_ASYNC else None
+if async_engine is not None:
+    instrument_engine(async_engine.sync_engine)
+    if uses_sqlite_profile(settings.DATABASE_URL):
+        configure_sqlite(async_engine.sync_engine)  # Pragmas only; the async mode keeps a single pool.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, sync_session_class=RoutingSession) if async_engine is not None else None
+
+# GET requests read from a random replica unless the client wrote within REPLICA_STICKY_SECONDS; everything else uses the primary.
+replica_engines = build_replica_engines(settings.DATABASE_REPLICA_URLS, is_async=async_engine is not None)
+recent_writers = RecentWriters(settings.REPLICA_STICKY_SECONDS)
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
 
+def request_readers(request: Request, keys) -> list:
+    """Engines this request may read from: replicas for fresh-enough GETs, else the primary's own readers."""
+    if replica_engines and request.method in READ_ONLY_METHODS and not recent_writers.wrote_recently(keys):
+        return [replica.sync_engine if async_engine is not None else replica for replica in replica_engines]
+    return [] if async_engine is not None else local_readers
 
-def get_db():
-    db = SessionLocal()
+
+async def get_db(request: Request):
+    keys = client_keys(request) if replica_engines else ()
+    readers = request_readers(request, keys)
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal(readers=readers) as db:
+            try:
+                yield db
+            finally:
+                if db.sync_session.wrote:
+                    recent_writers.record(keys)  # Their next reads go to the primary until replicas catch up.
+        return
+    db = SessionLocal(readers=readers)
     try:
         yield db
     finally:
+        if db.wrote:
+            recent_writers.record(keys)  # Their next reads go to the primary until replicas catch up.
         db.close()
 
 
+async def run_db(db: AnySession, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run fn(session, *args, **kwargs), the ORM work of a route, without blocking the event loop.
+
+    Args:
+        db: Session from get_db; an AsyncSession runs fn on its async driver
+            (AsyncSession.run_sync), a plain Session runs it in the threadpool
+        fn: Function taking a sync Session first, written like any other ORM code
+
+    Returns:
+        Whatever fn returns
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def release_connection(db: Session, *keep: Any) -> None:
+    """
+    End a read-only transaction so its pooled connection goes back right away.
+
+    Requests wait for bcrypt or for their next run_db turn between database
+    calls. A connection held across that wait can exhaust the pool under load.
+    Objects in keep are detached first, so their loaded columns stay readable.
+    """
+    for obj in keep:
+        if obj is not None:
+            db.expunge(obj)
+    db.commit()
+
+
+# Importing model modules (after get_db, which utilities imported by models depend on) to ensure declarative models are registered with Base.metadata
+import app.models.user  # Registering User model
+import app.models.chef  # Registering Chef model
+import app.models.client  # Registering Client model
+import app.models.booking  # Registering Booking model
+import app.models.cuisine  # Registering Cuisine model and association tables
+import app.models.availability  # Registering chef availability models
+import app.models.chef_search  # Registering full-text index DDL and maintenance hooks
+
+
 # Importing models to ensure they are registered on Base when the app package is imported  # Ensuring metadata is populated for tests
 import app.models  # noqa: E402,F401
 
@@ -30,21 +110,64 @@ import app.models  # noqa: E402,F401
 def create_app() -> FastAPI:
     app = FastAPI(title=settings.APP_NAME, version=settings.VERSION, docs_url="/api/docs", redoc_url="/api/redoc")
     
+    if settings.RATE_LIMIT_ENABLED:
+        from app.middleware.rate_limit import RateLimitMiddleware, build_store
+        # Added before CORS so it runs inside it: browsers can read the 429 and its Retry-After.
+        app.add_middleware(RateLimitMiddleware, store=build_store(settings.RATE_LIMIT_STORE), default=settings.RATE_LIMIT_DEFAULT, routes=settings.RATE_LIMIT_ROUTES, exempt_paths=settings.RATE_LIMIT_EXEMPT_PATHS, proxy_hops=settings.RATE_LIMIT_PROXY_HOPS)
+    
     cors_origins = settings.parsed_cors_origins if hasattr(settings, 'parsed_cors_origins') else settings.CORS_ORIGINS
-    app.add_middleware(CORSMiddleware, allow_origins=cors_origins, allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
+    app.add_middleware(CORSMiddleware, allow_origins=cors_origins, allow_credentials=True, allow_methods=["*"], allow_headers=["*"], expose_headers=["X-Next-Cursor", "ETag", "Retry-After"])
+    
+    from app.middleware.compression import CompressionMiddleware
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE, encodings=settings.COMPRESSION_ENCODINGS)
     
     from app.routes.auth import router as auth_router
     from app.routes.chef import router as chef_router
     from app.routes.booking import router as booking_router
     from app.routes.client import router as client_router
+    from app.routes.admin import router as admin_router
     
     app.include_router(auth_router, prefix="/api/auth", tags=["Authentication"])
     app.include_router(chef_router, prefix="/api/chefs", tags=["Chefs"])
     app.include_router(booking_router, prefix="/api/bookings", tags=["Bookings"])
     app.include_router(client_router, prefix="/api/clients", tags=["Clients"])
+    app.include_router(admin_router, prefix="/api/admin", tags=["Admin"])
+    
+    @app.exception_handler(StaleDataError)
+    async def concurrent_update_handler(request, exc):
+        # Two requests updated the same row at once; version_id_col let only the first one through.
+        return JSONResponse(status_code=409, content={"detail": "This record was changed by another request. Reload and try again."})
     
     @app.get("/api/health", tags=["Health"])
     async def health_check():
-        return {"status": "healthy", "message": "Find My Chef API is running"}
+        return {"status": "healthy", "message": "Find My Chef API is running"}  # Liveness only: the process is up.
+    
+    @app.get("/api/ready", tags=["Health"])
+    async def readiness_check():
+        from app.db_pool import check_database_ready
+        try:
+            seconds = await check_database_ready(engine, async_engine, timeout=settings.READINESS_TIMEOUT_SECONDS)  # A real checkout: fails when the pool is exhausted or the database is down.
+        except asyncio.TimeoutError:
+            return JSONResponse(status_code=503, content={"status": "unavailable", "detail": f"No database connection within {settings.READINESS_TIMEOUT_SECONDS}s"})
+        except SQLAlchemyError as error:
+            return JSONResponse(status_code=503, content={"status": "unavailable", "detail": f"Database error: {type(error).__name__}"})
+        return {"status": "ready", "database_ms": round(seconds * 1000, 2)}
+    
+    from app.db_pool import pool_metrics
+    from app.utils.metrics import register_metrics
+    register_metrics("db_pool", lambda: pool_metrics((async_engine.sync_engine if async_engine is not None else engine).pool))  # engine.pool is replaced on dispose().
+    if read_engine is not engine:
+        register_metrics("db_read_pool", lambda: pool_metrics(read_engine.pool))
+    if replica_engines:
+        register_metrics("db_replicas", lambda: {f"replica_{i}": pool_metrics((replica.sync_engine if async_engine is not None else replica).pool) for i, replica in enumerate(replica_engines)})
+    
+    from app.utils.password_hashing import password_hasher
+    register_metrics("password_hashing", password_hasher.stats)
+    app.add_event_handler("startup", password_hasher.calibrate)  # Picks the bcrypt cost once per process, unless BCRYPT_ROUNDS is set.
+    
+    @app.get("/api/metrics", tags=["Health"])
+    async def metrics():
+        from app.utils.metrics import collect_metrics
+        return collect_metrics()  # Counters of in-process caches, like chef_search_cache hits and evictions.
     
     return app
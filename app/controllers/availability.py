@@ -0,0 +1,134 @@
+"""
+Chef availability: weekly windows, dated exceptions and booking overlaps
+"""
+
+from datetime import datetime, time, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, exists, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.availability import ChefAvailability, ChefAvailabilityException
+from app.models.booking import Booking, RELEASED_STATUSES, COMMITTED_STATUSES
+from app.models.chef import Chef
+from config.settings import settings
+
+
+def overlapping_bookings(chef_id, start: datetime, end: datetime):
+    """
+    Build a select of bookings holding a chef's time anywhere in [start, end).
+
+    No booking lasts longer than MAX_BOOKING_DURATION_HOURS, so an overlapping
+    booking starts between start minus that and end. Bounding start_at on both
+    sides turns the check into one range probe on ix_bookings_chef_start.
+
+    Args:
+        chef_id: Chef id, or a column like Chef.id for a correlated check
+        start: Start of the interval
+        end: End of the interval
+
+    Returns:
+        Select of overlapping Booking rows
+    """
+    earliest_start = start - timedelta(hours=settings.MAX_BOOKING_DURATION_HOURS)
+    return select(Booking).where(
+        Booking.chef_id == chef_id,
+        Booking.start_at > earliest_start,
+        Booking.start_at < end,
+        Booking.end_at > start,
+        Booking.status.notin_(RELEASED_STATUSES),
+    )
+
+
+def lock_chef_schedule(db: Session, chef_id: int) -> None:
+    """
+    Serialize booking writes for one chef until the transaction ends.
+
+    PostgreSQL takes a row lock on the chef with SELECT ... FOR UPDATE.
+    SQLite ignores FOR UPDATE, so a no-op UPDATE of the chef row takes the
+    database write lock instead. Either way, a second request booking the
+    same chef waits here and then sees the first one's committed booking.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        db.execute(update(Chef).where(Chef.id == chef_id).values(id=Chef.id).execution_options(synchronize_session=False))
+    else:
+        db.execute(select(Chef.id).where(Chef.id == chef_id).with_for_update())
+
+
+def find_booking_conflict(db: Session, chef_id: int, start: datetime, end: datetime, exclude_booking_id: Optional[int] = None) -> Optional[Booking]:
+    """
+    Find an accepted, confirmed or completed booking of the chef overlapping [start, end).
+
+    Call lock_chef_schedule first so the answer holds until commit.
+
+    Args:
+        db: Database session
+        chef_id: Chef being booked
+        start: Start of the requested interval
+        end: End of the requested interval
+        exclude_booking_id: Booking being accepted, which can't conflict with itself
+
+    Returns:
+        The earliest conflicting booking, or None
+    """
+    query = overlapping_bookings(chef_id, start, end).where(Booking.status.in_(COMMITTED_STATUSES))
+    if exclude_booking_id is not None:
+        query = query.where(Booking.id != exclude_booking_id)
+    return db.scalars(query.order_by(Booking.start_at).limit(1)).first()
+
+
+def available_between(start: datetime, end: datetime):
+    """
+    SQL condition on Chef: free and working for the whole of [start, end).
+
+    A chef is free when no held booking overlaps the interval. A chef is
+    working when no day-off exception overlaps it and either an extra-hours
+    exception or a weekly window covers it. Chefs who never set weekly
+    windows count as working any time, as before calendars existed.
+    """
+    day, start_time = start.date(), start.time()
+    # Windows lie within one day, so no window covers an interval that runs past midnight.
+    end_time = end.time() if end.date() == day else time.max
+
+    free = ~exists(overlapping_bookings(Chef.id, start, end).with_only_columns(Booking.id))
+
+    exceptions = ChefAvailabilityException
+    day_off = exists().where(
+        exceptions.chef_id == Chef.id,
+        exceptions.date == day,
+        exceptions.is_available == 0,
+        or_(exceptions.start_time.is_(None), and_(exceptions.start_time < end_time, exceptions.end_time > start_time)),
+    )
+    extra_hours = exists().where(
+        exceptions.chef_id == Chef.id,
+        exceptions.date == day,
+        exceptions.is_available == 1,
+        exceptions.start_time <= start_time,
+        exceptions.end_time >= end_time,
+    )
+    no_weekly_windows = ~exists().where(ChefAvailability.chef_id == Chef.id)
+    weekly_window = exists().where(
+        ChefAvailability.chef_id == Chef.id,
+        ChefAvailability.weekday == day.weekday(),
+        ChefAvailability.start_time <= start_time,
+        ChefAvailability.end_time >= end_time,
+    )
+
+    return and_(free, ~day_off, or_(extra_hours, no_weekly_windows, weekly_window))
+
+
+def set_chef_availability(db: Session, chef: Chef, weekly: List[Dict[str, Any]], exceptions: List[Dict[str, Any]]) -> None:
+    """
+    Replace a chef's weekly windows and exceptions.
+
+    Args:
+        db: Database session
+        chef: Chef whose calendar is replaced
+        weekly: Dicts with weekday, start_time and end_time
+        exceptions: Dicts with date, is_available and optional start_time/end_time
+    """
+    chef.availability = [ChefAvailability(**window) for window in weekly]
+    chef.availability_exceptions = [
+        ChefAvailabilityException(**{**exception, "is_available": 1 if exception["is_available"] else 0})
+        for exception in exceptions
+    ]
@@ -0,0 +1,255 @@
+"""
+Bulk chef onboarding from CSV or NDJSON files
+
+Rows stream through in chunks of BULK_IMPORT_BATCH_SIZE. Each chunk is read
+and validated with UserRegister and ChefCreate in the threadpool, its
+passwords are hashed in parallel on the hashing process pool, waiting for
+free slots rather than failing when sign-ins fill it, and it is written in
+one transaction with executemany INSERTs for users, chefs and cuisine tags. Memory depends on
+the chunk size, not the file size, and the report keeps at most
+BULK_IMPORT_MAX_ERRORS failed rows.
+
+Columns (CSV header or NDJSON keys): name, email, password, hourly_rate,
+and optionally bio, cuisines, specialties, location, phone, photo_url,
+years_of_experience.
+"""
+
+import csv
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app import AnySession, run_db
+from app.controllers.chef_search import chef_search_cache
+from app.controllers.cuisines import cuisine_slug, get_or_create_cuisines, parse_cuisines
+from app.models.chef import Chef
+from app.models.chef_search import reindex_chefs
+from app.models.cuisine import chef_cuisines
+from app.models.user import User, UserRole
+from app.schemas.auth import UserRegister
+from app.schemas.chef import ChefCreate
+from app.utils.password_hashing import password_hasher
+from app.utils.ranking import ranking_score
+from config.settings import settings
+
+FORMATS = ("csv", "ndjson")
+USER_FIELDS = ("name", "email", "password")
+
+# Messages for constraint violations, keyed by a word of the driver's error; others are logged, not shown.
+CONSTRAINT_MESSAGES = {"email": "Email already registered"}
+
+Row = Tuple[int, UserRegister, ChefCreate]
+
+logger = logging.getLogger(__name__)
+
+
+def read_rows(lines: Iterable[str], format: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Parse a file lazily into (line number, row dict) pairs.
+
+    Args:
+        lines: Text lines, like an open file; read one at a time
+        format: "csv" (with a header row) or "ndjson" (one JSON object per line)
+
+    Returns:
+        Iterator of pairs; rows that cannot be parsed yield an error message instead of a dict
+    """
+    if format == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            yield line_number, f"Invalid JSON: {error}"
+            continue
+        yield line_number, row if isinstance(row, dict) else "Expected a JSON object"
+
+
+def validate_row(row: Dict[str, Any]) -> Tuple[UserRegister, ChefCreate]:
+    """
+    Validate a row with the same schemas as registration and profile edits.
+
+    Raises:
+        ValueError: With every problem in the row, from both schemas, one per line
+    """
+    values = {key: value for key, value in row.items() if key and value not in ("", None)}  # Empty CSV cells fall back to schema defaults.
+    user_values = {field: values.pop(field) for field in USER_FIELDS if field in values}
+    results, messages = [], []
+    for schema, schema_values in ((UserRegister, {**user_values, "role": "chef"}), (ChefCreate, values)):
+        try:
+            results.append(schema(**schema_values))
+        except ValidationError as error:
+            messages += [f"{'.'.join(str(part) for part in detail['loc'])}: {detail['msg']}" for detail in error.errors()]
+    if messages:
+        raise ValueError("\n".join(messages))
+    return results[0], results[1]
+
+
+class ImportReport:
+    """Counts of a bulk import plus the first BULK_IMPORT_MAX_ERRORS failed rows."""
+
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def fail(self, line: int, email: Any, errors: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "email": email, "errors": errors})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"imported": self.imported, "failed": self.failed, "errors": self.errors, "errors_truncated": self.failed > len(self.errors)}
+
+
+def _integrity_message(error: IntegrityError, line: int) -> str:
+    detail = str(error.orig).lower()
+    for word, message in CONSTRAINT_MESSAGES.items():
+        if word in detail:
+            return message  # Like an email registered between our check and the INSERT.
+    logger.warning("Bulk import could not save line %s: %s", line, error.orig)  # Constraint names and SQL stay in the log.
+    return "Could not be saved"
+
+
+def insert_chef_batch(db: Session, rows: List[Row], password_hashes: List[str]) -> List[Tuple[int, str, str]]:
+    """
+    Write one chunk of validated chefs in a single transaction.
+
+    Args:
+        db: Database session
+        rows: Validated (line, user, chef) rows
+        password_hashes: bcrypt hashes in the same order as rows
+
+    Returns:
+        (line, email, message) for rows that were not inserted, like already registered emails
+    """
+    emails = [user.email for _, user, _ in rows]
+    taken = set(db.scalars(select(User.email).where(User.email.in_(emails))))
+    rejected, accepted = [], []
+    for row, password_hash in zip(rows, password_hashes):
+        email = row[1].email
+        if email in taken:
+            rejected.append((row[0], email, "Email already registered"))
+        else:
+            taken.add(email)  # A second row with the same email in this chunk is a duplicate too.
+            accepted.append((row, password_hash))
+    if not accepted:
+        return rejected
+
+    try:
+        user_ids = db.scalars(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            [{"email": user.email, "password_hash": password_hash, "name": user.name, "role": UserRole.CHEF, "version": 1} for (_, user, _), password_hash in accepted],
+        ).all()
+
+        cuisine_names = [parse_cuisines(chef.cuisines) for (_, _, chef), _ in accepted]
+        cuisines = {cuisine.slug: cuisine for cuisine in get_or_create_cuisines(db, list(dict.fromkeys(name for names in cuisine_names for name in names)))}
+        tags = [[cuisines[cuisine_slug(name)] for name in names] for names in cuisine_names]
+
+        chef_ids = db.scalars(
+            insert(Chef).returning(Chef.id, sort_by_parameter_order=True),
+            [
+                {
+                    **chef.model_dump(exclude={"cuisines"}),
+                    "user_id": user_id,
+                    "cuisines": ",".join(cuisine.name for cuisine in chef_tags) or None,  # Canonical spelling, as set_chef_cuisines stores it.
+                    "rating": 0.0,
+                    "total_bookings": 0,
+                    "is_available": 1,
+                    "version": 1,
+                    # Bulk INSERTs skip mapper hooks, so the ranking score is set here; imported chefs have no coordinates for set_geohash.
+                    "ranking_score": ranking_score(0.0, 0, chef.years_of_experience, chef.hourly_rate, 1),
+                }
+                for ((_, _, chef), _), user_id, chef_tags in zip(accepted, user_ids, tags)
+            ],
+        ).all()
+
+        links = [{"cuisine_id": cuisine.id, "chef_id": chef_id} for chef_id, chef_tags in zip(chef_ids, tags) for cuisine in chef_tags]
+        if links:
+            db.execute(insert(chef_cuisines), links)
+        reindex_chefs(db.connection(), chef_ids)  # Nor does the search index's after_flush hook see bulk INSERTs.
+        db.commit()
+    except IntegrityError as error:
+        db.rollback()
+        if len(accepted) == 1:
+            (line, user, _), _ = accepted[0]
+            return rejected + [(line, user.email, _integrity_message(error, line))]
+        # Someone registered one of these emails meanwhile; retry row by row to find out which.
+        return rejected + [error for (row, password_hash) in accepted for error in insert_chef_batch(db, [row], [password_hash])]
+
+    return rejected
+
+
+def collect_chunk(rows: Iterator[Tuple[int, Any]], report: ImportReport, size: int) -> List[Row]:
+    """
+    Read and validate rows until size of them are valid or the file ends.
+
+    Args:
+        rows: Pairs from read_rows, resumed where the previous chunk stopped
+        report: Receives the rows that fail parsing or validation
+        size: Valid rows per chunk
+
+    Returns:
+        Validated (line, user, chef) rows; empty once the file is exhausted
+    """
+    chunk: List[Row] = []
+    for line, row in rows:
+        if isinstance(row, str):
+            report.fail(line, None, [row])
+            continue
+        try:
+            user, chef = validate_row(row)
+        except ValueError as error:
+            report.fail(line, row.get("email"), str(error).split("\n"))
+            continue
+        chunk.append((line, user, chef))
+        if len(chunk) >= size:
+            break
+    return chunk
+
+
+async def import_chefs(db: AnySession, lines: Iterable[str], format: str) -> Dict[str, Any]:
+    """
+    Import chefs from a CSV or NDJSON file, one chunk at a time.
+
+    Each chunk commits on its own: rows before a failure stay imported, and
+    running the same file again reports them as already registered. Reading,
+    parsing and validating run in the threadpool, so a large file never
+    stalls other requests on the event loop.
+
+    Args:
+        db: Database session
+        lines: Text lines of the file, read lazily
+        format: "csv" or "ndjson"
+
+    Returns:
+        Report with imported and failed counts and the failed rows' errors
+    """
+    report = ImportReport(settings.BULK_IMPORT_MAX_ERRORS)
+    rows = read_rows(lines, format)
+
+    while True:
+        chunk = await run_in_threadpool(collect_chunk, rows, report, settings.BULK_IMPORT_BATCH_SIZE)
+        if not chunk:
+            break
+        password_hashes = await password_hasher.hash_many([user.password for _, user, _ in chunk], wait=True)  # Sign-ins keep their 503; the import waits its turn.
+        rejected = await run_db(db, insert_chef_batch, chunk, password_hashes)
+        for line, email, message in rejected:
+            report.fail(line, email, [message])
+        report.imported += len(chunk) - len(rejected)
+        chef_search_cache.clear()  # New chefs can appear on any cached page; cheaper than checking each one against every page.
+
+    return report.to_dict()
@@ -0,0 +1,330 @@
+"""
+Chef directory search: query parameters, filtering, paging and the result cache
+"""
+
+import copy
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import Integer, cast, func, select
+from sqlalchemy.orm import Session
+
+from app.controllers.availability import available_between
+from app.controllers.cuisines import chef_ids_with_cuisines, cuisine_slug, parse_cuisines
+from app.controllers.search import ranked_chef_ids, search_terms
+from app.models.chef import Chef
+from app.models.user import User
+from app.models.cuisine import Cuisine, chef_cuisines
+from app.utils.cache import LRUCache
+from app.utils.geo import parse_coordinates, covering_cells, geohash_cells_filter, squared_distance_km
+from app.utils.metrics import register_metrics
+from app.utils.pagination import encode_cursor, decode_cursor, apply_keyset
+from config.settings import settings
+
+# ChefResponse fields in order. Result pages are built from these columns, without loading Chef objects.
+CHEF_LIST_COLUMNS = (
+    Chef.id, Chef.user_id, User.name, Chef.bio, Chef.cuisines, Chef.specialties, Chef.hourly_rate, Chef.location,
+    Chef.latitude, Chef.longitude, Chef.phone, Chef.photo_url, Chef.years_of_experience, Chef.rating,
+    Chef.total_bookings, Chef.is_available,
+)
+
+# Sort orders over plain columns: (keyset columns, descending). Each is backed by an index on Chef.
+CHEF_SORTS = {
+    "price": ((Chef.hourly_rate, Chef.id), False),
+    "rating": ((Chef.rating, Chef.id), True),
+    "experience": ((Chef.years_of_experience, Chef.id), True),
+    "newest": ((Chef.id,), True),
+    "recommended": ((Chef.ranking_score, Chef.id), True),
+}
+
+# Pages of results keyed by ChefSearchParams.cache_key(); values are (params, chef ids, chefs, next cursor).
+chef_search_cache = LRUCache(settings.CHEF_SEARCH_CACHE_SIZE, settings.CHEF_SEARCH_CACHE_TTL_SECONDS)
+register_metrics("chef_search_cache", chef_search_cache.stats)
+
+
+class ChefSearchParams:
+    """
+    Query parameters of GET /api/chefs, normalized on the way in.
+
+    Equivalent searches ("Italian,french" and "French, italian") end up with
+    equal cache keys, and could_match() can tell whether a chef belongs in the
+    results without running the query.
+    """
+
+    def __init__(
+        self,
+        cuisine: Optional[str] = Query(None, description="Comma-separated cuisine names"),
+        cuisine_match: str = Query("any", pattern="^(any|all)$"),
+        location: Optional[str] = Query(None),
+        max_price: Optional[float] = Query(None),
+        search: Optional[str] = Query(None, description="Full-text search over name, bio, specialties and cuisines"),
+        near: Optional[str] = Query(None, description="Search centre as 'lat,lng'"),
+        radius_km: float = Query(settings.DEFAULT_SEARCH_RADIUS_KM, gt=0, le=settings.MAX_SEARCH_RADIUS_KM),
+        available_at: Optional[datetime] = Query(None, description="Only chefs free from this local time, like 2025-12-20T18:00; no UTC offset"),
+        on_date: Optional[date] = Query(None, alias="date", description="With time, the same as available_at"),
+        at_time: Optional[time] = Query(None, alias="time"),
+        duration: float = Query(settings.DEFAULT_BOOKING_DURATION_HOURS, gt=0, le=settings.MAX_BOOKING_DURATION_HOURS, description="Hours the chef must be free for"),
+        sort: Optional[str] = Query(None, pattern="^(relevance|distance|recommended|price|rating|experience|newest)$"),
+        limit: int = Query(settings.ITEMS_PER_PAGE, ge=1, le=settings.MAX_ITEMS_PER_PAGE),
+        cursor: Optional[str] = Query(None),
+    ):
+        self.cuisines = tuple(sorted({cuisine_slug(name) for name in parse_cuisines(cuisine)}))
+        self.cuisine_match = cuisine_match if len(self.cuisines) > 1 else "any"
+        self.location = location.strip().lower() or None if location else None
+        self.max_price = max_price or None  # 0 has always meant "no price filter".
+        self.search = tuple(search_terms(search)) if search else None
+        self.near = None
+        self.radius_km = radius_km
+        if near:
+            try:
+                self.near = parse_coordinates(near)
+            except ValueError:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="near must be 'lat,lng' in degrees")
+
+        if (on_date is None) != (at_time is None):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date and time must be given together")
+        if available_at is None and on_date is not None:
+            available_at = datetime.combine(on_date, at_time)
+        self.available = None  # (start, end) the chef must be free for, in the naive local time bookings use.
+        if available_at is not None:
+            if available_at.tzinfo is not None:
+                # Bookings store no zone, so an offset could only be dropped, shifting the search by that many hours.
+                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="available_at must be a local time without a UTC offset, like 2025-12-20T18:00")
+            self.available = (available_at, available_at + timedelta(hours=duration))
+
+        self.sort = sort or ("relevance" if self.search is not None else "distance" if self.near else "recommended")
+        if self.sort == "relevance" and self.search is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Sorting by relevance requires a search")
+        if self.sort == "distance" and self.near is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Sorting by distance requires near")
+        self.limit = limit
+        self.cursor = cursor
+
+    def filter_key(self) -> Tuple:
+        return (
+            self.cuisines, self.cuisine_match, self.location, self.max_price,
+            self.search, self.near, self.radius_km if self.near else None, self.available,
+        )
+
+    def cache_key(self) -> Tuple:
+        return self.filter_key() + (self.sort, self.limit, self.cursor)
+
+    def without(self, name: str) -> "ChefSearchParams":
+        """Copy of these parameters with one filter ("cuisines", "location" or "max_price") cleared."""
+        params = copy.copy(self)
+        setattr(params, name, () if name == "cuisines" else None)
+        return params
+
+    def could_match(self, chef: Dict[str, Any]) -> bool:
+        """
+        Whether a chef, given as its to_dict() form, may satisfy these filters.
+
+        Errs on the side of True: full-text matches and availability at a
+        time are not re-evaluated here.
+        """
+        if not chef["is_available"]:
+            return False
+        if self.cuisines:
+            tags = {cuisine_slug(name) for name in chef["cuisines"]}
+            hits = [slug in tags for slug in self.cuisines]
+            if not (all(hits) if self.cuisine_match == "all" else any(hits)):
+                return False
+        if self.location and self.location not in (chef["location"] or "").lower():
+            return False
+        if self.max_price and chef["hourly_rate"] > self.max_price:
+            return False
+        if self.near:
+            if chef["latitude"] is None or chef["longitude"] is None:
+                return False
+            # Same expression the SQL filter uses, evaluated on plain floats.
+            if squared_distance_km(chef["latitude"], chef["longitude"], *self.near) > self.radius_km * self.radius_km:
+                return False
+        return True
+
+
+def filter_chefs(db: Session, query, params: ChefSearchParams):
+    """
+    Apply the search filters to a query over Chef.
+
+    Args:
+        db: Database session
+        query: Query or select statement selecting from chefs
+        params: Parsed search parameters
+
+    Returns:
+        (query, relevance subquery or None, squared-distance expression or None),
+        or None when the filters cannot match any chef
+    """
+    available = Chef.is_available == 1
+    ranked = distance = None
+
+    if params.cuisines:
+        tagged = chef_ids_with_cuisines(db, ",".join(params.cuisines), params.cuisine_match)
+        if tagged is None:
+            return None  # A requested cuisine is unknown, so nothing can match.
+        query = query.where(Chef.id.in_(tagged))
+    if params.location:
+        query = query.where(Chef.location.ilike(f"%{params.location}%"))
+    if params.max_price:
+        query = query.where(Chef.hourly_rate <= params.max_price)
+    if params.search is not None:
+        ranked = ranked_chef_ids(db, " ".join(params.search))
+        if ranked is None:
+            return None  # Nothing searchable in the input, like only punctuation.
+        query = query.join(ranked, ranked.c.chef_id == Chef.id)
+    if params.near:
+        latitude, longitude = params.near
+        distance = squared_distance_km(Chef.latitude, Chef.longitude, latitude, longitude)
+        cells = covering_cells(latitude, longitude, params.radius_km)
+        if cells:
+            # is_available goes inside each cell branch so the planner range-scans the geohash index per cell.
+            query = query.where(geohash_cells_filter(Chef.geohash, cells, available))
+            available = None
+        query = query.where(distance <= params.radius_km * params.radius_km)
+    if available is not None:
+        query = query.where(available)
+    if params.available:
+        query = query.where(available_between(*params.available))
+
+    return query, ranked, distance
+
+
+def chef_row_dict(row) -> Dict[str, Any]:
+    """Shape a CHEF_LIST_COLUMNS row exactly like Chef.to_dict() after ChefResponse validation."""
+    return {
+        "id": row.id,
+        "user_id": row.user_id,
+        "name": row.name,
+        "bio": row.bio,
+        "cuisines": row.cuisines.split(",") if row.cuisines else [],
+        "specialties": row.specialties,
+        "hourly_rate": row.hourly_rate,
+        "location": row.location,
+        "latitude": row.latitude,
+        "longitude": row.longitude,
+        "phone": row.phone,
+        "photo_url": row.photo_url,
+        "years_of_experience": row.years_of_experience,
+        "rating": row.rating,
+        "total_bookings": row.total_bookings,
+        "is_available": bool(row.is_available),
+    }
+
+
+def _run_search(db: Session, params: ChefSearchParams) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    statement = select(*CHEF_LIST_COLUMNS).select_from(Chef).join(User, User.id == Chef.user_id)
+    filtered = filter_chefs(db, statement, params)
+    if filtered is None:
+        return [], None
+    query, ranked, distance = filtered
+
+    if params.sort == "relevance":
+        columns, descending = (ranked.c.score, Chef.id), True
+    elif params.sort == "distance":
+        columns, descending = (distance, Chef.id), False
+    else:
+        columns, descending = CHEF_SORTS[params.sort]
+
+    after = decode_cursor(params.cursor, params.sort, len(columns)) if params.cursor else None
+    query = query.add_columns(*[column.label(f"sort_{i}") for i, column in enumerate(columns)])
+    rows = db.execute(apply_keyset(query, columns, descending, after).limit(params.limit + 1)).all()  # One extra row tells us whether another page exists.
+
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[:params.limit]
+        next_cursor = encode_cursor(params.sort, list(rows[-1][len(CHEF_LIST_COLUMNS):]))
+    return [chef_row_dict(row) for row in rows], next_cursor
+
+
+def search_chefs(db: Session, params: ChefSearchParams) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Run a chef search, answering repeated searches from chef_search_cache.
+
+    Returns:
+        (page of chefs as to_dict() dicts, cursor of the next page or None)
+    """
+    key = params.cache_key()
+    cached = chef_search_cache.get(key)
+    if cached is not None:
+        return cached[2], cached[3]
+
+    chefs, next_cursor = _run_search(db, params)
+    chef_search_cache.set(key, (params, frozenset(chef["id"] for chef in chefs), chefs, next_cursor))
+    return chefs, next_cursor
+
+
+def invalidate_chef_searches(chef: Dict[str, Any]) -> None:
+    """
+    Drop cached pages a changed or new chef affects.
+
+    A page is stale if it shows the chef (its data or position may have
+    changed) or if the chef now qualifies for its filters (it may have to
+    appear on it). Every other cached page stays valid.
+
+    Args:
+        chef: The chef's current to_dict() form
+    """
+    chef_search_cache.discard_where(lambda key, page: chef["id"] in page[1] or page[0].could_match(chef))
+
+
+def invalidate_chef_availability(chef: Dict[str, Any]) -> None:
+    """
+    Drop cached available_at pages after a chef's bookings or calendar change.
+
+    Pages without an availability filter don't depend on either and stay cached.
+
+    Args:
+        chef: The chef's current to_dict() form
+    """
+    chef_search_cache.discard_where(
+        lambda key, page: page[0].available is not None and (chef["id"] in page[1] or page[0].could_match(chef))
+    )
+
+
+def chef_facets(db: Session, params: ChefSearchParams) -> Dict[str, Any]:
+    """
+    Count chefs per cuisine, per location and per price bucket for a search.
+
+    Each facet ignores its own filter, so picking "Italian" still shows how
+    many chefs the other cuisines would add. Every count is a GROUP BY in the
+    database; no Chef objects are loaded.
+
+    Returns:
+        Dict with total, cuisines, locations and price lists
+    """
+    def counted(statement, facet_params):
+        filtered = filter_chefs(db, statement.select_from(Chef), facet_params)
+        return [] if filtered is None else db.execute(filtered[0]).all()
+
+    count = func.count(Chef.id).label("count")
+    total = counted(select(count), params)
+
+    cuisine_chef_ids = filter_chefs(db, select(Chef.id), params.without("cuisines"))
+    cuisines = []
+    if cuisine_chef_ids is not None:
+        cuisines = db.execute(
+            select(Cuisine.name, Cuisine.slug, func.count().label("count"))
+            .join(chef_cuisines, chef_cuisines.c.cuisine_id == Cuisine.id)
+            .where(chef_cuisines.c.chef_id.in_(cuisine_chef_ids[0]))
+            .group_by(Cuisine.id, Cuisine.name, Cuisine.slug)
+            .order_by(func.count().desc(), Cuisine.name)
+        ).all()
+
+    locations = counted(
+        select(Chef.location, count).where(Chef.location.isnot(None)).group_by(Chef.location).order_by(count.desc(), Chef.location),
+        params.without("location"),
+    )
+
+    width = settings.PRICE_FACET_BUCKET_WIDTH
+    bucket = cast(func.floor(Chef.hourly_rate / width), Integer)  # floor first: PostgreSQL's CAST rounds, so 45 / 25 would land in the 50 bucket.
+    prices = counted(select(bucket.label("bucket"), count).group_by(bucket).order_by(bucket), params.without("max_price"))
+
+    return {
+        "total": total[0].count if total else 0,
+        "cuisines": [{"name": row.name, "slug": row.slug, "count": row.count} for row in cuisines],
+        "locations": [{"location": row.location, "count": row.count} for row in locations],
+        "price": [
+            {"min_price": row.bucket * width, "max_price": (row.bucket + 1) * width, "count": row.count} for row in prices
+        ],
+    }
@@ -0,0 +1,101 @@
+"""
+Cuisine tag normalization and tag-based chef filtering
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.cuisine import Cuisine, chef_cuisines
+
+
+def cuisine_slug(name: str) -> str:
+    return " ".join(name.split()).lower()  # "  South  Indian " and "south indian" share one tag.
+
+
+def parse_cuisines(raw: Optional[str]) -> List[str]:
+    """
+    Split a comma-separated cuisine string into distinct, trimmed names.
+
+    Args:
+        raw: Value as sent by the frontend, like "Italian, french,Italian"
+
+    Returns:
+        Names in their original order with case-insensitive duplicates removed
+    """
+    names, seen = [], set()
+    for part in (raw or "").split(","):
+        name = " ".join(part.split())
+        slug = cuisine_slug(name)
+        if slug and slug not in seen:
+            seen.add(slug)
+            names.append(name)
+    return names
+
+
+def get_or_create_cuisines(db: Session, names: List[str]) -> List[Cuisine]:
+    """
+    Resolve names to Cuisine rows, creating the ones that do not exist yet.
+
+    Missing tags are inserted with ON CONFLICT DO NOTHING and then selected,
+    so two profiles saved at once with the same new cuisine share one row
+    instead of the second failing on the unique slug.
+
+    Args:
+        db: Database session
+        names: Distinct cuisine names as returned by parse_cuisines
+
+    Returns:
+        Cuisine rows in the same order as names
+    """
+    slugs = [cuisine_slug(name) for name in names]
+    if not slugs:
+        return []
+    existing = {cuisine.slug: cuisine for cuisine in db.query(Cuisine).filter(Cuisine.slug.in_(slugs))}
+
+    missing = [{"name": name, "slug": slug} for name, slug in zip(names, slugs) if slug not in existing]
+    if missing:
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        db.execute(dialect.insert(Cuisine.__table__).on_conflict_do_nothing(index_elements=["slug"]), missing)
+        created = db.query(Cuisine).filter(Cuisine.slug.in_([row["slug"] for row in missing]))
+        existing.update((cuisine.slug, cuisine) for cuisine in created)
+    return [existing[slug] for slug in slugs]
+
+
+def set_chef_cuisines(db: Session, chef, raw: Optional[str]) -> None:
+    chef.cuisine_tags = get_or_create_cuisines(db, parse_cuisines(raw))
+    chef.cuisines = ",".join(cuisine.name for cuisine in chef.cuisine_tags) or None  # Keeps the display copy in canonical spelling.
+
+
+def set_client_cuisines(db: Session, client, raw: Optional[str]) -> None:
+    client.cuisine_tags = get_or_create_cuisines(db, parse_cuisines(raw))
+    client.preferred_cuisines = ",".join(cuisine.name for cuisine in client.cuisine_tags) or None
+
+
+def chef_ids_with_cuisines(db: Session, raw: str, match: str = "any"):
+    """
+    Build a subquery of chef ids tagged with the requested cuisines.
+
+    The tag names are resolved to ids first, then matched through the
+    (cuisine_id, chef_id) primary key of chef_cuisines, so no chef rows are scanned.
+
+    Args:
+        db: Database session
+        raw: Comma-separated cuisine names from the query string
+        match: "any" for chefs with at least one of the cuisines, "all" for chefs with every one
+
+    Returns:
+        A select of chef ids, or None when no chef can match
+    """
+    slugs = {cuisine_slug(name) for name in parse_cuisines(raw)}
+    cuisine_ids = [cuisine_id for (cuisine_id,) in db.query(Cuisine.id).filter(Cuisine.slug.in_(slugs))]
+
+    if not cuisine_ids or (match == "all" and len(cuisine_ids) < len(slugs)):
+        return None
+
+    tagged = select(chef_cuisines.c.chef_id).where(chef_cuisines.c.cuisine_id.in_(cuisine_ids))
+    if match == "all" and len(cuisine_ids) > 1:
+        tagged = tagged.group_by(chef_cuisines.c.chef_id).having(func.count() == len(cuisine_ids))
+    return tagged
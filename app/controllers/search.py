@@ -0,0 +1,50 @@
+"""
+Ranked full-text chef search on top of the chef_search index
+"""
+
+import re
+from typing import List
+
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.orm import Session
+
+from app.models.chef_search import sqlite_chef_search, postgres_chef_search
+
+MAX_SEARCH_TERMS = 8  # Longer inputs are truncated instead of building huge MATCH expressions.
+
+
+def search_terms(raw: str) -> List[str]:
+    return re.findall(r"\w+", raw.lower())[:MAX_SEARCH_TERMS]  # Word characters only, so user input can't inject query syntax.
+
+
+def ranked_chef_ids(db: Session, raw: str):
+    """
+    Build a subquery of chefs matching every search term as a word prefix.
+
+    Args:
+        db: Database session
+        raw: Search box input, like "gordon ital"
+
+    Returns:
+        Subquery with chef_id and score columns (higher score = better match), or None if the input has no terms
+    """
+    terms = search_terms(raw)
+    if not terms:
+        return None
+
+    if db.get_bind().dialect.name == "postgresql":
+        tsquery = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        document = postgres_chef_search.c.document
+        ranked = select(
+            postgres_chef_search.c.chef_id.label("chef_id"),
+            func.ts_rank(document, tsquery).label("score"),
+        ).where(document.op("@@")(tsquery))
+    else:
+        fts = literal_column("chef_search")
+        ranked = select(
+            sqlite_chef_search.c.rowid.label("chef_id"),
+            # bm25 is lower-is-better; weights follow the column order name, bio, specialties, cuisines.
+            (-func.bm25(fts, 10.0, 1.0, 3.0, 3.0)).label("score"),
+        ).where(fts.op("MATCH")(" ".join(f'"{term}"*' for term in terms)))
+
+    return ranked.subquery("ranked")
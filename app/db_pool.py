@@ -0,0 +1,254 @@
+"""
+Connection pool configuration, instrumentation and readiness checks
+
+Engines are built with engine_options(), which applies the DB_POOL_* settings
+and swaps in pool classes that count checkouts, waits, timeouts and
+invalidated connections. pool_metrics() turns a pool into the "db_pool"
+section of /api/metrics. With SQLITE_OPTIMIZED, build_engines() splits a
+SQLite file into one writer connection and a reader pool, both in WAL mode.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from config.settings import settings
+
+
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "postgres": "postgresql+asyncpg"}
+
+
+def async_database_url(url: str) -> str:
+    """Swap a sync driver for its async counterpart: sqlite:// -> sqlite+aiosqlite://, postgresql:// -> postgresql+asyncpg://"""
+    scheme, separator, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme.split("+")[0], scheme) + separator + rest
+
+
+class PoolStats:
+    """Counters for one engine's pool; gauges come from the pool itself."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = self.connects = self.invalidations = self.timeouts = 0
+        self.wait_seconds_total = self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def increment(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+class _InstrumentedPoolMixin:
+    """Times every checkout, including the wait for a free connection, and counts pool timeouts."""
+
+    stats: PoolStats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.stats.increment("timeouts")
+            raise
+        finally:
+            self.stats.record_wait(time.perf_counter() - started)
+
+    def recreate(self):
+        pool = super().recreate()  # dispose() and invalidation replace the pool; keep counting in the same place.
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def is_sqlite_file(url: str) -> bool:
+    return url.startswith("sqlite") and not (":memory:" in url or url.rstrip("/").endswith(":"))
+
+
+def uses_sqlite_profile(url: str) -> bool:
+    """Whether SQLITE_OPTIMIZED applies: WAL needs a database file, so in-memory SQLite is left alone."""
+    return settings.SQLITE_OPTIMIZED and is_sqlite_file(url)
+
+
+def engine_options(url: str, is_async: bool = False, writer: bool = False) -> Dict[str, Any]:
+    """
+    Keyword arguments for create_engine/create_async_engine from the DB_POOL_* settings.
+
+    Args:
+        url: Database URL the engine is built for
+        is_async: Whether the engine is an async one (needs the async-adapted pool)
+        writer: Build the single-connection SQLite writer instead of a pool
+
+    Returns:
+        Engine options; in-memory SQLite keeps SQLAlchemy's single-connection pool
+    """
+    options: Dict[str, Any] = {"connect_args": {"check_same_thread": False}} if url.startswith("sqlite") and not is_async else {}
+    if url.startswith("sqlite") and not is_sqlite_file(url):
+        return options
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=1 if writer else settings.DB_POOL_SIZE,
+        max_overflow=0 if writer else settings.DB_POOL_MAX_OVERFLOW,  # SQLite allows one writer at a time; queue for it here instead of on SQLITE_BUSY.
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,  # Reconnect before PostgreSQL or a proxy drops idle connections.
+        pool_pre_ping=settings.DB_POOL_PRE_PING,  # A stale connection (e.g. after a database restart) is replaced, not handed to a request.
+    )
+    return options
+
+
+def configure_sqlite(engine: Engine, writer: bool = False) -> None:
+    """
+    Apply the SQLite production pragmas to every connection the engine opens.
+
+    Args:
+        engine: Engine on a SQLite database file
+        writer: Also start every transaction with BEGIN IMMEDIATE, taking the
+            write lock up front; a deferred transaction that reads and then
+            writes can fail with "database is locked" without waiting at all
+    """
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")  # Readers no longer block the writer, nor it them.
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")  # NORMAL is durable across app crashes in WAL mode; only an OS crash can lose the last commits.
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")  # Negative: KiB rather than pages.
+        cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+        cursor.close()
+        if writer:
+            dbapi_connection.isolation_level = None  # pysqlite would otherwise issue its own deferred BEGIN.
+
+    if writer:
+        @event.listens_for(engine, "begin")
+        def _begin_immediate(connection):
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def build_engines(url: str) -> Tuple[Engine, Engine]:
+    """
+    Create the instrumented engine(s) for a database URL.
+
+    Returns:
+        (engine, read_engine): with the SQLite profile, a single writer connection
+        and a pool of readers; otherwise the same engine twice
+    """
+    if not uses_sqlite_profile(url):
+        engine = create_engine(url, **engine_options(url))
+        instrument_engine(engine)
+        return engine, engine
+    engine = create_engine(url, **engine_options(url, writer=True))
+    read_engine = create_engine(url, **engine_options(url))
+    for each, writer in ((engine, True), (read_engine, False)):
+        instrument_engine(each)
+        configure_sqlite(each, writer=writer)
+    return engine, read_engine
+
+
+def build_replica_engines(urls: List[str], is_async: bool = False) -> list:
+    """Create an instrumented read pool per replica URL (async engines when is_async)."""
+    replicas = []
+    for url in urls:
+        replica = create_async_engine(async_database_url(url), **engine_options(url, is_async=True)) if is_async else create_engine(url, **engine_options(url))
+        sync_replica = replica.sync_engine if is_async else replica
+        instrument_engine(sync_replica)
+        if uses_sqlite_profile(url):
+            configure_sqlite(sync_replica)
+        replicas.append(replica)
+    return replicas
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach PoolStats to the engine's pool and count new and invalidated connections."""
+    pool = engine.pool
+    if not isinstance(pool, _InstrumentedPoolMixin):
+        return
+    pool.stats = PoolStats()
+    event.listen(pool, "connect", lambda *args: engine.pool.stats.increment("connects"))
+    event.listen(pool, "invalidate", lambda *args: engine.pool.stats.increment("invalidations"))
+
+
+def pool_metrics(pool: Pool) -> Dict[str, Any]:
+    """Gauges and counters of a pool, for /api/metrics."""
+    if not isinstance(pool, _InstrumentedPoolMixin):
+        return {"pool": pool.status()}
+    stats = pool.stats
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),  # Negative while the pool is still filling up.
+        "max_overflow": pool._max_overflow,
+        "checkouts": stats.checkouts,
+        "connects": stats.connects,
+        "invalidations": stats.invalidations,
+        "timeouts": stats.timeouts,
+        "wait_ms_avg": round(stats.wait_seconds_total / stats.checkouts * 1000, 3) if stats.checkouts else 0.0,
+        "wait_ms_max": round(stats.wait_seconds_max * 1000, 3),
+    }
+
+
+def _ping(engine: Engine) -> None:
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+# Sync pings run on their own thread, never the shared threadpool: a ping stuck
+# on checkout of an exhausted pool can block for DB_POOL_TIMEOUT_SECONDS, and
+# probes arrive exactly then. While one is stuck, later probes wait on it
+# instead of starting another.
+_probe_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="readiness-probe")
+_probe_lock = threading.Lock()
+_probe_in_flight: Optional[Tuple[Engine, Future]] = None
+
+
+def _sync_ping(engine: Engine) -> Future:
+    global _probe_in_flight
+    with _probe_lock:
+        if _probe_in_flight is None or _probe_in_flight[0] is not engine or _probe_in_flight[1].done():
+            _probe_in_flight = (engine, _probe_executor.submit(_ping, engine))
+        return _probe_in_flight[1]
+
+
+async def check_database_ready(engine: Engine, async_engine=None, timeout: float = 2.0) -> float:
+    """
+    Check out a connection and run SELECT 1, giving up after timeout seconds.
+
+    Args:
+        engine: Sync engine to check
+        async_engine: Async engine to check instead, when the app serves requests through one
+        timeout: Deadline in seconds for checkout and query together
+
+    Returns:
+        Seconds the check took
+
+    Raises:
+        asyncio.TimeoutError: No connection within the deadline (e.g. the pool is exhausted)
+        sqlalchemy.exc.SQLAlchemyError: The database refused the connection or the query
+    """
+    started = time.perf_counter()
+    if async_engine is not None:
+        async def _async_ping():
+            async with async_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        await asyncio.wait_for(_async_ping(), timeout)
+    else:
+        await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(_sync_ping(engine))), timeout)  # Shielded: a later probe may still be waiting on the same ping.
+    return time.perf_counter() - started
@@ -0,0 +1,110 @@
+"""
+Session that sends writes to the primary engine and plain reads to reader engines
+
+Readers are the SQLite profile's reader pool, or replica databases for GET
+requests. A transaction that has written once stays on the writer until it
+ends, so it reads its own changes and keeps the write lock it took.
+RecentWriters remembers who wrote in the last few seconds, so their next
+reads go to the primary instead of a replica that may not have caught up.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, Iterable, Sequence, Tuple
+
+from fastapi import Request
+from jose import JWTError, jwt
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import TextClause
+
+
+def is_write(clause) -> bool:
+    """INSERT/UPDATE/DELETE, SELECT ... FOR UPDATE, and raw text, which may write."""
+    return isinstance(clause, (UpdateBase, TextClause)) or getattr(clause, "_for_update_arg", None) is not None
+
+
+class RoutingSession(Session):
+    """
+    Session bound to a writer engine plus optional reader engines.
+
+    Flushes, DML and locking reads go to the writer (bind). Other reads go to a
+    reader, unless this transaction has already used the writer. Without
+    readers it behaves like a plain Session.
+    """
+
+    def __init__(self, *args, readers: Sequence[Engine] = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.readers = list(readers)
+        self.writing = False
+        self.wrote = False  # Any write during the session's lifetime, for read-your-writes.
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        writer = super().get_bind(mapper, clause=clause, **kwargs)
+        if self.writing:
+            return writer
+        if self._flushing or is_write(clause):
+            self.writing = self.wrote = True  # The transaction this starts (or continues) stays on the writer.
+            return writer
+        return random.choice(self.readers) if self.readers else writer
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_writing(session, transaction):
+    if transaction.parent is None:
+        session.writing = False  # Next transaction starts on a reader again.
+
+
+class RecentWriters:
+    """
+    Clients that wrote within the last window_seconds.
+
+    Kept per process: with several workers, a write and the next read may
+    land on different processes, so size the window for replication lag only.
+    """
+
+    def __init__(self, window_seconds: float, maxsize: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self.window_seconds = window_seconds
+        self.maxsize = maxsize
+        self._clock = clock
+        self._written_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, keys: Iterable[str]) -> None:
+        now = self._clock()
+        with self._lock:
+            for key in keys:
+                self._written_at[key] = now
+            if len(self._written_at) > self.maxsize:
+                cutoff = now - self.window_seconds
+                self._written_at = {key: at for key, at in self._written_at.items() if at > cutoff}
+
+    def wrote_recently(self, keys: Iterable[str]) -> bool:
+        cutoff = self._clock() - self.window_seconds
+        with self._lock:
+            return any(self._written_at.get(key, cutoff) > cutoff for key in keys)
+
+
+def client_keys(request: Request) -> Tuple[str, ...]:
+    """
+    Identify who sent a request: the token's user and the client address.
+
+    The token is not verified here; a forged one can only send its own reads
+    to the primary. The address covers writes made before a token existed,
+    like registering and then opening the new profile.
+    """
+    keys = []
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            subject = jwt.get_unverified_claims(token).get("sub")
+        except JWTError:
+            subject = None
+        if subject:
+            keys.append(f"user:{subject}")
+    if request.client:
+        keys.append(f"address:{request.client.host}")
+    return tuple(keys)
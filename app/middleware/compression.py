@@ -0,0 +1,265 @@
+"""
+Negotiated response compression (zstd, brotli, gzip) as ASGI middleware
+
+Bodies are buffered until they reach COMPRESSION_MINIMUM_SIZE. Anything that
+ends below it goes out untouched. Anything that reaches it is compressed with
+the best encoding both sides support. Every compressible response carries
+Vary: Accept-Encoding, compressed or not, so shared caches key them alike. Streamed bodies keep streaming, with
+each chunk compressed and flushed as it arrives. A route can opt out with
+dependencies=[Depends(skip_compression)].
+"""
+
+import zlib
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import register_metrics
+from config.settings import settings
+
+try:
+    import brotli
+except ImportError:  # br is only offered when the brotli package is installed.
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstd is only offered when the zstandard package is installed.
+    zstandard = None
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/x-ndjson", "application/javascript", "application/xml", "image/svg+xml")
+
+
+class _GzipCompressor:
+    def __init__(self):
+        self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits 31 writes a gzip header.
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+COMPRESSORS = {"gzip": _GzipCompressor}
+if brotli is not None:
+    COMPRESSORS["br"] = _BrotliCompressor
+if zstandard is not None:
+    COMPRESSORS["zstd"] = _ZstdCompressor
+
+
+class CompressionStats:
+    """Raw and compressed byte totals per encoding, published at /api/metrics."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.by_encoding: Dict[str, Dict[str, int]] = {}
+        self.below_minimum_size = 0
+        self.skipped = 0
+
+    def record(self, encoding: str, raw_bytes: int, compressed_bytes: int) -> None:
+        totals = self.by_encoding.setdefault(encoding, {"responses": 0, "raw_bytes": 0, "compressed_bytes": 0})
+        totals["responses"] += 1
+        totals["raw_bytes"] += raw_bytes
+        totals["compressed_bytes"] += compressed_bytes
+
+    def stats(self) -> Dict[str, object]:
+        raw = sum(totals["raw_bytes"] for totals in self.by_encoding.values())
+        compressed = sum(totals["compressed_bytes"] for totals in self.by_encoding.values())
+        return {
+            "responses": sum(totals["responses"] for totals in self.by_encoding.values()),
+            "raw_bytes": raw,
+            "compressed_bytes": compressed,
+            "ratio": round(compressed / raw, 4) if raw else 0.0,
+            "by_encoding": {encoding: dict(totals) for encoding, totals in self.by_encoding.items()},
+            "below_minimum_size": self.below_minimum_size,
+            "skipped": self.skipped,
+        }
+
+
+compression_stats = CompressionStats()
+register_metrics("compression", compression_stats.stats)
+
+
+def negotiate_encoding(accept_encoding: str, preferred: List[str]) -> Optional[str]:
+    """
+    Pick the content coding to answer an Accept-Encoding header with.
+
+    Args:
+        accept_encoding: Raw header value, like "gzip, br;q=0.9"
+        preferred: Codings the server can produce, best first; ties on q go to the earlier one
+
+    Returns:
+        The chosen coding, or None to send the body as is
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    best, best_weight = None, 0.0
+    for coding in preferred:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def skip_compression(request: Request) -> None:
+    """Route dependency that sends the response uncompressed, e.g. for bodies that are already compressed."""
+    request.state.skip_compression = True
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the client's best supported encoding.
+
+    Only COMPRESSIBLE_TYPES are compressed, and only when the body reaches
+    minimum_size and carries no Content-Encoding yet. Those types get
+    Vary: Accept-Encoding even when sent as is, because the same URL is
+    compressed for other clients or larger bodies. Compressed responses have
+    their ETag made weak because the bytes differ from the identity
+    representation.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, encodings: Optional[List[str]] = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = [encoding for encoding in (encodings or ["zstd", "br", "gzip"]) if encoding in COMPRESSORS]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        await _CompressedResponder(scope, encoding, self.minimum_size)(self.app, receive, send)
+
+
+class _CompressedResponder:
+    """Per-request state: holds the start message and early chunks until the size decision is made."""
+
+    def __init__(self, scope: Scope, encoding: Optional[str], minimum_size: int):
+        self.scope = scope
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.buffered: List[bytes] = []
+        self.buffered_size = 0
+        self.compressor = None
+        self.passthrough = False
+        self.raw_bytes = self.compressed_bytes = 0
+
+    async def __call__(self, app: ASGIApp, receive: Receive, send: Send) -> None:
+        self.send = send
+        await app(self.scope, receive, self.on_send)
+
+    def _eligible(self, start: Message) -> bool:
+        headers = Headers(raw=start["headers"])
+        content_type = headers.get("content-type", "")
+        if start["status"] < 200 or start["status"] in (204, 304) or "content-encoding" in headers:
+            return False
+        if not content_type.startswith(COMPRESSIBLE_TYPES) or self.scope.get("state", {}).get("skip_compression"):
+            compression_stats.skipped += 1
+            return False
+        return True
+
+    async def on_send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            if self._eligible(message):
+                MutableHeaders(raw=message["headers"]).add_vary_header("Accept-Encoding")
+                self.passthrough = self.encoding is None  # No encoding the client accepts: identity, but still Vary.
+            else:
+                self.passthrough = True
+            if self.passthrough:
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+        if self.compressor is not None:
+            await self._send_compressed(body, more_body)
+            return
+
+        self.buffered.append(body)
+        self.buffered_size += len(body)
+        if self.buffered_size < self.minimum_size and more_body:
+            return  # Not sure yet whether the body is worth compressing.
+        if self.buffered_size < self.minimum_size:
+            compression_stats.below_minimum_size += 1
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": b"".join(self.buffered)})
+            return
+
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        self.compressor = COMPRESSORS[self.encoding]()
+        buffered, self.buffered = b"".join(self.buffered), []
+        if more_body:
+            del headers["Content-Length"]  # Streamed: the compressed length is not known up front.
+            await self.send(self.start)
+            await self._send_compressed(buffered, more_body)
+            return
+        compressed = self.compressor.compress(buffered) + self.compressor.finish()
+        headers["Content-Length"] = str(len(compressed))
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": compressed})
+        compression_stats.record(self.encoding, len(buffered), len(compressed))
+
+    async def _send_compressed(self, body: bytes, more_body: bool) -> None:
+        chunk = self.compressor.compress(body) + (self.compressor.flush() if more_body else self.compressor.finish())
+        self.raw_bytes += len(body)
+        self.compressed_bytes += len(chunk)
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+        if not more_body:
+            compression_stats.record(self.encoding, self.raw_bytes, self.compressed_bytes)
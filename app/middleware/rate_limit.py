@@ -0,0 +1,256 @@
+"""
+Token-bucket rate limiting per client and route, as ASGI middleware
+
+Every request takes one token from the bucket for (route rule, client). The
+client is the user of a bearer token the auth path already verified, or the
+address for anonymous requests and for tokens not verified yet.
+Expensive routes like login and register get small budgets, cheap ones like
+chef search get large ones, and everything else shares RATE_LIMIT_DEFAULT.
+An empty bucket answers 429 with Retry-After before the route runs, so a
+script hammering login never reaches bcrypt.
+
+Buckets live in a store picked by RATE_LIMIT_STORE, never in the app's
+database:
+    sqlite:///<path>    a local file shared by every uvicorn worker on the host (the default)
+    memory              per process; fine for a single worker and for tests
+    <module>:<factory>  anything else, like a Redis-backed store, built by calling factory()
+
+Stores are awaited, so one doing I/O never blocks the event loop; the SQLite
+store runs its transaction in a worker thread. If a store fails, the request
+is let through with a logged warning: an outage of the limiter must not take
+the API down with it.
+
+Behind a proxy every request comes from the proxy's address, so anonymous
+clients would share one bucket. RATE_LIMIT_PROXY_HOPS is how many proxies
+append to X-Forwarded-For; the client is the entry that many places from the
+right, the last one a trusted proxy wrote. Entries further left come from the
+client and are never used.
+"""
+
+import importlib
+import logging
+import math
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Protocol, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.auth import principal_cache
+from app.utils.metrics import register_metrics
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+PRUNE_EVERY = 1000  # Takes between sweeps of idle buckets in the SQLite store.
+
+logger = logging.getLogger(__name__)
+
+
+def parse_rate(rate: str) -> Tuple[float, float]:
+    """
+    Parse a budget like "10/minute".
+
+    Args:
+        rate: Requests per period; the period is second, minute, hour or day
+
+    Returns:
+        (capacity, tokens refilled per second); a full bucket allows a burst of capacity requests
+    """
+    count, _, period = rate.partition("/")
+    try:
+        capacity = float(count)
+    except ValueError:
+        capacity = math.nan
+    if period not in PERIODS or not 0 < capacity < math.inf:
+        raise ValueError(f"Invalid rate {rate!r}: expected <count>/<{'|'.join(PERIODS)}> with a positive count")
+    return capacity, capacity / PERIODS[period]
+
+
+class RateLimitStore(Protocol):
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        """Take one token; return 0 if allowed, else the seconds until a token is available."""
+
+
+def _refill(tokens: float, updated_at: float, now: float, capacity: float, refill_per_second: float) -> float:
+    return min(capacity, tokens + (now - updated_at) * refill_per_second)
+
+
+class MemoryStore:
+    """Buckets in this process only; each uvicorn worker enforces its own budget."""
+
+    def __init__(self, maxsize: int = 100000, clock=time.monotonic):
+        self.maxsize = maxsize
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._clock = clock
+
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        now = self._clock()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = _refill(tokens, updated_at, now, capacity, refill_per_second)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) / refill_per_second
+            self._buckets[key] = (tokens - 1, now)
+            if len(self._buckets) > self.maxsize:
+                cutoff = now - PERIODS["day"]  # Idle a day: refilled to full anyway, so dropping it changes nothing.
+                self._buckets = {key: bucket for key, bucket in self._buckets.items() if bucket[1] > cutoff}
+            return 0.0
+
+
+class SQLiteStore:
+    """
+    Buckets in a local SQLite file, shared by every worker process on the host.
+
+    Each take is one short write transaction on its own file in WAL mode with
+    synchronous=OFF: no fsync, no network, and no contention with the app's
+    database. Losing buckets in a power cut only resets budgets. Transactions
+    run in the threadpool, so waiting on another worker's lock only holds up
+    the request that waits.
+    """
+
+    def __init__(self, path: str, clock=time.time):
+        self.path = path
+        self._clock = clock  # Wall clock: monotonic clocks are not comparable across processes.
+        self._local = threading.local()
+        self._takes = 0
+        with self._connect() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS rate_limit_buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            self._local.connection = connection
+        return connection
+
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        return await run_in_threadpool(self._take, key, capacity, refill_per_second)
+
+    def _take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        connection = self._connect()
+        now = self._clock()
+        connection.execute("BEGIN IMMEDIATE")  # Serialises read-modify-write across processes.
+        try:
+            row = connection.execute("SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?", (key,)).fetchone()
+            tokens = _refill(*row, now, capacity, refill_per_second) if row else capacity
+            allowed = tokens >= 1
+            connection.execute("INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated_at) VALUES (?, ?, ?)", (key, tokens - 1 if allowed else tokens, now))
+            self._takes += 1
+            if self._takes % PRUNE_EVERY == 0:
+                connection.execute("DELETE FROM rate_limit_buckets WHERE updated_at < ?", (now - PERIODS["day"],))  # Idle a day: refilled to full anyway.
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return 0.0 if allowed else (1 - tokens) / refill_per_second
+
+
+def build_store(spec: str) -> RateLimitStore:
+    """Create the store named by RATE_LIMIT_STORE."""
+    if spec == "memory":
+        return MemoryStore()
+    if spec.startswith("sqlite:///"):
+        return SQLiteStore(spec[len("sqlite:///"):])
+    module, _, factory = spec.partition(":")
+    if not factory:
+        raise ValueError(f"Invalid RATE_LIMIT_STORE {spec!r}: expected memory, sqlite:///<path> or <module>:<factory>")
+    return getattr(importlib.import_module(module), factory)()
+
+
+def client_address(scope: Scope, proxy_hops: int = 0) -> str:
+    """The connecting address, or with proxy_hops the address the outermost trusted proxy saw."""
+    client = scope.get("client")
+    address = client[0] if client else "unknown"
+    if proxy_hops:
+        forwarded = [host.strip() for header in Headers(scope=scope).getlist("x-forwarded-for") for host in header.split(",") if host.strip()]
+        if len(forwarded) >= proxy_hops:  # Fewer: the request bypassed a proxy, so the socket address is the client's.
+            address = forwarded[-proxy_hops]
+    return address
+
+
+def client_identity(scope: Scope, proxy_hops: int = 0) -> str:
+    """
+    The token's user if get_current_user has verified and cached it, else the client address.
+
+    Only principal_cache is consulted, so the token is verified once, by the
+    auth path, not again here on every request. A forged or not yet verified
+    token counts against the address: rotating junk tokens opens no new buckets.
+    Behind proxies, proxy_hops picks the address from X-Forwarded-For.
+    """
+    scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+    principal = principal_cache.peek(token) if scheme.lower() == "bearer" and token else None
+    if principal is not None:
+        return f"user:{principal['id']}"
+    return f"address:{client_address(scope, proxy_hops)}"
+
+
+class RateLimitStats:
+    def __init__(self):
+        self.allowed = 0
+        self.limited = 0
+        self.store_errors = 0
+
+    def __call__(self) -> Dict[str, int]:
+        return {"allowed": self.allowed, "limited": self.limited, "store_errors": self.store_errors}
+
+
+rate_limit_stats = RateLimitStats()
+register_metrics("rate_limit", rate_limit_stats)
+
+
+class RateLimitMiddleware:
+    """
+    Rejects requests over their budget with 429 and Retry-After.
+
+    Args:
+        app: The wrapped ASGI app
+        store: Where buckets live; shared across workers unless it is a MemoryStore
+        default: Budget for routes without their own rule, like "300/minute"
+        routes: Budgets by "METHOD /path", matched exactly on the path without query string
+        exempt_paths: Paths never limited, like health checks polled by the load balancer
+        proxy_hops: Trusted proxies appending to X-Forwarded-For in front of the app; 0 uses the socket address
+    """
+
+    def __init__(self, app: ASGIApp, store: RateLimitStore, default: str, routes: Optional[Dict[str, str]] = None, exempt_paths=(), proxy_hops: int = 0):
+        self.app = app
+        self.store = store
+        self.default = parse_rate(default)
+        self.routes = {rule: parse_rate(rate) for rule, rate in (routes or {}).items()}
+        self.exempt_paths = set(exempt_paths)
+        self.proxy_hops = proxy_hops
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)  # CORS preflights carry no credentials and cost nothing.
+            return
+
+        rule = f"{scope['method']} {scope['path']}"
+        capacity, refill_per_second = self.routes.get(rule) or self.default
+        bucket = f"{rule if rule in self.routes else 'default'}|{client_identity(scope, self.proxy_hops)}"
+        try:
+            retry_after = await self.store.take(bucket, capacity, refill_per_second)
+        except Exception:
+            rate_limit_stats.store_errors += 1
+            logger.warning("Rate limit store failed for %s; letting the request through", rule, exc_info=True)
+            retry_after = 0.0
+
+        if retry_after:
+            rate_limit_stats.limited += 1
+            seconds = math.ceil(retry_after)
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": f"Too many requests. Try again in {seconds} second{'s' if seconds != 1 else ''}."},
+                headers={"Retry-After": str(seconds)},
+            )
+            await response(scope, receive, send)
+            return
+
+        rate_limit_stats.allowed += 1
+        await self.app(scope, receive, send)
@@ -6,13 +6,17 @@ This package contains all database models:
 - Chef: Chef profile (bio, cuisines, pricing, location)
 - Client: Client profile (contact info, preferences)
 - Booking: Appointment/booking between client and chef
+- Cuisine: Normalized cuisine tag shared by chef and client profiles
+- ChefAvailability / ChefAvailabilityException: Weekly windows and dated exceptions
 
 Import all models here so they can be used throughout the app.
 """
 from app.models.user import User, UserRole
 from app.models.chef import Chef
 from app.models.client import Client
-from app.models.booking import Booking, BookingStatus
+from app.models.booking import Booking, BookingStatus, RELEASED_STATUSES, COMMITTED_STATUSES
+from app.models.cuisine import Cuisine, chef_cuisines, client_cuisines
+from app.models.availability import ChefAvailability, ChefAvailabilityException
 
 # Export all models and enums
 __all__ = [
@@ -21,5 +25,12 @@ __all__ = [
     'Chef', 
     'Client', 
     'Booking',
-    'BookingStatus'  # Enum: pending, accepted, declined, etc.
+    'BookingStatus',  # Enum: pending, accepted, declined, etc.
+    'RELEASED_STATUSES',  # Statuses that free the chef's time again
+    'COMMITTED_STATUSES',  # Statuses that may not overlap for one chef
+    'Cuisine',
+    'chef_cuisines',
+    'client_cuisines',
+    'ChefAvailability',
+    'ChefAvailabilityException'
 ]
@@ -0,0 +1,51 @@
+from sqlalchemy import Column, Integer, Date, Time, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from app import Base
+
+
+class ChefAvailability(Base):
+    """Weekly recurring window when a chef takes bookings, like Saturdays 16:00-23:00"""
+    __tablename__ = "chef_availability"
+    __table_args__ = (
+        Index("ix_chef_availability_chef_weekday", "chef_id", "weekday", "start_time"),  # One probe per chef for the searched weekday.
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    chef_id = Column(Integer, ForeignKey("chefs.id", ondelete="CASCADE"), nullable=False)
+    weekday = Column(Integer, nullable=False)  # 0 for Monday through 6 for Sunday, like date.weekday().
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)  # Window ends at this time on the same day.
+    
+    chef = relationship("Chef", back_populates="availability")
+    
+    def to_dict(self):
+        return {
+            "weekday": self.weekday,
+            "start_time": self.start_time.isoformat(),
+            "end_time": self.end_time.isoformat(),
+        }
+
+
+class ChefAvailabilityException(Base):
+    """One-off change to a chef's week on a given date: a day off, or extra hours"""
+    __tablename__ = "chef_availability_exceptions"
+    __table_args__ = (
+        Index("ix_chef_availability_exceptions_chef_date", "chef_id", "date"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    chef_id = Column(Integer, ForeignKey("chefs.id", ondelete="CASCADE"), nullable=False)
+    date = Column(Date, nullable=False)
+    is_available = Column(Integer, nullable=False, default=0)  # 0 blocks the window (whole day without times), 1 opens it.
+    start_time = Column(Time, nullable=True)
+    end_time = Column(Time, nullable=True)
+    
+    chef = relationship("Chef", back_populates="availability_exceptions")
+    
+    def to_dict(self):
+        return {
+            "date": self.date.isoformat(),
+            "is_available": bool(self.is_available),
+            "start_time": self.start_time.isoformat() if self.start_time else None,
+            "end_time": self.end_time.isoformat() if self.end_time else None,
+        }
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, Date, Time, DateTime, ForeignKey, Enum as SQLEnum, Text
+from datetime import datetime, timedelta
+from sqlalchemy import Column, Integer, String, Float, Date, Time, DateTime, ForeignKey, Enum as SQLEnum, Text, Index, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app import Base
@@ -14,8 +15,24 @@ class BookingStatus(enum.Enum):
     CANCELLED = "cancelled"
 
 
+# Statuses that no longer hold the chef's time.
+RELEASED_STATUSES = (BookingStatus.DECLINED, BookingStatus.CANCELLED)
+
+# Statuses the chef has committed to; no two of these may overlap.
+COMMITTED_STATUSES = (BookingStatus.ACCEPTED, BookingStatus.CONFIRMED, BookingStatus.COMPLETED)
+
+
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Overlap checks seek by chef, then range-scan start_at over a window bounded by the longest allowed booking.
+        Index("ix_bookings_chef_start", "chef_id", "start_at"),
+        # GET /api/bookings lists one party's bookings, optionally by status.
+        Index("ix_bookings_client_status", "client_id", "status"),
+        Index("ix_bookings_chef_status", "chef_id", "status"),
+        # Client exports read in (start_at, id) order, optionally over a date range; ix_bookings_chef_start does this for chefs.
+        Index("ix_bookings_client_start", "client_id", "start_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     client_id = Column(Integer, ForeignKey("clients.id"), nullable=False)  # Which client made the booking.
@@ -24,6 +41,8 @@ class Booking(Base):
     booking_date = Column(Date, nullable=False)  # The day of the booking.
     booking_time = Column(Time, nullable=False)  # The time of the booking.
     duration_hours = Column(Float, nullable=False)  # How many hours the booking lasts.
+    start_at = Column(DateTime, nullable=True)  # booking_date + booking_time, kept in step on every save.
+    end_at = Column(DateTime, nullable=True)  # start_at + duration_hours.
     location = Column(String(500), nullable=False)  # Where the chef should come.
     
     hourly_rate = Column(Float, nullable=False)  # Chef's rate locked at booking time.
@@ -59,3 +78,15 @@ class Booking(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+def set_booking_interval(mapper, connection, target) -> None:
+    """Mapper hook deriving start_at/end_at from the booking's date, time and duration."""
+    if target.booking_date is None or target.booking_time is None or target.duration_hours is None:
+        return
+    target.start_at = datetime.combine(target.booking_date, target.booking_time)
+    target.end_at = target.start_at + timedelta(hours=target.duration_hours)
+
+
+event.listen(Booking, "before_insert", set_booking_interval)
+event.listen(Booking, "before_update", set_booking_interval)
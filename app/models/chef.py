@@ -1,28 +1,50 @@
-from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Float, ForeignKey, Index, event
 from sqlalchemy.orm import relationship
 from app import Base
+from app.utils.geo import set_geohash
+from app.utils.ranking import set_ranking_score
 
 
 class Chef(Base):
     __tablename__ = "chefs"
+    __table_args__ = (
+        # One index per sort order of GET /api/chefs, led by the is_available filter and ending in id as tie-breaker.
+        Index("ix_chefs_available_price", "is_available", "hourly_rate", "id"),
+        Index("ix_chefs_available_rating", "is_available", "rating", "id"),
+        Index("ix_chefs_available_experience", "is_available", "years_of_experience", "id"),
+        Index("ix_chefs_available_newest", "is_available", "id"),
+        Index("ix_chefs_available_ranking", "is_available", "ranking_score", "id"),
+        Index("ix_chefs_available_geohash", "is_available", "geohash"),  # Radius search scans a few geohash cell ranges.
+        Index("ix_chefs_available_location", "is_available", "location"),  # Location facet counts group along this index.
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), unique=True, nullable=False)  # Links to User table, one chef per user.
     
     bio = Column(Text, nullable=True)  # Chef's description and background.
-    cuisines = Column(String(500), nullable=True)  # Comma-separated list like "Italian,French,Mediterranean".
+    cuisines = Column(String(500), nullable=True)  # Comma-separated display copy of cuisine_tags like "Italian,French,Mediterranean".
     specialties = Column(Text, nullable=True)  # Special skills or signature dishes.
     hourly_rate = Column(Float, nullable=False, default=0.0)  # How much they charge per hour.
     location = Column(String(255), nullable=True)  # City or area where they operate.
+    latitude = Column(Float, nullable=True)  # Service area centre, used for radius search.
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True)  # Derived from latitude/longitude on every save.
     phone = Column(String(20), nullable=True)  # Contact phone number.
     photo_url = Column(String(500), nullable=True)  # URL to profile photo.
     years_of_experience = Column(Integer, default=0)  # Years cooking professionally.
     rating = Column(Float, default=0.0)  # Average rating from bookings.
     total_bookings = Column(Integer, default=0)  # Number of times booked.
     is_available = Column(Integer, default=1)  # 1 for available, 0 for unavailable.
+    ranking_score = Column(Float, nullable=False, default=0.0)  # Recommended-sort score, recomputed from the columns above on every save.
+    version = Column(Integer, nullable=False, default=1)  # Bumped on every update; the profile ETag is built from it.
+    
+    __mapper_args__ = {"version_id_col": version}
     
     user = relationship("User", backref="chef_profile", foreign_keys=[user_id])
     bookings = relationship("Booking", back_populates="chef", cascade="all, delete-orphan")
+    cuisine_tags = relationship("Cuisine", secondary="chef_cuisines")  # Normalized tags behind the cuisines string, used for filtering.
+    availability = relationship("ChefAvailability", back_populates="chef", cascade="all, delete-orphan", order_by="(ChefAvailability.weekday, ChefAvailability.start_time)")
+    availability_exceptions = relationship("ChefAvailabilityException", back_populates="chef", cascade="all, delete-orphan", order_by="ChefAvailabilityException.date")
     
     def to_dict(self):
         return {
@@ -34,6 +56,8 @@ class Chef(Base):
             "specialties": self.specialties,
             "hourly_rate": self.hourly_rate,
             "location": self.location,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
             "phone": self.phone,
             "photo_url": self.photo_url,
             "years_of_experience": self.years_of_experience,
@@ -41,3 +65,9 @@ class Chef(Base):
             "total_bookings": self.total_bookings,
             "is_available": bool(self.is_available),
         }
+
+
+event.listen(Chef, "before_insert", set_geohash)
+event.listen(Chef, "before_update", set_geohash)
+event.listen(Chef, "before_insert", set_ranking_score)
+event.listen(Chef, "before_update", set_ranking_score)
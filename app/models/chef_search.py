@@ -0,0 +1,104 @@
+"""
+Full-text index over chef name, bio, specialties and cuisines
+
+SQLite gets an FTS5 virtual table and PostgreSQL a tsvector table with a GIN
+index; the DDL runs with Base.metadata.create_all on whichever dialect the
+engine from settings.DATABASE_URL uses. Index rows are rewritten in the same
+transaction by an after_flush hook whenever a chef is created, deleted or has
+an indexed field changed, or when a chef's user is renamed.
+"""
+from sqlalchemy import DDL, bindparam, event, inspect, select, text, table, column
+from sqlalchemy.orm import Session
+from app import Base
+from app.models.chef import Chef
+from app.models.user import User
+
+
+INDEXED_CHEF_FIELDS = ("bio", "specialties", "cuisines")
+
+# Lightweight table clauses; the real tables are created by the DDL below, not by the ORM.
+sqlite_chef_search = table("chef_search", column("rowid"), column("name"), column("bio"), column("specialties"), column("cuisines"))
+postgres_chef_search = table("chef_search", column("chef_id"), column("document"))
+
+# prefix='2 3' keeps extra prefix indexes so "gor*" style queries stay index lookups.
+event.listen(Base.metadata, "after_create", DDL(
+    "CREATE VIRTUAL TABLE IF NOT EXISTS chef_search USING fts5("
+    "name, bio, specialties, cuisines, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+).execute_if(dialect="sqlite"))
+event.listen(Base.metadata, "after_create", DDL(
+    "CREATE TABLE IF NOT EXISTS chef_search ("
+    "chef_id INTEGER PRIMARY KEY REFERENCES chefs (id) ON DELETE CASCADE, document TSVECTOR NOT NULL)"
+).execute_if(dialect="postgresql"))
+event.listen(Base.metadata, "after_create", DDL(
+    "CREATE INDEX IF NOT EXISTS ix_chef_search_document ON chef_search USING GIN (document)"
+).execute_if(dialect="postgresql"))
+event.listen(Base.metadata, "before_drop", DDL("DROP TABLE IF EXISTS chef_search"))
+
+_SQLITE_DELETE = text("DELETE FROM chef_search WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True))
+_SQLITE_INSERT = text(
+    "INSERT INTO chef_search (rowid, name, bio, specialties, cuisines) "
+    "SELECT chefs.id, users.name, chefs.bio, chefs.specialties, replace(chefs.cuisines, ',', ' ') "
+    "FROM chefs JOIN users ON users.id = chefs.user_id WHERE chefs.id IN :ids"
+).bindparams(bindparam("ids", expanding=True))
+_POSTGRES_DELETE = text("DELETE FROM chef_search WHERE chef_id IN :ids").bindparams(bindparam("ids", expanding=True))
+_POSTGRES_UPSERT = text(
+    "INSERT INTO chef_search (chef_id, document) "
+    "SELECT chefs.id, "
+    "setweight(to_tsvector('simple', coalesce(users.name, '')), 'A') || "
+    "setweight(to_tsvector('simple', replace(coalesce(chefs.cuisines, ''), ',', ' ')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(chefs.specialties, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(chefs.bio, '')), 'C') "
+    "FROM chefs JOIN users ON users.id = chefs.user_id WHERE chefs.id IN :ids "
+    "ON CONFLICT (chef_id) DO UPDATE SET document = EXCLUDED.document"
+).bindparams(bindparam("ids", expanding=True))
+
+
+def reindex_chefs(connection, chef_ids) -> None:
+    """
+    Rewrite the search index rows of the given chefs from their current data.
+
+    Args:
+        connection: Connection inside the transaction that changed the chefs
+        chef_ids: Ids of chefs to refresh; ids of deleted chefs just lose their row
+    """
+    ids = list(chef_ids)
+    if not ids:
+        return
+
+    if connection.dialect.name == "postgresql":
+        connection.execute(_POSTGRES_DELETE, {"ids": ids})
+        connection.execute(_POSTGRES_UPSERT, {"ids": ids})
+    else:
+        connection.execute(_SQLITE_DELETE, {"ids": ids})
+        connection.execute(_SQLITE_INSERT, {"ids": ids})
+
+
+def rebuild_chef_search_index(connection) -> None:
+    """Re-index every chef, for databases that had chefs before the index existed."""
+    reindex_chefs(connection, [chef_id for (chef_id,) in connection.execute(select(Chef.id))])
+
+
+@event.listens_for(Session, "after_flush")
+def _reindex_changed_chefs(session, flush_context):
+    chef_ids, renamed_user_ids = set(), set()
+
+    for obj in session.new:
+        if isinstance(obj, Chef):
+            chef_ids.add(obj.id)
+    for obj in session.dirty:
+        state = inspect(obj)
+        if isinstance(obj, Chef) and any(state.attrs[field].history.has_changes() for field in INDEXED_CHEF_FIELDS):
+            chef_ids.add(obj.id)
+        elif isinstance(obj, User) and state.attrs.name.history.has_changes():
+            renamed_user_ids.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, Chef):
+            chef_ids.add(obj.id)
+
+    if not chef_ids and not renamed_user_ids:
+        return
+
+    connection = session.connection()
+    if renamed_user_ids:
+        chef_ids.update(connection.execute(select(Chef.id).where(Chef.user_id.in_(renamed_user_ids))).scalars())
+    reindex_chefs(connection, chef_ids)
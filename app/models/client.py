@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, event
 from sqlalchemy.orm import relationship
 from app import Base
+from app.utils.geo import set_geohash
 
 
 class Client(Base):
@@ -11,11 +12,18 @@ class Client(Base):
     
     phone = Column(String(20), nullable=True)  # Client's phone number.
     address = Column(String(500), nullable=True)  # Where they want chef services.
-    preferred_cuisines = Column(String(500), nullable=True)  # Comma-separated list of favorites.
+    latitude = Column(Float, nullable=True)  # Geocoded address, the default centre for radius search.
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True)  # Derived from latitude/longitude on every save.
+    preferred_cuisines = Column(String(500), nullable=True)  # Comma-separated display copy of cuisine_tags.
     total_bookings = Column(Integer, default=0)  # Tracks how many times they've booked.
+    version = Column(Integer, nullable=False, default=1)  # Bumped on every update; the profile ETag is built from it.
+    
+    __mapper_args__ = {"version_id_col": version}
     
     user = relationship("User", backref="client_profile", foreign_keys=[user_id])
     bookings = relationship("Booking", back_populates="client", cascade="all, delete-orphan")
+    cuisine_tags = relationship("Cuisine", secondary="client_cuisines")  # Normalized tags behind preferred_cuisines.
     
     def to_dict(self):
         return {
@@ -25,6 +33,12 @@ class Client(Base):
             "email": self.user.email if self.user else None,
             "phone": self.phone,
             "address": self.address,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
             "preferred_cuisines": self.preferred_cuisines.split(",") if self.preferred_cuisines else [],
             "total_bookings": self.total_bookings,
         }
+
+
+event.listen(Client, "before_insert", set_geohash)
+event.listen(Client, "before_update", set_geohash)
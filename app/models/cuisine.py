@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, Index
+from app import Base
+
+
+# Association tables keyed (cuisine_id, owner_id) so the primary key doubles as the cuisine -> profiles inverted index.
+chef_cuisines = Table(
+    "chef_cuisines",
+    Base.metadata,
+    Column("cuisine_id", Integer, ForeignKey("cuisines.id", ondelete="CASCADE"), primary_key=True),
+    Column("chef_id", Integer, ForeignKey("chefs.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_chef_cuisines_chef_id", "chef_id"),  # Reverse lookup when a chef's tags are replaced.
+)
+
+client_cuisines = Table(
+    "client_cuisines",
+    Base.metadata,
+    Column("cuisine_id", Integer, ForeignKey("cuisines.id", ondelete="CASCADE"), primary_key=True),
+    Column("client_id", Integer, ForeignKey("clients.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_client_cuisines_client_id", "client_id"),
+)
+
+
+class Cuisine(Base):
+    __tablename__ = "cuisines"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), nullable=False)  # Display name as first entered, like "Italian".
+    slug = Column(String(100), unique=True, index=True, nullable=False)  # Lowercased name used for lookups, like "italian".
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+        }
@@ -21,6 +21,9 @@ class User(Base):
     firebase_uid = Column(String(255), unique=True, nullable=True)  # For Google/Facebook login.
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    version = Column(Integer, nullable=False, default=1)  # Bumped on every update; part of profile ETags.
+    
+    __mapper_args__ = {"version_id_col": version}
     
     def to_dict(self):
         return {
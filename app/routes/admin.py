@@ -0,0 +1,48 @@
+import io
+import secrets
+import tempfile
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from starlette.concurrency import run_in_threadpool
+from app import AnySession, get_db
+from app.controllers.chef_import import import_chefs
+from app.routes.booking import booking_export_response, booking_list_query, filter_bookings
+from config.settings import settings
+
+router = APIRouter()
+
+CONTENT_TYPE_FORMATS = {"text/csv": "csv", "application/x-ndjson": "ndjson", "application/jsonl": "ndjson"}
+SPOOL_MAX_BYTES = 1024 * 1024  # Uploads beyond this go to a temporary file instead of memory.
+
+
+def require_admin(x_admin_key: Optional[str] = Header(None)):
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")  # Admin routes are off until a key is configured.
+    if not x_admin_key or not secrets.compare_digest(x_admin_key, settings.ADMIN_API_KEY):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin key")
+
+
+@router.post("/chefs/import", dependencies=[Depends(require_admin)])
+async def import_chef_file(request: Request, format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"), db: AnySession = Depends(get_db)):
+    format = format or CONTENT_TYPE_FORMATS.get(request.headers.get("content-type", "").split(";")[0].strip())
+    if not format:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson")
+    
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as upload:
+        async for chunk in request.stream():
+            await run_in_threadpool(upload.write, chunk)  # Spooled so the CSV reader can pull it line by line; past SPOOL_MAX_BYTES that is disk I/O, kept off the event loop.
+        upload.seek(0)
+        return await import_chefs(db, io.TextIOWrapper(upload, encoding="utf-8-sig", newline=""), format)  # Per-row error report; see app/controllers/chef_import.py.
+
+
+@router.get("/bookings/export", dependencies=[Depends(require_admin)])
+async def export_all_bookings(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    status_filter: Optional[str] = Query(None, alias="status", pattern="^(pending|accepted|confirmed|declined|completed|cancelled)$"),
+    db: AnySession = Depends(get_db)
+):
+    query = filter_bookings(booking_list_query(), date_from, date_to, status_filter)
+    return booking_export_response(db, query, format, "all-bookings")  # Every party's bookings, for finance; streamed like GET /api/bookings/export.
@@ -1,66 +1,106 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from app import get_db
+from app import AnySession, get_db, release_connection, run_db
 from app.models.user import User, UserRole
 from app.models.chef import Chef
 from app.models.client import Client
 from app.schemas.auth import UserRegister, UserLogin, Token, UserResponse
-from app.utils.auth import hash_password, verify_password, create_access_token
+from app.utils.auth import create_access_token
+from app.utils.password_hashing import password_hasher
+from app.controllers.chef_search import invalidate_chef_searches
 
 router = APIRouter()
 
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
-def register(user_data: UserRegister, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    
+async def register(user_data: UserRegister, db: AnySession = Depends(get_db)):
+    password_hash = await password_hasher.hash(user_data.password)  # bcrypt is slow on purpose; it runs in the hashing process pool, or 503s when that is full.
+    return await run_db(db, create_user, user_data, password_hash)
+
+
+def find_user_by_email(db: Session, email: str):
+    user = db.query(User).filter(User.email == email).first()
+    release_connection(db, user)  # Password hashing comes next; don't hold a connection through it.
+    return user
+
+
+def create_user(db: Session, user_data: UserRegister, password_hash: str):
     new_user = User(
         email=user_data.email,
-        password_hash=hash_password(user_data.password),
+        password_hash=password_hash,
         name=user_data.name,
         role=UserRole.CHEF if user_data.role == "chef" else UserRole.CLIENT
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    profile = Chef(user=new_user) if user_data.role == "chef" else Client(user=new_user)
+    db.add(profile)
     
-    if user_data.role == "chef":
-        chef_profile = Chef(user_id=new_user.id)
-        db.add(chef_profile)
-    else:
-        client_profile = Client(user_id=new_user.id)
-        db.add(client_profile)
+    try:
+        db.flush()  # User and profile INSERTs in one transaction; ids and created_at come back with them.
+    except IntegrityError as error:
+        db.rollback()
+        if "email" not in str(error.orig).lower():
+            raise
+        # The unique index decides, so two signups racing with one email can't both get through.
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
     
+    user = new_user.to_dict()
+    profile_key = "chef_profile" if user_data.role == "chef" else "client_profile"
+    profile_data = profile.to_dict()  # Built before commit, which would expire the rows and cost a reload.
     db.commit()
     
-    token = create_access_token(data={"sub": str(new_user.id)})
+    if user_data.role == "chef":
+        invalidate_chef_searches(profile_data)  # A new chef can appear on cached search pages.
+    
+    token = create_access_token(data={"sub": str(user["id"])})
     
     return {
+        **user,  # Flat user fields too, for clients that read data.email and data.role directly.
         "token": token,
-        "user": new_user.to_dict()
+        "user": user,
+        profile_key: profile_data,  # Saves the new account a GET for its own profile.
     }
 
 
 @router.post("/login")
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == credentials.email).first()
+async def login(credentials: UserLogin, db: AnySession = Depends(get_db)):
+    user = await run_db(db, find_user_by_email, credentials.email)
+    
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     
-    if not user or not verify_password(credentials.password, user.password_hash):
+    valid, needs_rehash = await password_hasher.verify(credentials.password, user.password_hash)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
     
+    if needs_rehash:
+        await rehash_password(db, user, credentials.password)
+    
     token = create_access_token(data={"sub": str(user.id)})
     
     return {
         "token": token,
-        "user": user.to_dict()
+        "user": user.to_dict()  # Plain columns loaded above; no further database access.
     }
 
 
+async def rehash_password(db: AnySession, user: User, password: str):
+    # The hash was made at another bcrypt cost; the plain password is only available now, so upgrade it here.
+    try:
+        password_hash = await password_hasher.hash(password)
+    except HTTPException:
+        return  # Pool is full; the login itself succeeded, so try again on a later login.
+    await run_db(db, save_password_hash, user.id, password_hash)
+
+
+def save_password_hash(db: Session, user_id: int, password_hash: str):
+    db.query(User).filter(User.id == user_id).update({User.password_hash: password_hash}, synchronize_session=False)
+    db.commit()
+
+
 @router.post("/google")
-def google_login(db: Session = Depends(get_db)):
+async def google_login(db: AnySession = Depends(get_db)):
     raise HTTPException(status_code=501, detail="Google authentication not yet implemented")  # TODO: Implement Firebase integration
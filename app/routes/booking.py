@@ -1,19 +1,79 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from collections import defaultdict
+import csv
+import io
+from sqlalchemy import case, select, update
+from sqlalchemy.orm import Session, joinedload, aliased
 from typing import Optional, List
-from app import get_db
-from app.models.booking import Booking, BookingStatus
+from datetime import date, datetime, time, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import AnySession, get_db, read_engine, run_db
+from app.models.booking import Booking, BookingStatus, COMMITTED_STATUSES
 from app.models.chef import Chef
 from app.models.client import Client
 from app.models.user import User
-from app.schemas.booking import BookingCreate, BookingUpdate, BookingResponse
+from app.schemas.booking import BookingBatchUpdate, BookingCreate, BookingUpdate, BookingResponse
 from app.utils.auth import get_current_user
+from app.utils.fast_json import FastJSONResponse, encode_json
+from config.settings import settings
+from app.controllers.chef_search import invalidate_chef_availability
+from app.controllers.availability import lock_chef_schedule, find_booking_conflict, overlapping_bookings
 
 router = APIRouter()
 
+# to_dict reads both parties' user names; one query loads the booking with all four related rows.
+BOOKING_LOAD_OPTIONS = (
+    joinedload(Booking.client).joinedload(Client.user),
+    joinedload(Booking.chef).joinedload(Chef.user),
+)
+
+
+# BookingResponse fields in order, with both parties' names joined in; lists are built from these rows, not Booking objects.
+ClientUser, ChefUser = aliased(User), aliased(User)
+BOOKING_LIST_COLUMNS = (
+    Booking.id, Booking.client_id, ClientUser.name.label("client_name"), Booking.chef_id, ChefUser.name.label("chef_name"),
+    Booking.booking_date, Booking.booking_time, Booking.duration_hours, Booking.location, Booking.hourly_rate,
+    Booking.total_price, Booking.status, Booking.special_requests, Booking.notes, Booking.created_at, Booking.updated_at,
+)
+
+
+def booking_list_query():
+    return (
+        select(*BOOKING_LIST_COLUMNS).select_from(Booking)
+        .outerjoin(Client, Client.id == Booking.client_id).outerjoin(ClientUser, ClientUser.id == Client.user_id)
+        .outerjoin(Chef, Chef.id == Booking.chef_id).outerjoin(ChefUser, ChefUser.id == Chef.user_id)
+    )
+
+
+def booking_row_dict(row):
+    """Shape a BOOKING_LIST_COLUMNS row like Booking.to_dict() after BookingResponse validation; FastJSONResponse writes the dates."""
+    values = row._asdict()
+    values["status"] = row.status.value
+    return values
+
+
+def load_booking(db: Session, booking_id: int):
+    return db.query(Booking).options(*BOOKING_LOAD_OPTIONS).filter(Booking.id == booking_id).first()
+
+
+def check_chef_free(db: Session, chef_id: int, start: datetime, end: datetime, exclude_booking_id: Optional[int] = None):
+    lock_chef_schedule(db, chef_id)  # Held until commit, so two requests for the same slot can't both pass the check.
+    conflict = find_booking_conflict(db, chef_id, start, end, exclude_booking_id)
+    if conflict:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Chef is already booked from {conflict.start_at.isoformat()} to {conflict.end_at.isoformat()}"
+        )
+
 
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=BookingResponse)
-def create_booking(booking_data: BookingCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_booking(booking_data: BookingCreate, current_user: User = Depends(get_current_user), db: AnySession = Depends(get_db)):
+    return await run_db(db, _create_booking, booking_data, current_user)
+
+
+def _create_booking(db: Session, booking_data: BookingCreate, current_user: User):
     client = db.query(Client).filter(Client.user_id == current_user.id).first()
     if not client:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only clients can create bookings")
@@ -22,6 +82,9 @@ def create_booking(booking_data: BookingCreate, current_user: User = Depends(get
     if not chef:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chef not found")
     
+    start_at = datetime.combine(booking_data.booking_date, booking_data.booking_time)
+    check_chef_free(db, chef.id, start_at, start_at + timedelta(hours=booking_data.duration_hours))
+    
     total_price = booking_data.duration_hours * chef.hourly_rate
     
     new_booking = Booking(
@@ -39,36 +102,193 @@ def create_booking(booking_data: BookingCreate, current_user: User = Depends(get
     
     db.add(new_booking)
     db.commit()
-    db.refresh(new_booking)
     
-    return new_booking.to_dict()
+    booking = load_booking(db, new_booking.id)
+    invalidate_chef_availability(booking.chef.to_dict())  # The chef is no longer free at this time.
+    return booking.to_dict()
 
 
 @router.get("", response_model=List[BookingResponse])
-def list_bookings(
+async def list_bookings(
     status_filter: Optional[str] = Query(None, alias="status"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_db)
 ):
+    return await run_db(db, _list_bookings, status_filter, current_user)
+
+
+def booking_owner_filter(db: Session, current_user: User):
+    """Where-clause for the bookings the user is a party to, as their client or chef profile."""
     client = db.query(Client).filter(Client.user_id == current_user.id).first()
     chef = db.query(Chef).filter(Chef.user_id == current_user.id).first()
     
     if client:
-        query = db.query(Booking).filter(Booking.client_id == client.id)
-    elif chef:
-        query = db.query(Booking).filter(Booking.chef_id == chef.id)
-    else:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User has no profile")
+        return Booking.client_id == client.id
+    if chef:
+        return Booking.chef_id == chef.id
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User has no profile")
+
+
+def _list_bookings(db: Session, status_filter: Optional[str], current_user: User):
+    query = booking_list_query().where(booking_owner_filter(db, current_user))
     
     if status_filter:
-        query = query.filter(Booking.status == BookingStatus(status_filter))
+        query = query.where(Booking.status == BookingStatus(status_filter))
+    
+    query = query.order_by(Booking.id)  # Oldest first, whichever index the planner picks for the filter.
+    return FastJSONResponse([booking_row_dict(row) for row in db.execute(query)])  # Already shaped like BookingResponse; skip re-validating.
+
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def filter_bookings(query, date_from: Optional[date], date_to: Optional[date], status_filter: Optional[str]):
+    if date_from:
+        query = query.where(Booking.start_at >= datetime.combine(date_from, time.min))  # start_at, not booking_date: it is what ix_bookings_chef_start and ix_bookings_client_start cover.
+    if date_to:
+        query = query.where(Booking.start_at < datetime.combine(date_to + timedelta(days=1), time.min))  # Inclusive of the whole last day.
+    if status_filter:
+        query = query.where(Booking.status == BookingStatus(status_filter))
+    return query.order_by(Booking.start_at, Booking.id)
+
+
+def export_bind(db: AnySession):
+    if isinstance(db, AsyncSession):
+        return read_engine  # Async connections only work on the event loop; the export streams from a worker thread through the sync engine.
+    return db.get_bind(clause=booking_list_query())  # A reader or replica when the session has them.
+
+
+def stream_bookings(bind, query, format: str):
+    """
+    Encode the query's bookings chunk by chunk, as NDJSON lines or CSV rows.
+
+    Rows come off the cursor EXPORT_BATCH_SIZE at a time (a server-side cursor
+    on PostgreSQL), and each batch is encoded and sent before the next is
+    fetched, so memory stays flat however many bookings match. The export
+    holds its own connection until the download ends; get_db's session is
+    closed before the body is sent.
+    
+    Args:
+        bind: Engine to read from
+        query: booking_list_query() with filters and order applied
+        format: "ndjson" or "csv"
+    
+    Returns:
+        Iterator of encoded chunks for a StreamingResponse
+    """
+    with bind.connect() as connection:
+        result = connection.execution_options(yield_per=settings.EXPORT_BATCH_SIZE).execute(query)
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(result.keys())
+            yield buffer.getvalue().encode()
+        for rows in result.partitions():
+            if format == "csv":
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows([value.isoformat() if isinstance(value, (date, time)) else value for value in booking_row_dict(row).values()] for row in rows)
+                yield buffer.getvalue().encode()
+            else:
+                yield b"".join(encode_json(booking_row_dict(row)) + b"\n" for row in rows)
+
+
+def booking_export_response(db: AnySession, query, format: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_bookings(export_bind(db), query, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
+
+
+@router.get("/export")
+async def export_bookings(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    date_from: Optional[date] = Query(None, alias="from", description="First booking date to include"),
+    date_to: Optional[date] = Query(None, alias="to", description="Last booking date to include"),
+    status_filter: Optional[str] = Query(None, alias="status", pattern="^(pending|accepted|confirmed|declined|completed|cancelled)$"),
+    current_user: User = Depends(get_current_user),
+    db: AnySession = Depends(get_db)
+):
+    owner_filter = await run_db(db, booking_owner_filter, current_user)
+    query = filter_bookings(booking_list_query().where(owner_filter), date_from, date_to, status_filter)
+    return booking_export_response(db, query, format, "bookings")  # Full history, streamed; list_bookings is for screens.
+
+
+@router.patch("")
+async def update_booking_statuses(batch: BookingBatchUpdate, current_user: User = Depends(get_current_user), db: AnySession = Depends(get_db)):
+    return await run_db(db, _update_booking_statuses, batch, current_user)
+
+
+def _update_booking_statuses(db: Session, batch: BookingBatchUpdate, current_user: User):
+    # One query authorizes the whole batch: every booking with the user id of its chef.
+    ids = [change.id for change in batch.updates]
+    found = {row.id: row for row in db.execute(
+        select(Booking.id, Booking.chef_id, Booking.status, Booking.start_at, Booking.end_at, Chef.user_id)
+        .join(Chef, Chef.id == Booking.chef_id).where(Booking.id.in_(ids))
+    )}
+    
+    errors, valid, seen = {}, [], set()  # errors and valid are keyed by position in the batch.
+    for position, change in enumerate(batch.updates):
+        row = found.get(change.id)
+        if change.id in seen:
+            errors[position] = (status.HTTP_400_BAD_REQUEST, "Booking is listed more than once")
+        elif row is None:
+            errors[position] = (status.HTTP_404_NOT_FOUND, "Booking not found")
+        elif row.user_id != current_user.id:
+            errors[position] = (status.HTTP_403_FORBIDDEN, "Only the chef can update booking status")
+        else:
+            valid.append((position, change, row))
+        seen.add(change.id)
+    
+    accepting = [(position, row) for position, change, row in valid if BookingStatus(change.status) in COMMITTED_STATUSES and row.status not in COMMITTED_STATUSES]
+    if accepting:
+        chef_id = accepting[0][1].chef_id  # Every valid booking belongs to the current user's one chef profile.
+        lock_chef_schedule(db, chef_id)
+        releasing = {change.id for _, change, _ in valid if BookingStatus(change.status) not in COMMITTED_STATUSES}
+        span = overlapping_bookings(chef_id, min(row.start_at for _, row in accepting), max(row.end_at for _, row in accepting))
+        held = [booking for booking in db.execute(span.with_only_columns(Booking.id, Booking.start_at, Booking.end_at).where(Booking.status.in_(COMMITTED_STATUSES))) if booking.id not in releasing]
+        for position, row in accepting:  # In request order, so an accept also can't overlap one accepted earlier in this batch.
+            conflict = next((booking for booking in held if booking.id != row.id and booking.start_at < row.end_at and booking.end_at > row.start_at), None)
+            if conflict:
+                errors[position] = (status.HTTP_409_CONFLICT, f"Chef is already booked from {conflict.start_at.isoformat()} to {conflict.end_at.isoformat()}")
+            else:
+                held.append(row)
     
-    bookings = query.all()
-    return [booking.to_dict() for booking in bookings]
+    changes_by_status = defaultdict(list)
+    for position, change, _ in valid:
+        if position not in errors:
+            changes_by_status[change.status].append(change)
+    for new_status, changes in changes_by_status.items():
+        values = {"status": BookingStatus(new_status)}
+        notes = {change.id: change.notes for change in changes if change.notes}
+        if notes:
+            values["notes"] = case(notes, value=Booking.id, else_=Booking.notes)
+        db.execute(update(Booking).where(Booking.id.in_([change.id for change in changes])).values(**values).execution_options(synchronize_session=False))  # One UPDATE per target status.
+    db.commit()
+    
+    updated_ids = [change.id for changes in changes_by_status.values() for change in changes]
+    bookings = {row.id: booking_row_dict(row) for row in db.execute(booking_list_query().where(Booking.id.in_(updated_ids)))} if updated_ids else {}
+    if bookings:
+        chef = db.query(Chef).options(joinedload(Chef.user)).filter(Chef.user_id == current_user.id).one()
+        invalidate_chef_availability(chef.to_dict())  # Accepting or declining changes when the chef is free.
+    
+    results = []
+    for position, change in enumerate(batch.updates):
+        if position in errors:
+            status_code, detail = errors[position]
+            results.append({"id": change.id, "status_code": status_code, "detail": detail})
+        else:
+            results.append({"id": change.id, "status_code": status.HTTP_200_OK, "booking": bookings[change.id]})
+    return FastJSONResponse({"results": results})  # Per-item outcome in request order; bookings are shaped like BookingResponse.
 
 
 @router.patch("/{booking_id}", response_model=BookingResponse)
-def update_booking_status(booking_id: int, booking_update: BookingUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def update_booking_status(booking_id: int, booking_update: BookingUpdate, current_user: User = Depends(get_current_user), db: AnySession = Depends(get_db)):
+    return await run_db(db, _update_booking_status, booking_id, booking_update, current_user)
+
+
+def _update_booking_status(db: Session, booking_id: int, booking_update: BookingUpdate, current_user: User):
     booking = db.query(Booking).filter(Booking.id == booking_id).first()
     
     if not booking:
@@ -78,11 +298,16 @@ def update_booking_status(booking_id: int, booking_update: BookingUpdate, curren
     if not chef or booking.chef_id != chef.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only the chef can update booking status")
     
-    booking.status = BookingStatus(booking_update.status)
+    new_status = BookingStatus(booking_update.status)
+    if new_status in COMMITTED_STATUSES and booking.status not in COMMITTED_STATUSES:
+        check_chef_free(db, chef.id, booking.start_at, booking.end_at, exclude_booking_id=booking.id)  # Accepting must not overlap another accepted booking.
+    
+    booking.status = new_status
     if booking_update.notes:
         booking.notes = booking_update.notes
     
     db.commit()
-    db.refresh(booking)
     
+    booking = load_booking(db, booking_id)
+    invalidate_chef_availability(booking.chef.to_dict())  # Declining or cancelling frees the chef's time again.
     return booking.to_dict()
@@ -1,48 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import Optional, List
-from app import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from sqlalchemy.orm import Session, joinedload
+from typing import List
+from app import AnySession, get_db, run_db
 from app.models.chef import Chef
 from app.models.user import User
-from app.schemas.chef import ChefUpdate, ChefResponse
+from app.schemas.chef import ChefUpdate, ChefResponse, ChefFacetsResponse, ChefAvailabilityUpdate
 from app.utils.auth import get_current_user
+from app.utils.etag import make_etag, etag_matches, not_modified
+from app.utils.fast_json import FastJSONResponse
+from config.settings import settings
+from app.controllers.cuisines import set_chef_cuisines
+from app.controllers.chef_search import ChefSearchParams, search_chefs, chef_facets, invalidate_chef_searches, invalidate_chef_availability
+from app.controllers.availability import set_chef_availability
 
 router = APIRouter()
 
+CHEF_LOAD_OPTIONS = (joinedload(Chef.user),)  # to_dict reads chef.user.name; load it in the same query.
+
+# Public profiles: shared caches may keep them, but must revalidate (a cheap 304) once max-age passes.
+CHEF_CACHE_CONTROL = f"public, max-age={settings.CHEF_PROFILE_MAX_AGE_SECONDS}, must-revalidate"
+
+
+def chef_etag(chef):
+    return make_etag("chef", chef.id, chef.version, chef.user.version)  # The profile shows the user's name too.
+
+
 
 @router.get("", response_model=List[ChefResponse])
-def list_chefs(
-    cuisine: Optional[str] = Query(None),
-    location: Optional[str] = Query(None),
-    max_price: Optional[float] = Query(None),
-    search: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
-):
-    query = db.query(Chef).filter(Chef.is_available == 1)
-    
-    if cuisine:
-        query = query.filter(Chef.cuisines.contains(cuisine))
-    if location:
-        query = query.filter(Chef.location.ilike(f"%{location}%"))
-    if max_price:
-        query = query.filter(Chef.hourly_rate <= max_price)
-    if search:
-        query = query.join(User).filter(User.name.ilike(f"%{search}%"))
-    
-    chefs = query.all()
-    return [chef.to_dict() for chef in chefs]
+async def list_chefs(params: ChefSearchParams = Depends(), db: AnySession = Depends(get_db)):
+    return await run_db(db, _list_chefs, params)
+
+
+def _list_chefs(db: Session, params: ChefSearchParams):
+    chefs, next_cursor = search_chefs(db, params)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return FastJSONResponse(chefs, headers=headers)  # Rows are shaped like ChefResponse already; skip re-validating them.
+
+
+@router.get("/facets", response_model=ChefFacetsResponse)
+async def list_chef_facets(params: ChefSearchParams = Depends(), db: AnySession = Depends(get_db)):
+    return await run_db(db, _list_chef_facets, params)
+
+
+def _list_chef_facets(db: Session, params: ChefSearchParams):
+    return chef_facets(db, params)  # Declared before /{chef_id} so "facets" is not read as an id.
 
 
 @router.get("/{chef_id}", response_model=ChefResponse)
-def get_chef(chef_id: int, db: Session = Depends(get_db)):
-    chef = db.query(Chef).filter(Chef.id == chef_id).first()
+async def get_chef(chef_id: int, request: Request, response: Response, db: AnySession = Depends(get_db)):
+    return await run_db(db, _get_chef, chef_id, request, response)
+
+
+def _get_chef(db: Session, chef_id: int, request: Request, response: Response):
+    if request.headers.get("if-none-match"):
+        versions = db.query(Chef.version, User.version).join(User, User.id == Chef.user_id).filter(Chef.id == chef_id).first()  # Two integers, not the profile.
+        if versions and etag_matches(request, make_etag("chef", chef_id, *versions)):
+            return not_modified(make_etag("chef", chef_id, *versions), CHEF_CACHE_CONTROL)
+    
+    chef = db.query(Chef).options(*CHEF_LOAD_OPTIONS).filter(Chef.id == chef_id).first()
     if not chef:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chef not found")
+    
+    response.headers["ETag"] = chef_etag(chef)
+    response.headers["Cache-Control"] = CHEF_CACHE_CONTROL
     return chef.to_dict()
 
 
 @router.put("/{chef_id}", response_model=ChefResponse)
-def update_chef(chef_id: int, chef_data: ChefUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def update_chef(chef_id: int, chef_data: ChefUpdate, response: Response, current_user: User = Depends(get_current_user), db: AnySession = Depends(get_db)):
+    return await run_db(db, _update_chef, chef_id, chef_data, response, current_user)
+
+
+def _update_chef(db: Session, chef_id: int, chef_data: ChefUpdate, response: Response, current_user: User):
     chef = db.query(Chef).filter(Chef.id == chef_id).first()
     
     if not chef:
@@ -55,10 +84,66 @@ def update_chef(chef_id: int, chef_data: ChefUpdate, current_user: User = Depend
     for key, value in update_data.items():
         if key == "is_available" and value is not None:
             setattr(chef, key, 1 if value else 0)
+        elif key == "cuisines":
+            set_chef_cuisines(db, chef, value)
         else:
             setattr(chef, key, value)
     
     db.commit()
-    db.refresh(chef)
+    chef = db.query(Chef).options(*CHEF_LOAD_OPTIONS).filter(Chef.id == chef_id).one()  # Reloads the chef and its user in one query.
+    chef_dict = chef.to_dict()
+    invalidate_chef_searches(chef_dict)  # Drops only cached search pages this chef was on or now belongs on.
+    response.headers["ETag"] = chef_etag(chef)  # The frontend can keep this copy and revalidate it later.
     
-    return chef.to_dict()
+    return chef_dict
+
+
+def availability_dict(chef):
+    return {
+        "weekly": [window.to_dict() for window in chef.availability],
+        "exceptions": [exception.to_dict() for exception in chef.availability_exceptions],
+    }
+
+
+@router.get("/{chef_id}/availability", response_model=ChefAvailabilityUpdate)
+async def get_chef_availability(chef_id: int, db: AnySession = Depends(get_db)):
+    return await run_db(db, _get_chef_availability, chef_id)
+
+
+def _get_chef_availability(db: Session, chef_id: int):
+    chef = db.query(Chef).filter(Chef.id == chef_id).first()
+    if not chef:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chef not found")
+    return availability_dict(chef)
+
+
+@router.put("/{chef_id}/availability", response_model=ChefAvailabilityUpdate)
+async def update_chef_availability(chef_id: int, availability: ChefAvailabilityUpdate, current_user: User = Depends(get_current_user), db: AnySession = Depends(get_db)):
+    return await run_db(db, _update_chef_availability, chef_id, availability, current_user)
+
+
+def _update_chef_availability(db: Session, chef_id: int, availability: ChefAvailabilityUpdate, current_user: User):
+    chef = db.query(Chef).options(*CHEF_LOAD_OPTIONS).filter(Chef.id == chef_id).first()
+    
+    if not chef:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chef not found")
+    
+    if chef.user_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this profile")
+    
+    for window in availability.weekly:
+        if window.end_time <= window.start_time:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Availability windows must end after they start")
+    for exception in availability.exceptions:
+        if (exception.start_time is None) != (exception.end_time is None):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Exceptions need both start_time and end_time, or neither")
+        if exception.start_time is None and exception.is_available:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Extra hours need start_time and end_time")
+        if exception.start_time is not None and exception.end_time <= exception.start_time:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Availability windows must end after they start")
+    
+    set_chef_availability(db, chef, [window.dict() for window in availability.weekly], [exception.dict() for exception in availability.exceptions])
+    db.commit()
+    invalidate_chef_availability(chef.to_dict())  # Cached available_at searches may now include or exclude this chef.
+    
+    return availability_dict(chef)
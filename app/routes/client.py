@@ -1,24 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from sqlalchemy.orm import Session, joinedload
+from app import AnySession, get_db, run_db
 from app.models.client import Client
 from app.models.user import User
 from app.schemas.client import ClientUpdate, ClientResponse
 from app.utils.auth import get_current_user
+from app.utils.etag import make_etag, etag_matches, not_modified
+from app.controllers.cuisines import set_client_cuisines
 
 router = APIRouter()
 
+CLIENT_LOAD_OPTIONS = (joinedload(Client.user),)  # to_dict reads the user's name and email.
+
+CLIENT_CACHE_CONTROL = "private, no-cache"  # Holds an email address: browser cache only, revalidated on every use.
+
+
+def client_etag(client):
+    return make_etag("client", client.id, client.version, client.user.version)
+
 
 @router.get("/{client_id}", response_model=ClientResponse)
-def get_client(client_id: int, db: Session = Depends(get_db)):
-    client = db.query(Client).filter(Client.id == client_id).first()
+async def get_client(client_id: int, request: Request, response: Response, db: AnySession = Depends(get_db)):
+    return await run_db(db, _get_client, client_id, request, response)
+
+
+def _get_client(db: Session, client_id: int, request: Request, response: Response):
+    if request.headers.get("if-none-match"):
+        versions = db.query(Client.version, User.version).join(User, User.id == Client.user_id).filter(Client.id == client_id).first()
+        if versions and etag_matches(request, make_etag("client", client_id, *versions)):
+            return not_modified(make_etag("client", client_id, *versions), CLIENT_CACHE_CONTROL)
+    
+    client = db.query(Client).options(*CLIENT_LOAD_OPTIONS).filter(Client.id == client_id).first()
     if not client:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Client not found")
+    
+    response.headers["ETag"] = client_etag(client)
+    response.headers["Cache-Control"] = CLIENT_CACHE_CONTROL
     return client.to_dict()
 
 
 @router.put("/{client_id}", response_model=ClientResponse)
-def update_client(client_id: int, client_data: ClientUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def update_client(client_id: int, client_data: ClientUpdate, response: Response, current_user: User = Depends(get_current_user), db: AnySession = Depends(get_db)):
+    return await run_db(db, _update_client, client_id, client_data, response, current_user)
+
+
+def _update_client(db: Session, client_id: int, client_data: ClientUpdate, response: Response, current_user: User):
     client = db.query(Client).filter(Client.id == client_id).first()
     
     if not client:
@@ -29,9 +55,13 @@ def update_client(client_id: int, client_data: ClientUpdate, current_user: User
     
     update_data = client_data.dict(exclude_unset=True)
     for key, value in update_data.items():
-        setattr(client, key, value)
+        if key == "preferred_cuisines":
+            set_client_cuisines(db, client, value)
+        else:
+            setattr(client, key, value)
     
     db.commit()
-    db.refresh(client)
+    client = db.query(Client).options(*CLIENT_LOAD_OPTIONS).filter(Client.id == client_id).one()
+    response.headers["ETag"] = client_etag(client)
     
     return client.to_dict()
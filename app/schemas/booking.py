@@ -1,13 +1,14 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import date, time, datetime
+from config.settings import settings
 
 
 class BookingCreate(BaseModel):
     chef_id: int
     booking_date: date  # Format: "2025-12-15"
     booking_time: time  # Format: "18:00"
-    duration_hours: float = Field(gt=0)  # Must be greater than 0.
+    duration_hours: float = Field(gt=0, le=settings.MAX_BOOKING_DURATION_HOURS)  # Must be greater than 0; the cap keeps overlap checks a bounded index range.
     location: str = Field(min_length=1)  # Cannot be empty.
     special_requests: Optional[str] = None
 
@@ -17,6 +18,16 @@ class BookingUpdate(BaseModel):
     notes: Optional[str] = None
 
 
+class BookingStatusChange(BaseModel):
+    id: int
+    status: str = Field(pattern="^(pending|accepted|confirmed|declined|completed|cancelled)$")
+    notes: Optional[str] = None
+
+
+class BookingBatchUpdate(BaseModel):
+    updates: List[BookingStatusChange] = Field(min_length=1, max_length=settings.MAX_BOOKING_BATCH_SIZE)  # Applied in order; an accept can conflict with one earlier in the list.
+
+
 class BookingResponse(BaseModel):
     id: int
     client_id: int
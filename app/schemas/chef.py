@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
+from datetime import date, time
 
 
 class ChefCreate(BaseModel):
@@ -19,6 +20,8 @@ class ChefUpdate(BaseModel):
     specialties: Optional[str] = None
     hourly_rate: Optional[float] = Field(ge=0, default=None)
     location: Optional[str] = None
+    latitude: Optional[float] = Field(ge=-90, le=90, default=None)
+    longitude: Optional[float] = Field(ge=-180, le=180, default=None)
     phone: Optional[str] = None
     photo_url: Optional[str] = None
     years_of_experience: Optional[int] = Field(ge=0, default=None)
@@ -34,6 +37,8 @@ class ChefResponse(BaseModel):
     specialties: Optional[str]
     hourly_rate: float
     location: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
     phone: Optional[str]
     photo_url: Optional[str]
     years_of_experience: int
@@ -43,3 +48,45 @@ class ChefResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class CuisineFacet(BaseModel):
+    name: str
+    slug: str
+    count: int
+
+
+class LocationFacet(BaseModel):
+    location: str
+    count: int
+
+
+class PriceFacet(BaseModel):
+    min_price: float  # Inclusive.
+    max_price: float  # Exclusive.
+    count: int
+
+
+class ChefFacetsResponse(BaseModel):
+    total: int  # Chefs matching every filter.
+    cuisines: List[CuisineFacet]
+    locations: List[LocationFacet]
+    price: List[PriceFacet]
+
+
+class AvailabilityWindow(BaseModel):
+    weekday: int = Field(ge=0, le=6)  # 0 is Monday, like date.weekday().
+    start_time: time  # Format: "16:00"
+    end_time: time  # Same day, after start_time.
+
+
+class AvailabilityException(BaseModel):
+    date: date  # Format: "2025-12-25"
+    is_available: bool = False  # False for time off, True for extra hours.
+    start_time: Optional[time] = None  # Leave both times out to block the whole day.
+    end_time: Optional[time] = None
+
+
+class ChefAvailabilityUpdate(BaseModel):
+    weekly: List[AvailabilityWindow] = []  # An empty week means available any time.
+    exceptions: List[AvailabilityException] = []
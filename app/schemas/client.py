@@ -1,10 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 
 
 class ClientUpdate(BaseModel):
     phone: Optional[str] = None
     address: Optional[str] = None
+    latitude: Optional[float] = Field(ge=-90, le=90, default=None)
+    longitude: Optional[float] = Field(ge=-180, le=180, default=None)
     preferred_cuisines: Optional[str] = None  # Comma-separated string.
 
 
@@ -15,6 +17,8 @@ class ClientResponse(BaseModel):
     email: str
     phone: Optional[str]
     address: Optional[str]
+    latitude: Optional[float]
+    longitude: Optional[float]
     preferred_cuisines: List[str]  # Frontend expects array.
     total_bookings: int
     
@@ -79,22 +79,34 @@ def verify_access_token(token: str) -> Optional[Dict[str, Any]]:
         return payload
     except JWTError:
         return None
+import time
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
 from config.settings import settings
-from app import get_db
+from app import AnySession, get_db, release_connection, run_db
 from app.models.user import User
+from app.utils.cache import LRUCache
+from app.utils.metrics import register_metrics
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
+# Verified token -> the user's columns, so repeat requests skip both the JWT signature check and the users query.
+# Per process: another worker's user update reaches this cache only when the entry expires.
+principal_cache = LRUCache(maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+register_metrics("principal_cache", principal_cache.stats)
+
+PRINCIPAL_COLUMNS = [column.key for column in User.__table__.columns if column.key != "password_hash"]  # No hashes in memory longer than a request.
+
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)  # Converts plain password to hashed version.
+    from app.utils.password_hashing import password_hasher
+    return pwd_context.hash(password, rounds=password_hasher.rounds)  # Converts plain password to hashed version, at the configured cost. Request handlers use password_hasher instead.
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -109,8 +121,49 @@ def create_access_token(data: dict) -> str:
     return encoded_jwt
 
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)) -> User:
+def load_user(db: Session, user_id) -> User:
+    user = db.query(User).filter(User.id == user_id).first()
+    release_connection(db, user)  # Routes only read current_user.id; don't hold a connection until their own run_db.
+    return user
+
+
+def cached_principal(values: dict) -> User:
+    user = User(**values)
+    make_transient_to_detached(user)  # A detached copy per request: the same as a user loaded and released, never INSERTed if added.
+    return user
+
+
+def invalidate_principal(user_id: int) -> None:
+    principal_cache.discard_where(lambda token, values: values["id"] == user_id)
+
+
+PENDING_INVALIDATIONS = "invalidated_principals"  # session.info key: ids of users flushed in the open transaction.
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _collect_changed_principal(mapper, connection, user):
+    object_session(user).info.setdefault(PENDING_INVALIDATIONS, set()).add(user.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_cached_principals(session):
+    # At commit, not flush: a request reading the old row before then could otherwise cache it again, and a rollback changes nothing.
+    for user_id in session.info.pop(PENDING_INVALIDATIONS, ()):
+        invalidate_principal(user_id)  # Renames, role changes and deletions apply to the very next request.
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_principals(session):
+    session.info.pop(PENDING_INVALIDATIONS, None)
+
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: AnySession = Depends(get_db)) -> User:
     token = credentials.credentials
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return cached_principal(cached)
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -125,8 +178,12 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await run_db(db, load_user, user_id)  # Detached with its columns loaded; routes read current_user.id.
     if user is None:
         raise credentials_exception
     
+    lifetime = min(settings.PRINCIPAL_CACHE_TTL_SECONDS, payload.get("exp", float("inf")) - time.time())  # Never outlives the token.
+    if lifetime > 0:
+        principal_cache.set(token, {key: getattr(user, key) for key in PRINCIPAL_COLUMNS}, ttl_seconds=lifetime)
+    
     return user  # Returns the authenticated user object.
@@ -0,0 +1,39 @@
+"""
+ETags and conditional GETs built from per-row version counters
+
+Profiles carry an integer version that SQLAlchemy bumps on every UPDATE
+(version_id_col), so an ETag is just the versions of the rows a response
+is built from. Checking If-None-Match then needs only those integers.
+"""
+
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(kind: str, row_id: int, *versions: int) -> str:
+    """
+    Build a strong ETag like "chef-12-v3.1".
+
+    Args:
+        kind: Resource name, so a chef and a client with the same id never share a tag
+        row_id: Primary key of the resource
+        versions: Version of every row the representation is built from
+
+    Returns:
+        Quoted ETag header value
+    """
+    return f'"{kind}-{row_id}-v{".".join(str(version) for version in versions)}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match lists etag (weak comparison, as RFC 9110 asks for GETs)."""
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or etag in [candidate.removeprefix("W/") for candidate in candidates]
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": cache_control})
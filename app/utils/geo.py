@@ -0,0 +1,162 @@
+"""
+Geohash encoding and radius lookups for location-based search
+
+Profiles store the geohash of their coordinates in an indexed string column.
+Every point inside a geohash cell shares the cell's prefix, so "chefs in this
+cell" is a plain index range scan (geohash >= 'kzf0' AND geohash < 'kzf1')
+on both SQLite and PostgreSQL, without spatial extensions. The bounds use
+only geohash characters, which sort the same under byte order and under
+linguistic collations like en_US.UTF-8.
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9  # About 5 m x 5 m cells for stored profiles.
+KM_PER_DEGREE = 111.32  # Length of one degree of latitude (and of longitude at the equator).
+
+
+def parse_coordinates(value: str) -> Tuple[float, float]:
+    """
+    Parse a "lat,lng" string such as "-1.2864,36.8172".
+
+    Raises:
+        ValueError: If the value is not two numbers or is out of range
+    """
+    latitude, longitude = (float(part) for part in value.split(","))
+    if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+        raise ValueError(f"Coordinates out of range: {value}")
+    return latitude, longitude
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """
+    Encode coordinates into a geohash string.
+
+    Args:
+        latitude: Latitude in degrees, -90 to 90
+        longitude: Longitude in degrees, -180 to 180
+        precision: Number of characters to produce
+
+    Returns:
+        Geohash like "kzf0tv" (Nairobi CBD at precision 6)
+    """
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits, value = 0, 0
+
+    return "".join(chars)
+
+
+def cell_size_degrees(precision: int) -> Tuple[float, float]:
+    """Height and width in degrees of a geohash cell at the given precision."""
+    lng_bits = (5 * precision + 1) // 2  # Longitude takes the first (and odd-numbered) bit.
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def covering_cells(latitude: float, longitude: float, radius_km: float) -> Optional[List[str]]:
+    """
+    Find geohash cells that together cover a circle.
+
+    Picks the finest precision whose cells are at least radius_km across, then
+    returns the cell holding the centre plus its eight neighbours.
+
+    Args:
+        latitude: Centre latitude in degrees
+        longitude: Centre longitude in degrees
+        radius_km: Circle radius in kilometres
+
+    Returns:
+        Up to nine geohash prefixes, or None if the circle is too large to bound by cells
+    """
+    # Longitude degrees shrink towards the poles; size cells for the widest latitude the circle reaches.
+    widest_latitude = min(abs(latitude) + radius_km / KM_PER_DEGREE, 89.9)
+    km_per_lng_degree = KM_PER_DEGREE * math.cos(math.radians(widest_latitude))
+
+    precision = 0
+    for candidate in range(1, GEOHASH_PRECISION + 1):
+        lat_degrees, lng_degrees = cell_size_degrees(candidate)
+        if lat_degrees * KM_PER_DEGREE < radius_km or lng_degrees * km_per_lng_degree < radius_km:
+            break
+        precision = candidate
+    if precision == 0:
+        return None
+
+    lat_degrees, lng_degrees = cell_size_degrees(precision)
+    cells = []
+    for lat_step in (-1, 0, 1):
+        for lng_step in (-1, 0, 1):
+            cell_latitude = max(-90.0, min(90.0, latitude + lat_step * lat_degrees))
+            cell_longitude = (longitude + lng_step * lng_degrees + 180.0) % 360.0 - 180.0
+            cell = encode_geohash(cell_latitude, cell_longitude, precision)
+            if cell not in cells:
+                cells.append(cell)
+    return cells
+
+
+def next_cell(cell: str) -> Optional[str]:
+    """
+    First geohash after every one starting with cell, like "kzf1" for "kzf0".
+
+    Trailing "z"s carry into the previous character ("kzz" -> "m"), and a cell
+    of only "z"s has no successor.
+    """
+    cell = cell.rstrip(BASE32[-1])
+    if not cell:
+        return None
+    return cell[:-1] + BASE32[BASE32.index(cell[-1]) + 1]
+
+
+def geohash_cells_filter(column, cells: List[str], *scope):
+    """
+    Filter rows whose geohash column falls in any of the cells.
+
+    Equality conditions that lead the geohash index (like is_available = 1) go
+    in scope so they are repeated in every branch; the planner can then answer
+    each cell with its own index range scan instead of one wider scan.
+    """
+    branches = []
+    for cell in cells:
+        end = next_cell(cell)
+        branches.append(and_(*scope, column >= cell, *([column < end] if end else [])))
+    return or_(*branches)
+
+
+def squared_distance_km(lat_column, lng_column, latitude: float, longitude: float):
+    """
+    SQL expression for the squared distance in km² between rows and a point.
+
+    Uses an equirectangular projection around the point, which needs only
+    arithmetic (no trigonometry in SQL) and is accurate to well under 1% at
+    city-scale radii. Squared distances order the same as distances.
+    """
+    lng_scale = KM_PER_DEGREE * math.cos(math.radians(latitude))
+    dy = (lat_column - latitude) * KM_PER_DEGREE
+    dx = (lng_column - longitude) * lng_scale
+    return dy * dy + dx * dx
+
+
+def set_geohash(mapper, connection, target) -> None:
+    """Mapper hook keeping a profile's geohash in step with its coordinates."""
+    if target.latitude is None or target.longitude is None:
+        target.geohash = None
+    else:
+        target.geohash = encode_geohash(target.latitude, target.longitude)
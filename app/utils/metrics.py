@@ -0,0 +1,22 @@
+"""
+Registry of runtime counters exposed at GET /api/metrics
+"""
+
+from typing import Any, Callable, Dict
+
+_providers: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+def register_metrics(name: str, provider: Callable[[], Dict[str, Any]]) -> None:
+    """
+    Publish a group of metrics under a name.
+
+    Args:
+        name: Section name in the /api/metrics response, like "chef_search_cache"
+        provider: Callable returning the current values, called on every scrape
+    """
+    _providers[name] = provider
+
+
+def collect_metrics() -> Dict[str, Dict[str, Any]]:
+    return {name: provider() for name, provider in _providers.items()}
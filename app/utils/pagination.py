@@ -0,0 +1,91 @@
+"""
+Keyset (cursor) pagination helpers for list endpoints
+"""
+
+import base64
+import json
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """
+    Encode the sort keys of the last row on a page into an opaque cursor.
+
+    Args:
+        sort: Name of the sort order the cursor belongs to
+        values: Sort key values of the last row returned
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps([sort, *values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string sent back by the client
+        sort: Sort order requested alongside the cursor
+        size: Number of sort key values expected
+
+    Returns:
+        The sort key values of the last row of the previous page
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or was issued for another sort order
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        decoded = json.loads(raw)
+    except (ValueError, TypeError):
+        decoded = None
+
+    if not isinstance(decoded, list) or len(decoded) != size + 1 or decoded[0] != sort or not _valid_keys(decoded[1:]):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return decoded[1:]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _valid_keys(values: List[Any]) -> bool:
+    # Sort keys are numbers, ISO strings or NULL, and the tie-breaker is an id; anything else would only fail at bind time.
+    *keys, last_id = values
+    return isinstance(last_id, int) and _is_number(last_id) and all(value is None or _is_number(value) or isinstance(value, str) for value in keys)
+
+
+def apply_keyset(query, columns: Sequence[Any], descending: bool, after: Optional[Sequence[Any]] = None):
+    """
+    Order a query by the given columns and start it right after a previous page.
+
+    All columns share one direction so the seek is a single row-value comparison
+    that the database can answer with an index range scan.
+
+    Args:
+        query: SQLAlchemy query or select statement
+        columns: Sort columns, ending with a unique tie-breaker such as the primary key
+        descending: Whether to sort from highest to lowest
+        after: Sort key values of the last row already returned, if any
+
+    Returns:
+        The ordered (and seeked) query
+    """
+    if after is not None:
+        if len(columns) == 1:
+            seek = columns[0] < after[0] if descending else columns[0] > after[0]
+        else:
+            keys, values = tuple_(*columns), tuple_(*after)
+            seek = keys < values if descending else keys > values
+            # Bounding the leading column as well lets planners without row-value support seek the index.
+            lead = columns[0] <= after[0] if descending else columns[0] >= after[0]
+            seek = lead & seek
+        query = query.where(seek)
+
+    return query.order_by(*[column.desc() if descending else column.asc() for column in columns])
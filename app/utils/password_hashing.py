@@ -0,0 +1,154 @@
+"""
+bcrypt hashing in a dedicated process pool with backpressure
+
+bcrypt is slow on purpose (about 250 ms per call at the calibrated cost).
+Running it in the web worker would stall every other request on that worker,
+so register and login send it to a pool of processes sized to the CPU cores.
+At most workers + PASSWORD_HASH_QUEUE_SIZE hashes wait or run at once; beyond
+that, requests get 503 with Retry-After instead of piling up; bulk imports
+instead wait for a free slot. The bcrypt cost
+is either BCRYPT_ROUNDS or calibrated at startup for PASSWORD_HASH_TARGET_MS,
+and logins rehash passwords stored at a lower cost. Never at a higher one:
+workers calibrating to different costs would otherwise rewrite the same
+user's hash back and forth on every login.
+"""
+
+import asyncio
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.hash import bcrypt
+
+from config.settings import settings
+
+MAX_BCRYPT_ROUNDS = 31
+CALIBRATION_PROBE_ROUNDS = 8
+SLOT_POLL_SECONDS = 0.05  # How often a waiting bulk job checks for a free slot.
+
+
+def _hash(password: str, rounds: int) -> str:
+    return bcrypt.using(rounds=rounds).hash(password)
+
+
+def _hash_many(passwords: List[str], rounds: int) -> List[str]:
+    hasher = bcrypt.using(rounds=rounds)
+    return [hasher.hash(password) for password in passwords]
+
+
+def _verify(password: str, password_hash: str, rounds: int) -> Tuple[bool, bool]:
+    try:
+        valid = bcrypt.verify(password, password_hash)
+    except ValueError:
+        return False, False  # Not a bcrypt hash at all.
+    return valid, valid and int(password_hash.split("$")[2]) < rounds  # "$2b$12$...": the cost is the third field.
+
+
+def _time_hash(rounds: int) -> float:
+    started = time.perf_counter()
+    bcrypt.using(rounds=rounds).hash("calibration")
+    return time.perf_counter() - started
+
+
+def rounds_for_target(probe_seconds: float, probe_rounds: int, target_ms: float, min_rounds: int) -> int:
+    """
+    Pick the bcrypt cost whose hash takes closest to, without exceeding, target_ms.
+
+    Args:
+        probe_seconds: Measured time of one hash at probe_rounds
+        probe_rounds: Cost the measurement was taken at
+        target_ms: Wanted time per hash
+        min_rounds: Floor, whatever the hardware; a fast machine must not weaken hashes
+
+    Returns:
+        bcrypt cost; each extra round doubles the work
+    """
+    extra = math.floor(math.log2(target_ms / 1000 / max(probe_seconds, 1e-6)))
+    return max(min_rounds, min(MAX_BCRYPT_ROUNDS, probe_rounds + extra))
+
+
+class PasswordHasher:
+    """Bounded process pool for bcrypt, shared by every app instance in the process."""
+
+    def __init__(self, workers: int, queue_size: int, rounds: int = 0):
+        self.workers = workers or os.cpu_count() or 1
+        self.limit = self.workers + queue_size
+        self.rounds = rounds or bcrypt.default_rounds
+        self.calibrated = bool(rounds)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.in_flight = self.completed = self.rejected = 0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: the web process has threads (threadpool, DB pool) that must not be copied mid-operation.
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    async def _run(self, fn: Callable[..., Any], *args: Any, wait: bool = False) -> Any:
+        while True:
+            with self._lock:
+                if self.in_flight < self.limit:
+                    self.in_flight += 1
+                    break
+                if not wait:
+                    self.rejected += 1
+                    raise HTTPException(
+                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        detail="Too many sign-ins at once. Please try again shortly.",
+                        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+                    )
+            await asyncio.sleep(SLOT_POLL_SECONDS)  # Polled, not an asyncio primitive: the hasher is shared by every event loop in the process.
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool(), fn, *args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password, self.rounds)
+
+    async def hash_many(self, passwords: List[str], wait: bool = False) -> List[str]:
+        """
+        Hash a batch as one job per worker, so a bulk import takes a few queue slots instead of all of them.
+
+        Args:
+            passwords: Plain-text passwords
+            wait: Wait for free slots instead of raising 503, for imports that must not stop halfway
+        """
+        size = math.ceil(len(passwords) / self.workers) or 1
+        parts = await asyncio.gather(*(self._run(_hash_many, passwords[start:start + size], self.rounds, wait=wait) for start in range(0, len(passwords), size)))
+        return [password_hash for part in parts for password_hash in part]
+
+    async def verify(self, password: str, password_hash: str) -> Tuple[bool, bool]:
+        """Return (valid, needs_rehash); needs_rehash is true when the hash was made at a lower cost."""
+        return await self._run(_verify, password, password_hash, self.rounds)
+
+    async def calibrate(self) -> int:
+        """Time one cheap hash and set rounds for PASSWORD_HASH_TARGET_MS; runs once per process."""
+        if not self.calibrated:
+            probe_seconds = await self._run(_time_hash, CALIBRATION_PROBE_ROUNDS)
+            self.rounds = rounds_for_target(probe_seconds, CALIBRATION_PROBE_ROUNDS, settings.PASSWORD_HASH_TARGET_MS, settings.BCRYPT_MIN_ROUNDS)
+            self.calibrated = True
+        return self.rounds
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rounds": self.rounds,
+            }
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_SIZE, settings.BCRYPT_ROUNDS)
@@ -0,0 +1,60 @@
+"""
+Precomputed "recommended" ranking score for chefs
+
+The score is stored on the chef row and indexed, so the recommended sort of
+GET /api/chefs is an index range read instead of a computation per request.
+It is recomputed from the chef's own columns whenever the row is flushed.
+"""
+
+import math
+
+# Weights of each signal; they sum to 1 so scores stay between 0 and 1.
+RATING_WEIGHT = 0.45
+POPULARITY_WEIGHT = 0.25
+EXPERIENCE_WEIGHT = 0.15
+PRICE_WEIGHT = 0.15
+
+PRIOR_RATING = 3.5  # Ratings of chefs with few bookings are pulled towards this average.
+PRIOR_BOOKINGS = 5  # Number of bookings the prior rating counts as.
+BOOKINGS_CAP = 100  # Popularity stops growing after this many bookings.
+EXPERIENCE_CAP_YEARS = 20
+REFERENCE_HOURLY_RATE = 50.0  # A chef at this rate gets half the price signal.
+
+
+def ranking_score(rating: float, total_bookings: int, years_of_experience: int, hourly_rate: float, is_available: int) -> float:
+    """
+    Combine a chef's columns into one score, higher is better.
+
+    Args:
+        rating: Average rating out of 5
+        total_bookings: Number of times booked
+        years_of_experience: Years cooking professionally
+        hourly_rate: Price per hour
+        is_available: 1 if taking bookings
+
+    Returns:
+        Score between 0 and 1, or 0 for unavailable chefs
+    """
+    if not is_available:
+        return 0.0
+    bookings = max(total_bookings or 0, 0)
+    rating_signal = ((rating or 0.0) * bookings + PRIOR_RATING * PRIOR_BOOKINGS) / (bookings + PRIOR_BOOKINGS) / 5.0
+    popularity_signal = min(math.log1p(bookings) / math.log1p(BOOKINGS_CAP), 1.0)
+    experience_signal = min(max(years_of_experience or 0, 0), EXPERIENCE_CAP_YEARS) / EXPERIENCE_CAP_YEARS
+    price_signal = 1.0 / (1.0 + max(hourly_rate or 0.0, 0.0) / REFERENCE_HOURLY_RATE)
+
+    score = (
+        RATING_WEIGHT * rating_signal
+        + POPULARITY_WEIGHT * popularity_signal
+        + EXPERIENCE_WEIGHT * experience_signal
+        + PRICE_WEIGHT * price_signal
+    )
+    return round(score, 6)
+
+
+def set_ranking_score(mapper, connection, target) -> None:
+    """Mapper hook keeping a chef's ranking_score in step with the columns it is computed from."""
+    is_available = 1 if target.is_available is None else target.is_available  # Column defaults are applied after this hook on insert.
+    target.ranking_score = ranking_score(
+        target.rating, target.total_bookings, target.years_of_experience, target.hourly_rate, is_available
+    )
@@ -0,0 +1,142 @@
+"""
+Throughput of the database modes under concurrent load
+
+Modes:
+    sync        threadpool workers on the default engine (rollback journal for SQLite)
+    async       aiosqlite/asyncpg on the event loop (DATABASE_ASYNC)
+    sqlite-wal  SQLite profile: WAL, tuned pragmas, one writer and a reader pool (SQLITE_OPTIMIZED)
+
+Each mode runs in its own process, because engines are built from settings at
+import time. Each process seeds a fresh database and sends --requests
+requests, --concurrency at a time, through the ASGI app in-process. That way
+the numbers measure the app and the database, not the network. A --writes
+share of the requests are chef profile updates; the rest are reads.
+
+    python benchmark.py                                   # every mode, default load
+    python benchmark.py --mode sync --mode sqlite-wal --writes 0.3
+    python benchmark.py --mode async --path "/api/chefs?sort=rating"
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = {
+    "sync": {"DATABASE_ASYNC": "False", "SQLITE_OPTIMIZED": "False"},
+    "async": {"DATABASE_ASYNC": "True", "SQLITE_OPTIMIZED": "False"},
+    "sqlite-wal": {"DATABASE_ASYNC": "False", "SQLITE_OPTIMIZED": "True"},
+}
+
+DEFAULT_PATHS = ["/api/chefs/{chef_id}", "/api/chefs?limit=20&sort=rating"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", action="append", choices=list(MODES), help="Mode to run, repeatable (default: all)")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per mode")
+    parser.add_argument("--concurrency", type=int, default=200, help="Requests in flight at once")
+    parser.add_argument("--chefs", type=int, default=500, help="Chefs seeded into the benchmark database")
+    parser.add_argument("--writes", type=float, default=0.2, help="Share of requests that update a chef profile")
+    parser.add_argument("--path", action="append", help="Read path, cycled; {chef_id} is filled in (default: profile and list)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def seed(chef_count):
+    """Create chefs and return (chef_id, token) pairs; tokens are minted directly so bcrypt stays out of the numbers."""
+    from app import Base, SessionLocal, engine
+    from app.models.chef import Chef
+    from app.models.user import User, UserRole
+    from app.utils.auth import create_access_token
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        for i in range(chef_count):
+            user = User(email=f"chef{i}@example.com", password_hash="not-a-real-hash", name=f"Chef {i}", role=UserRole.CHEF)
+            db.add(user)
+            db.flush()
+            db.add(Chef(user_id=user.id, location="Nairobi", hourly_rate=20 + i % 80, rating=i % 5, cuisines="Italian"))
+        db.commit()
+        return [(chef_id, create_access_token({"sub": str(user_id)})) for chef_id, user_id in db.query(Chef.id, Chef.user_id)]
+    finally:
+        db.close()
+
+
+async def run_load(paths, total, concurrency, writes, chefs):
+    import httpx
+    from app import create_app
+
+    latencies, failures = [], 0
+    semaphore = asyncio.Semaphore(concurrency)
+    write_every = round(1 / writes) if writes > 0 else 0
+    transport = httpx.ASGITransport(app=create_app())
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        async def one(i):
+            nonlocal failures
+            chef_id, token = chefs[i % len(chefs)]
+            async with semaphore:
+                started = time.perf_counter()
+                if write_every and i % write_every == 0:
+                    response = await client.put(f"/api/chefs/{chef_id}", json={"hourly_rate": 20 + i % 80}, headers={"Authorization": f"Bearer {token}"})
+                else:
+                    response = await client.get(paths[i % len(paths)].format(chef_id=chef_id))
+                latencies.append(time.perf_counter() - started)
+                failures += response.status_code != 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": total,
+        "failures": failures,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+    }
+
+
+def run_mode(mode, args):
+    """Benchmark one mode in a child process with its own database and settings."""
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{os.path.join(directory, 'benchmark.db')}",
+            CHEF_SEARCH_CACHE_SIZE="0",  # Every list request goes to the database.
+            RATE_LIMIT_ENABLED="False",  # All load comes from one client; budgets would turn it into 429s.
+            **MODES[mode],
+        )
+        command = [sys.executable, __file__, "--child", "--requests", str(args.requests), "--concurrency", str(args.concurrency), "--chefs", str(args.chefs), "--writes", str(args.writes)]
+        for path in args.path or []:
+            command += ["--path", path]
+        output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    args = parse_args()
+    if args.child:
+        chefs = seed(args.chefs)
+        result = asyncio.run(run_load(args.path or DEFAULT_PATHS, args.requests, args.concurrency, args.writes, chefs))
+        print(json.dumps(result))
+        return
+
+    print(f"{args.requests} requests, {args.concurrency} concurrent, {args.writes:.0%} writes, {args.chefs} chefs")
+    print(f"{'mode':<11} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'failed':>7}")
+    for mode in args.mode or list(MODES):
+        result = run_mode(mode, args)
+        print(f"{mode:<11} {result['requests_per_second']:>9} {result['p50_ms']:>9} {result['p95_ms']:>9} {result['failures']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import os
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 import json
 
 
@@ -10,10 +10,33 @@ class Settings(BaseSettings):
     VERSION: str = "1.0.0"
     
     DATABASE_URL: str = "sqlite:///./find_my_chef.db"
+    DATABASE_ASYNC: bool = False
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_STICKY_SECONDS: float = 5.0
+    DB_POOL_SIZE: int = 5
+    DB_POOL_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    READINESS_TIMEOUT_SECONDS: float = 2.0
+    
+    SQLITE_OPTIMIZED: bool = False
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456
     
     SECRET_KEY: str = "your-secret-key-here"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    BCRYPT_ROUNDS: int = 0
+    BCRYPT_MIN_ROUNDS: int = 10
+    PASSWORD_HASH_TARGET_MS: float = 250.0
+    PASSWORD_HASH_WORKERS: int = 0
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
     
     CORS_ORIGINS: List[str] = ["http://localhost:5173", "http://localhost:3000"]
     
@@ -23,6 +46,42 @@ class Settings(BaseSettings):
     ITEMS_PER_PAGE: int = 20
     MAX_ITEMS_PER_PAGE: int = 100
     
+    ADMIN_API_KEY: str = ""
+    BULK_IMPORT_BATCH_SIZE: int = 100
+    BULK_IMPORT_MAX_ERRORS: int = 1000
+    
+    DEFAULT_SEARCH_RADIUS_KM: float = 10.0
+    MAX_SEARCH_RADIUS_KM: float = 200.0
+    
+    CHEF_SEARCH_CACHE_SIZE: int = 512
+    CHEF_SEARCH_CACHE_TTL_SECONDS: float = 30.0
+    PRICE_FACET_BUCKET_WIDTH: float = 25.0
+    
+    DEFAULT_BOOKING_DURATION_HOURS: float = 3.0
+    MAX_BOOKING_DURATION_HOURS: float = 12.0
+    MAX_BOOKING_BATCH_SIZE: int = 100
+    EXPORT_BATCH_SIZE: int = 1000
+    
+    CHEF_PROFILE_MAX_AGE_SECONDS: int = 0
+    
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_ENCODINGS: List[str] = ["zstd", "br", "gzip"]
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_STORE: str = "sqlite:///./ratelimit.db"
+    RATE_LIMIT_DEFAULT: str = "300/minute"
+    RATE_LIMIT_ROUTES: Dict[str, str] = {
+        "POST /api/auth/login": "10/minute",
+        "POST /api/auth/register": "10/minute",
+        "POST /api/auth/google": "10/minute",
+        "GET /api/chefs": "120/minute",
+    }
+    RATE_LIMIT_EXEMPT_PATHS: List[str] = ["/api/health", "/api/ready"]
+    RATE_LIMIT_PROXY_HOPS: int = 0
+    
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     
@@ -0,0 +1,44 @@
+"""
+Bulk-import chefs from a CSV or NDJSON file
+
+    python import_chefs.py chefs.csv
+    python import_chefs.py agency-export.jsonl --format ndjson
+"""
+
+import argparse
+import asyncio
+import sys
+from app import SessionLocal
+from app.controllers.chef_import import FORMATS, import_chefs
+from app.utils.password_hashing import password_hasher
+
+
+async def run(path, format):
+    await password_hasher.calibrate()  # The same bcrypt cost the web app picks on this machine.
+    db = SessionLocal()
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as lines:  # Read line by line; memory stays flat for any file size.
+            return await import_chefs(db, lines, format)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("path", help="CSV with a header row, or one JSON object per line")
+    parser.add_argument("--format", choices=FORMATS, help="Default: from the file extension (.ndjson/.jsonl, else csv)")
+    args = parser.parse_args()
+    format = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+
+    print(f"Importing chefs from {args.path}...")
+    report = asyncio.run(run(args.path, format))
+    for error in report["errors"]:
+        print(f"  line {error['line']} ({error['email']}): {'; '.join(error['errors'])}")
+    if report["errors_truncated"]:
+        print(f"  ...and {report['failed'] - len(report['errors'])} more")
+    print(f"{'✅' if not report['failed'] else '⚠️'} Imported {report['imported']} chefs, {report['failed']} failed")
+    sys.exit(1 if report["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
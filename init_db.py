@@ -1,12 +1,18 @@
+from alembic import command
+from alembic.config import Config
 from app import Base, engine
-from app.models import User, Chef, Client, Booking
+from app.models import User, Chef, Client, Booking, Cuisine
+from app.models.chef_search import rebuild_chef_search_index
 
 
 def init_db():
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)  # This creates all tables from models.
+    with engine.begin() as connection:
+        rebuild_chef_search_index(connection)  # Indexes chefs that existed before the search index did.
+    command.stamp(Config("alembic.ini"), "head")  # Tables match the latest migration, so later `alembic upgrade head` starts from here.
     print("✅ Database tables created successfully!")
-    print("Tables: users, chefs, clients, bookings")
+    print("Tables: users, chefs, clients, bookings, cuisines, chef_cuisines, client_cuisines, chef_search, chef_availability, chef_availability_exceptions")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+"""
+Alembic environment: runs migrations against settings.DATABASE_URL
+
+Usage:
+    alembic upgrade head                           # Create or update the schema
+    alembic revision --autogenerate -m "message"   # Draft a migration from model changes
+
+Databases created by init_db.py before migrations existed: run
+`alembic stamp 0001` once, then `alembic upgrade head`.
+"""
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import engine_from_config, pool
+
+from app import Base
+import app.models  # noqa: F401  Registering every model on Base.metadata for autogenerate.
+import app.models.chef_search  # noqa: F401
+from config.settings import settings
+
+config = context.config
+if not config.get_main_option("sqlalchemy.url"):  # Tests pass their own URL; everything else uses settings.
+    config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not name.startswith("chef_search")  # Full-text table (and its FTS5 shadow tables) is managed by hand-written DDL.
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connectable = engine_from_config(config.get_section(config.config_ini_section, {}), prefix="sqlalchemy.", poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=True,  # SQLite can't ALTER most constraints; batch mode rebuilds the table instead.
+            include_object=include_object,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,92 @@
+"""Initial schema: users, chefs, clients and bookings
+
+Matches databases created by init_db.py before migrations existed; stamp
+those with `alembic stamp 0001` instead of running this revision.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-11-03
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+user_role = sa.Enum("CHEF", "CLIENT", name="userrole")
+booking_status = sa.Enum("PENDING", "ACCEPTED", "CONFIRMED", "DECLINED", "COMPLETED", "CANCELLED", name="bookingstatus")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("role", user_role, nullable=False),
+        sa.Column("firebase_uid", sa.String(255), nullable=True, unique=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "chefs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False, unique=True),
+        sa.Column("bio", sa.Text(), nullable=True),
+        sa.Column("cuisines", sa.String(500), nullable=True),
+        sa.Column("specialties", sa.Text(), nullable=True),
+        sa.Column("hourly_rate", sa.Float(), nullable=False),
+        sa.Column("location", sa.String(255), nullable=True),
+        sa.Column("phone", sa.String(20), nullable=True),
+        sa.Column("photo_url", sa.String(500), nullable=True),
+        sa.Column("years_of_experience", sa.Integer(), nullable=True),
+        sa.Column("rating", sa.Float(), nullable=True),
+        sa.Column("total_bookings", sa.Integer(), nullable=True),
+        sa.Column("is_available", sa.Integer(), nullable=True),
+    )
+    op.create_index("ix_chefs_id", "chefs", ["id"])
+
+    op.create_table(
+        "clients",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False, unique=True),
+        sa.Column("phone", sa.String(20), nullable=True),
+        sa.Column("address", sa.String(500), nullable=True),
+        sa.Column("preferred_cuisines", sa.String(500), nullable=True),
+        sa.Column("total_bookings", sa.Integer(), nullable=True),
+    )
+    op.create_index("ix_clients_id", "clients", ["id"])
+
+    op.create_table(
+        "bookings",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("client_id", sa.Integer(), sa.ForeignKey("clients.id"), nullable=False),
+        sa.Column("chef_id", sa.Integer(), sa.ForeignKey("chefs.id"), nullable=False),
+        sa.Column("booking_date", sa.Date(), nullable=False),
+        sa.Column("booking_time", sa.Time(), nullable=False),
+        sa.Column("duration_hours", sa.Float(), nullable=False),
+        sa.Column("location", sa.String(500), nullable=False),
+        sa.Column("hourly_rate", sa.Float(), nullable=False),
+        sa.Column("total_price", sa.Float(), nullable=False),
+        sa.Column("status", booking_status, nullable=False),
+        sa.Column("special_requests", sa.Text(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_bookings_id", "bookings", ["id"])
+
+
+def downgrade() -> None:
+    op.drop_table("bookings")
+    op.drop_table("clients")
+    op.drop_table("chefs")
+    op.drop_table("users")
+    booking_status.drop(op.get_bind(), checkfirst=True)
+    user_role.drop(op.get_bind(), checkfirst=True)
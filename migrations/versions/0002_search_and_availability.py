@@ -0,0 +1,225 @@
+"""Chef search, cuisine tags, geolocation, ranking and availability
+
+Adds the columns and tables behind GET /api/chefs filtering and sorting,
+the availability calendar and booking intervals, then backfills them from
+existing rows.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-11-17
+"""
+import math
+from datetime import datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("chefs") as batch:
+        batch.add_column(sa.Column("latitude", sa.Float(), nullable=True))
+        batch.add_column(sa.Column("longitude", sa.Float(), nullable=True))
+        batch.add_column(sa.Column("geohash", sa.String(12), nullable=True))
+        batch.add_column(sa.Column("ranking_score", sa.Float(), nullable=False, server_default="0"))
+    for name, columns in [
+        ("ix_chefs_available_price", ["is_available", "hourly_rate", "id"]),
+        ("ix_chefs_available_rating", ["is_available", "rating", "id"]),
+        ("ix_chefs_available_experience", ["is_available", "years_of_experience", "id"]),
+        ("ix_chefs_available_newest", ["is_available", "id"]),
+        ("ix_chefs_available_geohash", ["is_available", "geohash"]),
+        ("ix_chefs_available_ranking", ["is_available", "ranking_score", "id"]),
+    ]:
+        op.create_index(name, "chefs", columns)
+
+    with op.batch_alter_table("clients") as batch:
+        batch.add_column(sa.Column("latitude", sa.Float(), nullable=True))
+        batch.add_column(sa.Column("longitude", sa.Float(), nullable=True))
+        batch.add_column(sa.Column("geohash", sa.String(12), nullable=True))
+
+    with op.batch_alter_table("bookings") as batch:
+        batch.add_column(sa.Column("start_at", sa.DateTime(), nullable=True))
+        batch.add_column(sa.Column("end_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_bookings_chef_start", "bookings", ["chef_id", "start_at"])
+
+    cuisines = op.create_table(
+        "cuisines",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("slug", sa.String(100), nullable=False),
+    )
+    op.create_index("ix_cuisines_id", "cuisines", ["id"])
+    op.create_index("ix_cuisines_slug", "cuisines", ["slug"], unique=True)
+    chef_cuisines = op.create_table(
+        "chef_cuisines",
+        sa.Column("cuisine_id", sa.Integer(), sa.ForeignKey("cuisines.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("chef_id", sa.Integer(), sa.ForeignKey("chefs.id", ondelete="CASCADE"), primary_key=True),
+    )
+    op.create_index("ix_chef_cuisines_chef_id", "chef_cuisines", ["chef_id"])
+    client_cuisines = op.create_table(
+        "client_cuisines",
+        sa.Column("cuisine_id", sa.Integer(), sa.ForeignKey("cuisines.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("client_id", sa.Integer(), sa.ForeignKey("clients.id", ondelete="CASCADE"), primary_key=True),
+    )
+    op.create_index("ix_client_cuisines_client_id", "client_cuisines", ["client_id"])
+
+    op.create_table(
+        "chef_availability",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("chef_id", sa.Integer(), sa.ForeignKey("chefs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("weekday", sa.Integer(), nullable=False),
+        sa.Column("start_time", sa.Time(), nullable=False),
+        sa.Column("end_time", sa.Time(), nullable=False),
+    )
+    op.create_index("ix_chef_availability_id", "chef_availability", ["id"])
+    op.create_index("ix_chef_availability_chef_weekday", "chef_availability", ["chef_id", "weekday", "start_time"])
+    op.create_table(
+        "chef_availability_exceptions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("chef_id", sa.Integer(), sa.ForeignKey("chefs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("is_available", sa.Integer(), nullable=False),
+        sa.Column("start_time", sa.Time(), nullable=True),
+        sa.Column("end_time", sa.Time(), nullable=True),
+    )
+    op.create_index("ix_chef_availability_exceptions_id", "chef_availability_exceptions", ["id"])
+    op.create_index("ix_chef_availability_exceptions_chef_date", "chef_availability_exceptions", ["chef_id", "date"])
+
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "CREATE TABLE chef_search ("
+            "chef_id INTEGER PRIMARY KEY REFERENCES chefs (id) ON DELETE CASCADE, document TSVECTOR NOT NULL)"
+        )
+        op.execute("CREATE INDEX ix_chef_search_document ON chef_search USING GIN (document)")
+    else:
+        op.execute(
+            "CREATE VIRTUAL TABLE chef_search USING fts5("
+            "name, bio, specialties, cuisines, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+
+    _backfill(bind, cuisines, chef_cuisines, client_cuisines)
+
+
+# The backfill below is frozen as of this revision, so replaying it later gives
+# the same rows whatever app.controllers.cuisines, app.utils.ranking or the
+# search index code have become since.
+
+def _cuisine_slug(name):
+    return " ".join(name.split()).lower()
+
+
+def _parse_cuisines(raw):
+    names, seen = [], set()
+    for part in (raw or "").split(","):
+        name = " ".join(part.split())
+        slug = _cuisine_slug(name)
+        if slug and slug not in seen:
+            seen.add(slug)
+            names.append(name)
+    return names
+
+
+def _ranking_score(rating, total_bookings, years_of_experience, hourly_rate, is_available):
+    if not is_available:
+        return 0.0
+    bookings = max(total_bookings or 0, 0)
+    rating_signal = ((rating or 0.0) * bookings + 3.5 * 5) / (bookings + 5) / 5.0
+    popularity_signal = min(math.log1p(bookings) / math.log1p(100), 1.0)
+    experience_signal = min(max(years_of_experience or 0, 0), 20) / 20
+    price_signal = 1.0 / (1.0 + max(hourly_rate or 0.0, 0.0) / 50.0)
+    return round(0.45 * rating_signal + 0.25 * popularity_signal + 0.15 * experience_signal + 0.15 * price_signal, 6)
+
+
+def _rebuild_search_index(bind):
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "INSERT INTO chef_search (chef_id, document) "
+            "SELECT chefs.id, "
+            "setweight(to_tsvector('simple', coalesce(users.name, '')), 'A') || "
+            "setweight(to_tsvector('simple', replace(coalesce(chefs.cuisines, ''), ',', ' ')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(chefs.specialties, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(chefs.bio, '')), 'C') "
+            "FROM chefs JOIN users ON users.id = chefs.user_id"
+        )
+    else:
+        op.execute(
+            "INSERT INTO chef_search (rowid, name, bio, specialties, cuisines) "
+            "SELECT chefs.id, users.name, chefs.bio, chefs.specialties, replace(chefs.cuisines, ',', ' ') "
+            "FROM chefs JOIN users ON users.id = chefs.user_id"
+        )
+
+
+def _backfill(bind, cuisines, chef_cuisines, client_cuisines) -> None:
+    chefs = sa.table(
+        "chefs", sa.column("id"), sa.column("cuisines"), sa.column("rating"), sa.column("total_bookings"),
+        sa.column("years_of_experience"), sa.column("hourly_rate"), sa.column("is_available"), sa.column("ranking_score"),
+    )
+    clients = sa.table("clients", sa.column("id"), sa.column("preferred_cuisines"))
+    bookings = sa.table(
+        "bookings", sa.column("id"), sa.column("booking_date", sa.Date()), sa.column("booking_time", sa.Time()),
+        sa.column("duration_hours"), sa.column("start_at", sa.DateTime()), sa.column("end_at", sa.DateTime()),
+    )
+
+    cuisine_ids = {}
+
+    def tag(owner_table, owner_column, owner_id, raw):
+        for name in _parse_cuisines(raw):
+            slug = _cuisine_slug(name)
+            if slug not in cuisine_ids:
+                cuisine_ids[slug] = bind.execute(sa.insert(cuisines).values(name=name, slug=slug).returning(cuisines.c.id)).scalar_one()
+            bind.execute(sa.insert(owner_table).values(cuisine_id=cuisine_ids[slug], **{owner_column: owner_id}))
+
+    for chef in bind.execute(sa.select(chefs)).all():
+        tag(chef_cuisines, "chef_id", chef.id, chef.cuisines)
+        score = _ranking_score(
+            chef.rating, chef.total_bookings, chef.years_of_experience, chef.hourly_rate,
+            1 if chef.is_available is None else chef.is_available,
+        )
+        bind.execute(sa.update(chefs).where(chefs.c.id == chef.id).values(ranking_score=score))
+
+    for client in bind.execute(sa.select(clients)).all():
+        tag(client_cuisines, "client_id", client.id, client.preferred_cuisines)
+
+    for booking in bind.execute(sa.select(bookings)).all():
+        start_at = datetime.combine(booking.booking_date, booking.booking_time)
+        bind.execute(
+            sa.update(bookings).where(bookings.c.id == booking.id)
+            .values(start_at=start_at, end_at=start_at + timedelta(hours=booking.duration_hours))
+        )
+
+    _rebuild_search_index(bind)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS chef_search")
+    op.drop_table("chef_availability_exceptions")
+    op.drop_table("chef_availability")
+    op.drop_table("client_cuisines")
+    op.drop_table("chef_cuisines")
+    op.drop_table("cuisines")
+
+    op.drop_index("ix_bookings_chef_start", table_name="bookings")
+    with op.batch_alter_table("bookings") as batch:
+        batch.drop_column("end_at")
+        batch.drop_column("start_at")
+
+    with op.batch_alter_table("clients") as batch:
+        batch.drop_column("geohash")
+        batch.drop_column("longitude")
+        batch.drop_column("latitude")
+
+    for name in [
+        "ix_chefs_available_ranking", "ix_chefs_available_geohash", "ix_chefs_available_newest",
+        "ix_chefs_available_experience", "ix_chefs_available_rating", "ix_chefs_available_price",
+    ]:
+        op.drop_index(name, table_name="chefs")
+    with op.batch_alter_table("chefs") as batch:
+        batch.drop_column("ranking_score")
+        batch.drop_column("geohash")
+        batch.drop_column("longitude")
+        batch.drop_column("latitude")
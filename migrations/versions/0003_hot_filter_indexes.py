@@ -0,0 +1,28 @@
+"""Composite indexes for the remaining hot filters
+
+GET /api/bookings filters by client or chef and optionally by status; the
+location facet groups available chefs by location. Chef.user_id and
+Client.user_id already have an index through their unique constraints.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-12-01
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_bookings_client_status", "bookings", ["client_id", "status"])
+    op.create_index("ix_bookings_chef_status", "bookings", ["chef_id", "status"])
+    op.create_index("ix_chefs_available_location", "chefs", ["is_available", "location"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chefs_available_location", table_name="chefs")
+    op.drop_index("ix_bookings_chef_status", table_name="bookings")
+    op.drop_index("ix_bookings_client_status", table_name="bookings")
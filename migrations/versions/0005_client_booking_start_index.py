@@ -0,0 +1,20 @@
+"""Index client bookings by start time for history exports
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_bookings_client_start", "bookings", ["client_id", "start_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bookings_client_start", table_name="bookings")
@@ -9,6 +9,7 @@ Structure matches frontend structure:
 - tests/search/ → Tests for chef search and filtering
 - tests/bookings/ → Tests for booking management
 - tests/models/ → Tests for database models
+- tests/performance/ → Query-count guards against N+1 loading
 
 To run tests:
     pytest                          # Run all tests
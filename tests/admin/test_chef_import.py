@@ -0,0 +1,112 @@
+"""
+Tests for Bulk Chef Import
+
+Corresponds to frontend: none; partner agencies' files are imported by admins
+A CSV or NDJSON file is validated row by row, imported in chunked
+transactions, and answered with a report of the rows that failed.
+"""
+import pytest
+from fastapi import status
+from config.settings import settings
+
+CSV = """name,email,password,hourly_rate,cuisines,location,years_of_experience
+Amina Otieno,amina@example.com,SecurePass123!,45,"Italian, Swahili",Nairobi,6
+Brian Kip,brian@example.com,SecurePass123!,-5,French,Nairobi,3
+Chloe Wanjiru,chloe@example.com,SecurePass123!,30,italian,Mombasa,
+Dan Mwangi,taken@example.com,SecurePass123!,50,,Nairobi,2
+Esther Njeri,esther@example.com,SecurePass123!,60,Indian,Kisumu,10
+"""
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    from app.utils.password_hashing import password_hasher
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", "test-admin-key")
+    monkeypatch.setattr(settings, "BULK_IMPORT_BATCH_SIZE", 2)  # Several chunks from a small file.
+    monkeypatch.setattr(password_hasher, "rounds", 4)  # Cheapest bcrypt cost; the tests are about the import.
+    return {"X-Admin-Key": "test-admin-key"}
+
+
+def _import(client, headers, body, content_type="text/csv"):
+    return client.post("/api/admin/chefs/import", content=body, headers={**headers, "Content-Type": content_type})
+
+
+class TestChefImport:
+    """Tests for POST /api/admin/chefs/import"""
+
+    def test_csv_import_reports_failed_rows(self, client, admin, register_user):
+        """
+        Test that valid rows are imported and invalid or duplicate ones reported
+        Frontend: none, admin tooling
+        """
+        register_user("taken@example.com")
+
+        report = _import(client, admin, CSV).json()
+
+        assert (report["imported"], report["failed"], report["errors_truncated"]) == (3, 2, False)
+        assert [(error["line"], error["email"]) for error in report["errors"]] == [(3, "brian@example.com"), (5, "taken@example.com")]
+        assert "hourly_rate" in report["errors"][0]["errors"][0]
+        assert report["errors"][1]["errors"] == ["Email already registered"]
+
+    def test_imported_chefs_searchable_and_can_log_in(self, client, admin):
+        _import(client, admin, CSV)
+
+        italian = client.get("/api/chefs", params={"cuisine": "Italian", "sort": "newest"}).json()
+        assert sorted(chef["name"] for chef in italian) == ["Amina Otieno", "Chloe Wanjiru"]
+        assert italian[0]["cuisines"] in (["Italian"], ["Italian", "Swahili"])  # Canonical spelling, as set_chef_cuisines stores it.
+        assert [chef["name"] for chef in client.get("/api/chefs", params={"search": "esther"}).json()] == ["Esther Njeri"]
+        assert client.post("/api/auth/login", json={"email": "esther@example.com", "password": "SecurePass123!"}).status_code == status.HTTP_200_OK
+
+    def test_ndjson_import(self, client, admin):
+        body = '{"name": "Faith", "email": "faith@example.com", "password": "SecurePass123!", "hourly_rate": 40}\n\nnot json\n[1, 2]\n'
+
+        report = _import(client, admin, body, "application/x-ndjson").json()
+
+        assert report["imported"] == 1
+        assert [error["line"] for error in report["errors"]] == [3, 4]
+
+    def test_duplicate_rows_in_one_file(self, client, admin):
+        body = "name,email,password,hourly_rate\nA,same@example.com,SecurePass123!,30\nB,same@example.com,SecurePass123!,30\n"
+
+        report = _import(client, admin, body).json()
+
+        assert (report["imported"], report["failed"]) == (1, 1)
+
+    def test_waits_for_hashing_slots_instead_of_failing(self, client, admin, monkeypatch):
+        """
+        Test that an import during a burst of sign-ins waits for the pool instead of stopping with 503
+        """
+        import threading
+        from app.utils.password_hashing import password_hasher
+        monkeypatch.setattr(password_hasher, "in_flight", password_hasher.limit)  # Every slot taken by logins.
+        threading.Timer(0.3, setattr, (password_hasher, "in_flight", 0)).start()  # The logins finish.
+
+        response = _import(client, admin, CSV)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["imported"] == 4
+
+    def test_unexpected_constraint_error_not_leaked(self, db_session, admin, caplog, monkeypatch):
+        from app.controllers.chef_import import insert_chef_batch, logger, validate_row
+        monkeypatch.setattr(logger, "disabled", False)  # Alembic's fileConfig in the migration tests disables existing loggers.
+        user, chef = validate_row({"name": "Amina", "email": "amina@example.com", "password": "SecurePass123!", "hourly_rate": "45"})
+        user = user.model_copy(update={"name": None})  # Breaks the NOT NULL constraint on users.name.
+
+        assert insert_chef_batch(db_session, [(2, user, chef)], ["hash"]) == [(2, "amina@example.com", "Could not be saved")]
+        assert "users.name" in caplog.text
+
+    def test_requires_admin_key(self, client, admin):
+        assert _import(client, {"X-Admin-Key": "wrong"}, CSV).status_code == status.HTTP_403_FORBIDDEN
+        assert _import(client, {}, CSV).status_code == status.HTTP_403_FORBIDDEN
+
+    def test_disabled_without_configured_key(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "ADMIN_API_KEY", "")
+        assert _import(client, {"X-Admin-Key": ""}, CSV).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_unknown_content_type(self, client, admin):
+        assert _import(client, admin, CSV, "application/pdf").status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+
+# TODO: Add tests for:
+# - import_chefs.py CLI on a large file
+# - A concurrent registration racing an import chunk
@@ -22,6 +22,18 @@ class TestRegister:
         response = client.post("/api/auth/register", json=sample_user_data)  # Second registration with same email.
         assert response.status_code == status.HTTP_400_BAD_REQUEST
     
+    def test_register_single_transaction(self, client, sample_user_data, count_queries):
+        """
+        Test that signup writes user and profile together and returns both
+        Frontend: Register.jsx goes straight to the profile without a GET
+        """
+        with count_queries() as statements:
+            response = client.post("/api/auth/register", json=sample_user_data)
+
+        data = response.json()
+        assert data["client_profile"]["user_id"] == data["user"]["id"]
+        assert [statement.split()[:3] for statement in statements] == [["INSERT", "INTO", "users"], ["INSERT", "INTO", "clients"]]  # No duplicate-email SELECT, no refresh.
+
     def test_register_invalid_email(self, client, sample_user_data):
         sample_user_data["email"] = "not-an-email"
         response = client.post("/api/auth/register", json=sample_user_data)
@@ -57,6 +69,134 @@ class TestLogin:
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
+class TestPrincipalCache:
+    """Tests for caching verified tokens in get_current_user"""
+    
+    def test_repeat_request_skips_users_query(self, client, register_user, count_queries):
+        user = register_user("client@example.com", role="client")
+        headers = {"Authorization": f"Bearer {user['token']}"}
+        client.get("/api/bookings", headers=headers)  # First use verifies the token and loads the user.
+        
+        with count_queries() as statements:
+            response = client.get("/api/bookings", headers=headers)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert not [statement for statement in statements if "FROM users" in statement and "WHERE users.id" in statement]
+        assert client.get("/api/metrics").json()["principal_cache"]["hits"] >= 1
+    
+    def test_user_update_invalidates(self, client, register_user, db_session):
+        from app.models import User
+        from app.utils.auth import principal_cache
+        user = register_user("client@example.com", role="client")
+        client.get("/api/bookings", headers={"Authorization": f"Bearer {user['token']}"})
+        assert principal_cache.get(user["token"]) is not None
+        
+        db_session.query(User).filter(User.id == user["user_id"]).one().name = "Renamed"
+        db_session.commit()
+        
+        assert principal_cache.get(user["token"]) is None
+    
+    def test_invalidated_at_commit_not_flush(self, client, register_user, db_session):
+        """
+        Test that a flushed change evicts only once committed, and a rolled-back one not at all
+        """
+        from app.models import User
+        from app.utils.auth import principal_cache
+        user = register_user("client@example.com", role="client")
+        client.get("/api/bookings", headers={"Authorization": f"Bearer {user['token']}"})
+        
+        db_session.query(User).filter(User.id == user["user_id"]).one().name = "Renamed"
+        db_session.flush()
+        assert principal_cache.get(user["token"]) is not None  # Others still see the old row until commit.
+        db_session.rollback()
+        assert principal_cache.get(user["token"]) is not None
+        
+        db_session.query(User).filter(User.id == user["user_id"]).one().name = "Renamed"
+        db_session.flush()
+        db_session.commit()
+        assert principal_cache.get(user["token"]) is None
+    
+    def test_deleted_user_rejected(self, client, register_user, db_session):
+        from app.models import User, Client
+        user = register_user("client@example.com", role="client")
+        headers = {"Authorization": f"Bearer {user['token']}"}
+        client.get("/api/bookings", headers=headers)
+        
+        db_session.delete(db_session.query(Client).filter(Client.user_id == user["user_id"]).one())
+        db_session.delete(db_session.query(User).filter(User.id == user["user_id"]).one())
+        db_session.commit()
+        
+        assert client.get("/api/bookings", headers=headers).status_code == status.HTTP_401_UNAUTHORIZED
+    
+    def test_entry_never_outlives_token(self, client, register_user):
+        from datetime import datetime, timedelta
+        from jose import jwt
+        from app.utils.auth import principal_cache
+        from config.settings import settings
+        user = register_user("client@example.com", role="client")
+        token = jwt.encode({"sub": str(user["user_id"]), "exp": datetime.utcnow() + timedelta(seconds=5)}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        
+        client.get("/api/bookings", headers={"Authorization": f"Bearer {token}"})
+        
+        expires_at, _ = principal_cache._entries[token]
+        assert expires_at - principal_cache._clock() <= 5
+
+
+class TestPasswordHashing:
+    """Tests for the bcrypt process pool, its backpressure and rehash-on-login"""
+
+    def test_full_pool_returns_503(self, client, sample_user_data, monkeypatch):
+        """
+        Test that sign-ins beyond the hashing queue are refused instead of piling up
+        Frontend: Login.jsx retries after Retry-After
+        """
+        from app.utils.password_hashing import password_hasher
+        client.post("/api/auth/register", json=sample_user_data)
+        monkeypatch.setattr(password_hasher, "limit", 0)
+
+        response = client.post("/api/auth/login", json={"email": sample_user_data["email"], "password": sample_user_data["password"]})
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.headers["Retry-After"] == "1"
+        assert client.get("/api/metrics").json()["password_hashing"]["rejected"] >= 1
+
+    def test_login_rehashes_at_higher_cost(self, client, sample_user_data, db_session, monkeypatch):
+        from app.models import User
+        from app.utils.password_hashing import password_hasher
+        monkeypatch.setattr(password_hasher, "rounds", 4)
+        client.post("/api/auth/register", json=sample_user_data)
+        monkeypatch.setattr(password_hasher, "rounds", 5)  # As if BCRYPT_ROUNDS was raised since registration.
+        login_data = {"email": sample_user_data["email"], "password": sample_user_data["password"]}
+
+        assert client.post("/api/auth/login", json=login_data).status_code == status.HTTP_200_OK
+
+        db_session.expire_all()
+        assert db_session.query(User.password_hash).filter(User.email == sample_user_data["email"]).scalar().startswith("$2b$05$")
+        assert client.post("/api/auth/login", json=login_data).status_code == status.HTTP_200_OK
+
+    def test_login_never_lowers_cost(self, client, sample_user_data, db_session, monkeypatch):
+        """
+        Test that a worker calibrated to a lower cost leaves stronger hashes alone, so workers don't rewrite each other's
+        """
+        from app.models import User
+        from app.utils.password_hashing import password_hasher
+        monkeypatch.setattr(password_hasher, "rounds", 5)
+        client.post("/api/auth/register", json=sample_user_data)
+        stored = db_session.query(User.password_hash).filter(User.email == sample_user_data["email"]).scalar()
+        monkeypatch.setattr(password_hasher, "rounds", 4)
+
+        assert client.post("/api/auth/login", json={"email": sample_user_data["email"], "password": sample_user_data["password"]}).status_code == status.HTTP_200_OK
+
+        db_session.expire_all()
+        assert db_session.query(User.password_hash).filter(User.email == sample_user_data["email"]).scalar() == stored
+
+    def test_calibration_picks_cost_for_target(self):
+        from app.utils.password_hashing import rounds_for_target
+        assert rounds_for_target(0.01, 8, 250, 4) == 12  # 10 ms at cost 8; 16x the work is 160 ms, 32x would pass 250.
+        assert rounds_for_target(0.01, 8, 250, 13) == 13
+        assert rounds_for_target(5.0, 8, 250, 10) == 10
+
+
 class TestGoogleLogin:
     def test_google_login_new_user(self, client):
         pytest.skip("TODO: Implement when Firebase integration is complete")  # Frontend: "Sign in with Google" button.
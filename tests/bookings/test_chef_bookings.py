@@ -180,6 +180,83 @@ class TestChefEarnings:
         pytest.skip("Implement earnings calculation endpoint")
 
 
+class TestBatchStatusUpdate:
+    """Tests for accepting and declining many bookings at once: PATCH /api/bookings"""
+
+    def _setup(self, client, register_user, times=("12:00", "18:00", "19:00")):
+        chef = register_user("chef@example.com")
+        customer = register_user("client@example.com", role="client")
+        ids = [
+            client.post(
+                "/api/bookings",
+                json={"chef_id": chef["id"], "booking_date": "2025-12-20", "booking_time": booking_time, "duration_hours": 2.0, "location": "Nairobi"},
+                headers={"Authorization": f"Bearer {customer['token']}"}
+            ).json()["id"]
+            for booking_time in times
+        ]
+        return chef, customer, ids
+
+    def _batch(self, client, user, updates):
+        return client.patch("/api/bookings", json={"updates": updates}, headers={"Authorization": f"Bearer {user['token']}"})
+
+    def test_accept_and_decline_in_one_request(self, client, register_user, count_queries):
+        """
+        Test that a chef clears the inbox with one request and gets each booking back
+        Frontend: ChefBookings.jsx "Accept selected" / "Decline selected"
+        """
+        chef, _, (lunch, dinner, late) = self._setup(client, register_user)
+
+        with count_queries() as statements:
+            response = self._batch(client, chef, [
+                {"id": lunch, "status": "accepted", "notes": "Bring knives"},
+                {"id": dinner, "status": "accepted"},
+                {"id": late, "status": "declined"},
+            ])
+
+        results = response.json()["results"]
+        assert [(result["id"], result["status_code"], result["booking"]["status"]) for result in results] == [(lunch, 200, "accepted"), (dinner, 200, "accepted"), (late, 200, "declined")]
+        assert results[0]["booking"]["notes"] == "Bring knives" and results[1]["booking"]["notes"] is None
+        assert len([statement for statement in statements if statement.startswith("UPDATE bookings")]) == 2  # One per target status.
+
+    def test_overlapping_accepts_in_batch_conflict(self, client, register_user):
+        chef, _, (_, dinner, late) = self._setup(client, register_user)
+
+        results = self._batch(client, chef, [{"id": dinner, "status": "accepted"}, {"id": late, "status": "accepted"}]).json()["results"]
+
+        assert [result["status_code"] for result in results] == [200, 409]
+        assert results[1]["detail"] == "Chef is already booked from 2025-12-20T18:00:00 to 2025-12-20T20:00:00"
+
+    def test_declining_frees_slot_for_accept_in_same_batch(self, client, register_user):
+        chef, _, (_, dinner, late) = self._setup(client, register_user)
+        self._batch(client, chef, [{"id": dinner, "status": "accepted"}])
+
+        results = self._batch(client, chef, [{"id": dinner, "status": "declined"}, {"id": late, "status": "accepted"}]).json()["results"]
+
+        assert [result["status_code"] for result in results] == [200, 200]
+
+    def test_per_item_errors(self, client, register_user):
+        """
+        Test that missing, foreign and repeated bookings fail alone
+        """
+        chef, customer, (lunch, _, _) = self._setup(client, register_user)
+        other_chef = register_user("other@example.com")
+
+        results = self._batch(client, chef, [{"id": lunch, "status": "accepted"}, {"id": lunch, "status": "declined"}, {"id": 999, "status": "declined"}]).json()["results"]
+        assert [result["status_code"] for result in results] == [200, 400, 404]
+
+        results = self._batch(client, other_chef, [{"id": lunch, "status": "declined"}]).json()["results"]
+        assert results[0]["status_code"] == status.HTTP_403_FORBIDDEN
+        assert self._batch(client, customer, [{"id": lunch, "status": "declined"}]).json()["results"][0]["status_code"] == status.HTTP_403_FORBIDDEN
+
+    def test_batch_size_limited(self, client, register_user):
+        from config.settings import settings
+        chef = register_user("chef@example.com")
+
+        response = self._batch(client, chef, [{"id": i, "status": "declined"} for i in range(settings.MAX_BOOKING_BATCH_SIZE + 1)])
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 # TODO: Add tests for:
 # - Booking details view
 # - Adding chef notes to booking
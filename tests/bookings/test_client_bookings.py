@@ -159,8 +159,113 @@ class TestViewClientBookings:
         pytest.skip("Implement after basic booking creation works")
 
 
+
+class TestDoubleBooking:
+    """Tests for overlap checks: POST /api/bookings and PATCH /api/bookings/:id"""
+    
+    def _setup(self, register_user):
+        chef = register_user("chef@example.com")
+        customers = [register_user(f"client{i}@example.com", role="client") for i in range(2)]
+        return chef, customers
+    
+    def _book(self, client, customer, chef, booking_time, duration_hours=2.0):
+        return client.post(
+            "/api/bookings",
+            json={"chef_id": chef["id"], "booking_date": "2025-12-20", "booking_time": booking_time, "duration_hours": duration_hours, "location": "Nairobi"},
+            headers={"Authorization": f"Bearer {customer['token']}"}
+        )
+    
+    def _accept(self, client, chef, booking_id):
+        return client.patch(f"/api/bookings/{booking_id}", json={"status": "accepted"}, headers={"Authorization": f"Bearer {chef['token']}"})
+    
+    def test_overlapping_accepted_booking_conflicts(self, client, register_user):
+        """
+        Test that booking over an accepted slot returns 409 with the taken window
+        Frontend: ClientBookings.jsx shows the conflict on the booking form
+        """
+        chef, (first, second) = self._setup(register_user)
+        self._accept(client, chef, self._book(client, first, chef, "18:00").json()["id"])
+        
+        response = self._book(client, second, chef, "19:00")
+        
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.json()["detail"] == "Chef is already booked from 2025-12-20T18:00:00 to 2025-12-20T20:00:00"
+    
+    def test_back_to_back_bookings_allowed(self, client, register_user):
+        """
+        Test that a booking starting when another ends doesn't conflict
+        """
+        chef, (first, second) = self._setup(register_user)
+        self._accept(client, chef, self._book(client, first, chef, "18:00").json()["id"])
+        
+        response = self._book(client, second, chef, "20:00")
+        
+        assert response.status_code == status.HTTP_201_CREATED
+    
+    def test_accepting_second_overlapping_request_conflicts(self, client, register_user):
+        """
+        Test that pending requests may overlap, but the chef can accept only one
+        Frontend: ChefBookings.jsx accept button
+        """
+        chef, (first, second) = self._setup(register_user)
+        first_id = self._book(client, first, chef, "18:00").json()["id"]
+        second_id = self._book(client, second, chef, "19:00").json()["id"]
+        
+        assert self._accept(client, chef, first_id).status_code == status.HTTP_200_OK
+        assert self._accept(client, chef, second_id).status_code == status.HTTP_409_CONFLICT
+    
+    def test_concurrent_accepts_commit_only_one(self, tmp_path):
+        """
+        Test that two transactions racing for one slot can't both pass the check
+        """
+        import threading
+        from datetime import date, time, datetime
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app import Base
+        from app.models import User, UserRole, Chef, Client, Booking, BookingStatus
+        from app.controllers.availability import lock_chef_schedule, find_booking_conflict
+        
+        engine = create_engine(f"sqlite:///{tmp_path / 'race.db'}", connect_args={"check_same_thread": False, "timeout": 10})
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        with Session() as setup:
+            chef_user = User(email="chef@example.com", password_hash="hash", name="Chef", role=UserRole.CHEF)
+            client_user = User(email="client@example.com", password_hash="hash", name="Client", role=UserRole.CLIENT)
+            setup.add_all([chef_user, client_user])
+            setup.flush()
+            chef, customer = Chef(user_id=chef_user.id), Client(user_id=client_user.id)
+            setup.add_all([chef, customer])
+            setup.commit()
+            chef_id, client_id = chef.id, customer.id
+        
+        barrier, results = threading.Barrier(2), []
+        
+        def book():
+            with Session() as db:
+                barrier.wait()
+                lock_chef_schedule(db, chef_id)
+                if find_booking_conflict(db, chef_id, datetime(2025, 12, 20, 18), datetime(2025, 12, 20, 20)):
+                    db.rollback()
+                    results.append("conflict")
+                    return
+                db.add(Booking(
+                    client_id=client_id, chef_id=chef_id, booking_date=date(2025, 12, 20), booking_time=time(18, 0),
+                    duration_hours=2.0, location="Nairobi", hourly_rate=0.0, total_price=0.0, status=BookingStatus.ACCEPTED
+                ))
+                db.commit()
+                results.append("booked")
+        
+        threads = [threading.Thread(target=book) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert sorted(results) == ["booked", "conflict"]
+        engine.dispose()
+
 # TODO: Add tests for:
 # - Booking past dates validation
 # - Booking times validation
-# - Chef availability check
 # - Client cancelling booking
@@ -1,6 +1,7 @@
 import pytest
+from contextlib import contextmanager
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from app import create_app, Base, get_db, engine as app_engine, SessionLocal as AppSessionLocal
 import app.models  # Importing models so SQLAlchemy registers tables before create_all
@@ -28,6 +29,14 @@ def db_session():
     import app.models.chef
     import app.models.client
     import app.models.booking
+    import app.models.cuisine
+    import app.models.availability
+    import app.models.chef_search
+
+    from app.controllers.chef_search import chef_search_cache
+    from app.utils.auth import principal_cache
+    chef_search_cache.clear()  # Cached pages refer to rows of the previous test's database.
+    principal_cache.clear()  # So do cached users; a new test's user 1 can even get the same token.
 
     Base.metadata.create_all(bind=engine)  # Creating fresh tables for each test.
     session = TestingSessionLocal()
@@ -38,6 +47,13 @@ def db_session():
         Base.metadata.drop_all(bind=engine)  # Clean up after test.
 
 
+@pytest.fixture(autouse=True)
+def memory_rate_limits(monkeypatch):
+    """Apps built by tests get fresh rate limit buckets, not the ratelimit.db file shared across runs"""
+    from config.settings import settings
+    monkeypatch.setattr(settings, "RATE_LIMIT_STORE", "memory")
+
+
 @pytest.fixture(scope="function")
 def client(db_session):
     app = create_app()
@@ -54,6 +70,40 @@ def client(db_session):
         yield test_client
 
 
+@pytest.fixture
+def count_queries():
+    """Context manager collecting every SQL statement run on the test engine inside its block"""
+    @contextmanager
+    def _count():
+        statements = []
+        
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+    
+    return _count
+
+
+@pytest.fixture
+def register_user(client, db_session):
+    """Registers a user through the API and returns its token and profile id"""
+    from app.models import User, Chef, Client
+
+    def _register(email, role="chef", name="Test User", password="SecurePass123!"):
+        response = client.post("/api/auth/register", json={"email": email, "password": password, "name": name, "role": role})
+        user = db_session.query(User).filter(User.email == email).first()
+        profile_model = Chef if role == "chef" else Client
+        profile = db_session.query(profile_model).filter(profile_model.user_id == user.id).first()
+        return {"token": response.json()["token"], "id": profile.id, "user_id": user.id}
+
+    return _register
+
+
 @pytest.fixture
 def sample_user_data():
     return {
@@ -0,0 +1,112 @@
+"""
+Tests for the Async Database Mode
+
+With DATABASE_ASYNC, get_db hands routes an AsyncSession on aiosqlite/asyncpg
+and run_db runs their ORM work on it instead of in the threadpool. These run
+the main flows end to end in that mode.
+"""
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from app import Base, async_database_url, create_app, get_db
+
+
+@pytest.fixture
+def async_client(tmp_path):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from app.controllers.chef_search import chef_search_cache
+    from app.utils.auth import principal_cache
+
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    Base.metadata.create_all(bind=create_engine(url))
+    async_engine = create_async_engine(async_database_url(url))
+    sessions = async_sessionmaker(async_engine, autoflush=False)
+    chef_search_cache.clear()
+    principal_cache.clear()
+
+    async def override_get_db():
+        async with sessions() as db:
+            yield db
+
+    app = create_app()
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _register(client, email, role):
+    response = client.post("/api/auth/register", json={"email": email, "password": "SecurePass123!", "name": email.split("@")[0], "role": role})
+    assert response.status_code == status.HTTP_201_CREATED
+    return {"Authorization": f"Bearer {response.json()['token']}"}, response.json()["user"]["id"]
+
+
+class TestAsyncDatabaseMode:
+    """Tests for routes served through an AsyncSession"""
+
+    def test_search_and_profile(self, async_client):
+        """
+        Test registering, editing and finding a chef
+        Frontend: ChefProfile.jsx / ChefSearch.jsx
+        """
+        headers, _ = _register(async_client, "chef@example.com", "chef")
+        chef_id = async_client.get("/api/chefs").json()[0]["id"]
+
+        update = async_client.put(f"/api/chefs/{chef_id}", json={"cuisines": "Italian", "location": "Nairobi", "hourly_rate": 40.0}, headers=headers)
+        search = async_client.get("/api/chefs?cuisine=Italian&location=Nairobi")
+        profile = async_client.get(f"/api/chefs/{chef_id}", headers={"If-None-Match": update.headers["etag"]})
+
+        assert update.status_code == status.HTTP_200_OK
+        assert [chef["id"] for chef in search.json()] == [chef_id]
+        assert profile.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_booking_flow(self, async_client):
+        """
+        Test booking a chef, listing it and accepting it
+        Frontend: BookChef.jsx / ChefBookings.jsx
+        """
+        chef_headers, _ = _register(async_client, "chef@example.com", "chef")
+        client_headers, _ = _register(async_client, "client@example.com", "client")
+        chef_id = async_client.get("/api/chefs").json()[0]["id"]
+        booking = {"chef_id": chef_id, "booking_date": "2025-12-20", "booking_time": "18:00", "duration_hours": 2.0, "location": "Nairobi"}
+
+        created = async_client.post("/api/bookings", json=booking, headers=client_headers)
+        clash = async_client.post("/api/bookings", json=booking, headers=client_headers)
+        accepted = async_client.patch(f"/api/bookings/{created.json()['id']}", json={"status": "accepted"}, headers=chef_headers)
+        listed = async_client.get("/api/bookings", headers=client_headers)
+
+        assert created.status_code == status.HTTP_201_CREATED
+        assert clash.status_code == status.HTTP_201_CREATED  # Pending bookings may overlap; accepting is what commits the chef.
+        assert accepted.json()["status"] == "accepted"
+        assert [b["status"] for b in listed.json()] == ["accepted", "pending"]
+
+    def test_login_and_bad_token(self, async_client):
+        """
+        Test logging in and rejecting an unknown token
+        Frontend: Login.jsx
+        """
+        _register(async_client, "client@example.com", "client")
+
+        login = async_client.post("/api/auth/login", json={"email": "client@example.com", "password": "SecurePass123!"})
+        rejected = async_client.get("/api/bookings", headers={"Authorization": "Bearer not-a-token"})
+
+        assert login.status_code == status.HTTP_200_OK
+        assert rejected.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestAsyncDatabaseUrl:
+    """Tests for picking the async driver from DATABASE_URL"""
+
+    @pytest.mark.parametrize("url, expected", [
+        ("sqlite:///./find_my_chef.db", "sqlite+aiosqlite:///./find_my_chef.db"),
+        ("postgresql://user:pass@db/chefs", "postgresql+asyncpg://user:pass@db/chefs"),
+        ("postgresql+psycopg2://user:pass@db/chefs", "postgresql+asyncpg://user:pass@db/chefs"),
+    ])
+    def test_driver_swapped(self, url, expected):
+        assert async_database_url(url) == expected
+
+
+# TODO: Add tests for:
+# - The same flows against PostgreSQL through asyncpg
+# - Concurrent bookings for one slot in async mode
@@ -0,0 +1,165 @@
+"""
+Tests for Response Compression
+
+Corresponds to frontend: every API call (browsers send Accept-Encoding)
+Large chef and booking lists are compressed with the best encoding the
+client accepts. Small bodies, opted-out routes and non-text types go out as is.
+"""
+import gzip
+import zlib
+import pytest
+from fastapi import Depends, FastAPI, status
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from app.middleware.compression import CompressionMiddleware, compression_stats, negotiate_encoding, skip_compression
+
+LARGE_TEXT = "chef " * 1000
+
+
+def _app(**options):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100, **options)
+
+    @app.get("/large")
+    def large():
+        return PlainTextResponse(LARGE_TEXT, headers={"ETag": '"large-v1"'})
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse("chef")
+
+    @app.get("/png")
+    def png():
+        return Response(b"\x89PNG" + b"\x00" * 2000, media_type="image/png")
+
+    @app.get("/opted-out", dependencies=[Depends(skip_compression)])
+    def opted_out():
+        return PlainTextResponse(LARGE_TEXT)
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((f'{{"id": {i}}}\n' * 20 for i in range(50)), media_type="application/x-ndjson")
+
+    return app
+
+
+def _raw_get(client, url, accept_encoding):
+    """GET without httpx decoding the body, so the test sees the bytes on the wire."""
+    with client.stream("GET", url, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+class TestCompressionMiddleware:
+    """Tests for negotiated compression of response bodies"""
+
+    def test_large_body_gzipped(self):
+        client = TestClient(_app())
+        response, raw = _raw_get(client, "/large", "gzip")
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) == len(raw)
+        assert gzip.decompress(raw).decode() == LARGE_TEXT
+
+    def test_etag_weakened_when_compressed(self):
+        client = TestClient(_app())
+        response, _ = _raw_get(client, "/large", "gzip")
+
+        assert response.headers["etag"] == 'W/"large-v1"'
+
+    def test_no_accepted_encoding_sends_identity(self):
+        client = TestClient(_app())
+        response, raw = _raw_get(client, "/large", "identity")
+
+        assert "content-encoding" not in response.headers
+        assert raw.decode() == LARGE_TEXT
+
+    @pytest.mark.parametrize("url, accept_encoding", [("/large", "identity"), ("/large", ""), ("/small", "gzip")])
+    def test_vary_sent_when_not_compressed(self, url, accept_encoding):
+        """Test that a compressible URL always varies on Accept-Encoding, so shared caches never serve one client's encoding to another"""
+        client = TestClient(_app())
+        response, _ = _raw_get(client, url, accept_encoding)
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+
+    def test_no_vary_on_incompressible_types(self):
+        client = TestClient(_app())
+        response, _ = _raw_get(client, "/png", "gzip")
+
+        assert "vary" not in response.headers
+
+    @pytest.mark.parametrize("url", ["/small", "/png", "/opted-out"])
+    def test_skipped_responses_unchanged(self, url):
+        client = TestClient(_app())
+        response, _ = _raw_get(client, url, "gzip")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "content-encoding" not in response.headers
+
+    def test_streamed_body_compressed_incrementally(self):
+        client = TestClient(_app())
+        response, raw = _raw_get(client, "/stream", "gzip")
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        lines = zlib.decompress(raw, 31).decode().splitlines()
+        assert len(lines) == 1000 and lines[-1] == '{"id": 49}'
+
+    def test_brotli_preferred_when_installed(self):
+        brotli = pytest.importorskip("brotli")
+        client = TestClient(_app(encodings=["br", "gzip"]))
+        response, raw = _raw_get(client, "/large", "gzip, br")
+
+        assert response.headers["content-encoding"] == "br"
+        assert brotli.decompress(raw).decode() == LARGE_TEXT
+
+    def test_raw_and_compressed_bytes_reported(self):
+        client = TestClient(_app())
+        before = compression_stats.stats()
+
+        _, raw = _raw_get(client, "/large", "gzip")
+
+        after = compression_stats.stats()
+        assert after["raw_bytes"] - before["raw_bytes"] == len(LARGE_TEXT)
+        assert after["compressed_bytes"] - before["compressed_bytes"] == len(raw)
+
+
+class TestCompressedApi:
+    """Tests for compression on the real routes"""
+
+    def test_chef_list_gzipped(self, client, register_user):
+        """
+        Test that a long chef list is compressed and decodes to the same JSON
+        Frontend: ChefSearch.jsx over a mobile connection
+        """
+        for i in range(10):
+            register_user(f"chef{i}@example.com")
+
+        identity = client.get("/api/chefs", headers={"Accept-Encoding": "identity"})
+        response, raw = _raw_get(client, "/api/chefs", "gzip")
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert gzip.decompress(raw) == identity.content
+        assert client.get("/api/metrics").json()["compression"]["by_encoding"]["gzip"]["responses"] >= 1
+
+
+class TestNegotiateEncoding:
+    """Tests for Accept-Encoding parsing"""
+
+    def test_server_preference_breaks_ties(self):
+        assert negotiate_encoding("gzip, br", ["br", "gzip"]) == "br"
+
+    def test_quality_values_respected(self):
+        assert negotiate_encoding("br;q=0.5, gzip", ["br", "gzip"]) == "gzip"
+        assert negotiate_encoding("gzip;q=0, *", ["gzip"]) is None
+
+    def test_wildcard_and_unknown(self):
+        assert negotiate_encoding("*", ["zstd", "gzip"]) == "zstd"
+        assert negotiate_encoding("deflate", ["gzip"]) is None
+        assert negotiate_encoding("", ["gzip"]) is None
+
+
+# TODO: Add tests for:
+# - zstd responses once zstandard is installed in CI
+# - Compression of the booking history export stream
@@ -0,0 +1,116 @@
+"""
+Tests for the Connection Pool and Readiness Probe
+
+Corresponds to: load balancer / orchestrator health checks and /api/metrics
+GET /api/ready must fail when no connection can be checked out in time, and
+pool gauges and counters must reflect checkouts, waits and timeouts.
+"""
+import pytest
+from fastapi import status
+from sqlalchemy import create_engine, exc, text
+from app.db_pool import InstrumentedQueuePool, engine_options, instrument_engine, pool_metrics
+from config.settings import settings
+
+
+@pytest.fixture
+def small_pool(tmp_path):
+    """An instrumented file-backed engine with a single connection and no overflow"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.5)
+    instrument_engine(engine)
+    yield engine
+    engine.dispose()
+
+
+class TestReadiness:
+    """Tests for GET /api/ready"""
+
+    def test_ready_when_connection_available(self, client):
+        response = client.get("/api/ready")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "ready"
+
+    def test_unavailable_when_pool_exhausted(self, client, small_pool, monkeypatch):
+        monkeypatch.setattr("app.engine", small_pool)
+        monkeypatch.setattr(settings, "READINESS_TIMEOUT_SECONDS", 0.1)
+
+        with small_pool.connect():
+            response = client.get("/api/ready")
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert "No database connection" in response.json()["detail"]
+
+    def test_probes_share_one_stuck_ping(self, client, small_pool, monkeypatch):
+        """
+        Test that probes during pool exhaustion pile up on one dedicated thread, not on the shared threadpool
+        """
+        import time
+        monkeypatch.setattr("app.engine", small_pool)
+        monkeypatch.setattr(settings, "READINESS_TIMEOUT_SECONDS", 0.05)
+
+        with small_pool.connect():
+            codes = [client.get("/api/ready").status_code for _ in range(5)]
+            time.sleep(0.7)  # Past the pool's 0.5 s checkout timeout.
+
+        assert codes == [status.HTTP_503_SERVICE_UNAVAILABLE] * 5
+        assert pool_metrics(small_pool.pool)["timeouts"] == 1  # Five probes, one checkout attempt.
+
+    def test_unavailable_when_database_unreachable(self, client, tmp_path, monkeypatch):
+        monkeypatch.setattr("app.engine", create_engine(f"sqlite:///{tmp_path / 'missing' / 'chefs.db'}"))
+
+        response = client.get("/api/ready")
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json()["detail"] == "Database error: OperationalError"
+
+
+class TestPoolMetrics:
+    """Tests for the db_pool section of /api/metrics"""
+
+    def test_gauges_follow_checkouts(self, small_pool):
+        with small_pool.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            during = pool_metrics(small_pool.pool)
+        after = pool_metrics(small_pool.pool)
+
+        assert during["checked_out"] == 1 and after["checked_out"] == 0
+        assert after["checkouts"] == 1 and after["connects"] == 1
+
+    def test_timeouts_and_waits_counted(self, small_pool):
+        with small_pool.connect():
+            with pytest.raises(exc.TimeoutError):
+                small_pool.connect()
+
+        metrics = pool_metrics(small_pool.pool)
+        assert metrics["timeouts"] == 1
+        assert metrics["wait_ms_max"] >= 500
+
+    def test_invalidated_connections_counted(self, small_pool):
+        with small_pool.connect() as connection:
+            connection.invalidate()  # What pre-ping does with a connection the database closed.
+
+        assert pool_metrics(small_pool.pool)["invalidations"] == 1
+
+    def test_exposed_at_metrics_endpoint(self, client):
+        client.get("/api/ready")
+
+        assert client.get("/api/metrics").json()["db_pool"]["checkouts"] >= 1
+
+
+class TestEngineOptions:
+    """Tests for building engines from the DB_POOL_* settings"""
+
+    def test_pool_settings_applied(self):
+        options = engine_options("postgresql://user:pass@db/chefs")
+
+        assert options["pool_size"] == settings.DB_POOL_SIZE
+        assert options["pool_pre_ping"] is settings.DB_POOL_PRE_PING
+        assert options["pool_recycle"] == settings.DB_POOL_RECYCLE_SECONDS
+
+    def test_in_memory_sqlite_keeps_default_pool(self):
+        assert "poolclass" not in engine_options("sqlite:///:memory:")
+
+
+# TODO: Add tests for:
+# - Readiness in async mode (DATABASE_ASYNC)
+# - Recovering after a PostgreSQL restart with pre-ping
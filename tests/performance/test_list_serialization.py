@@ -0,0 +1,73 @@
+"""
+Tests for the Fast List Read Path
+
+GET /api/chefs and GET /api/bookings build their JSON from selected columns
+with orjson instead of Chef/Booking objects and response_model validation.
+The bytes must stay exactly what the validated path produced.
+"""
+from datetime import date, time, datetime
+from typing import List
+from pydantic import TypeAdapter
+from fastapi.responses import JSONResponse
+from app.models import Chef, Booking, BookingStatus
+from app.schemas.chef import ChefResponse
+from app.schemas.booking import BookingResponse
+from app.utils.fast_json import encode_json
+
+
+def _validated_bytes(schema, objects):
+    """What FastAPI sends for a response_model=List[schema] route returning [obj.to_dict()]"""
+    adapter = TypeAdapter(List[schema])
+    validated = adapter.validate_python([obj.to_dict() for obj in objects])
+    return JSONResponse(adapter.dump_python(validated, mode="json")).body
+
+
+class TestListSerialization:
+    """Fast list responses must match validated responses byte for byte"""
+    
+    def test_chef_list_bytes(self, client, register_user, db_session):
+        """
+        Test chefs with unicode text, empty fields and coordinates near zero
+        Frontend: ChefSearch.jsx
+        """
+        full = register_user("full@example.com", name="Zoë Ñandú")
+        client.put(
+            f"/api/chefs/{full['id']}",
+            json={"bio": "Crème brûlée \"and\" more", "cuisines": "Italian,Thai", "hourly_rate": 42.5, "latitude": 0.00001, "longitude": 36.8172},
+            headers={"Authorization": f"Bearer {full['token']}"}
+        )
+        register_user("empty@example.com", name="Plain Chef")
+        
+        response = client.get("/api/chefs?sort=newest")
+        
+        chefs = db_session.query(Chef).order_by(Chef.id.desc()).all()
+        assert response.content == _validated_bytes(ChefResponse, chefs)
+    
+    def test_booking_list_bytes(self, client, register_user, db_session):
+        """
+        Test bookings with notes, missing fields and sub-second times
+        Frontend: ClientBookings.jsx
+        """
+        chef = register_user("chef@example.com", name="Chef Ünal")
+        customer = register_user("client@example.com", role="client")
+        client.post(
+            "/api/bookings",
+            json={"chef_id": chef["id"], "booking_date": "2025-12-20", "booking_time": "18:00", "duration_hours": 2.5, "location": "Nairobi", "special_requests": "No nuts 🥜"},
+            headers={"Authorization": f"Bearer {customer['token']}"}
+        )
+        db_session.add(Booking(
+            client_id=customer["id"], chef_id=chef["id"], booking_date=date(2025, 12, 21), booking_time=time(9, 30, 15, 250),
+            duration_hours=1.0, location="Karen", hourly_rate=0.0, total_price=0.0, status=BookingStatus.DECLINED,
+            updated_at=datetime(2025, 12, 1, 8, 0, 0, 123456),
+        ))
+        db_session.commit()
+        
+        response = client.get("/api/bookings", headers={"Authorization": f"Bearer {customer['token']}"})
+        
+        bookings = db_session.query(Booking).order_by(Booking.id).all()
+        assert response.content == _validated_bytes(BookingResponse, bookings)
+    
+    def test_exponent_floats_fall_back(self):
+        """Test that floats json.dumps writes in exponent form keep that form"""
+        assert encode_json([{"latitude": 1e-05, "rate": 1e16}]) == b'[{"latitude":1e-05,"rate":1e+16}]'
+        assert encode_json([{"latitude": -1.2864}]) == b'[{"latitude":-1.2864}]'
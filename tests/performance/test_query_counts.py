@@ -0,0 +1,170 @@
+"""
+Tests for Query Counts
+
+Guards against N+1 queries: every endpoint must issue the same number of SQL
+statements no matter how many rows it returns or serializes.
+"""
+import pytest
+from datetime import date, time
+from app.models import User, UserRole, Chef, Client, Booking, BookingStatus
+from app.utils.auth import create_access_token, principal_cache
+from app.controllers.chef_search import chef_search_cache
+
+
+def _make_chef(db_session, email, hourly_rate=50.0):
+    user = User(email=email, password_hash="hash", name=f"Chef {email}", role=UserRole.CHEF)
+    db_session.add(user)
+    db_session.flush()
+    chef = Chef(user_id=user.id, hourly_rate=hourly_rate)
+    db_session.add(chef)
+    db_session.commit()
+    return chef.id, create_access_token({"sub": str(user.id)})
+
+
+def _make_client(db_session, email):
+    user = User(email=email, password_hash="hash", name=f"Client {email}", role=UserRole.CLIENT)
+    db_session.add(user)
+    db_session.flush()
+    client_profile = Client(user_id=user.id)
+    db_session.add(client_profile)
+    db_session.commit()
+    return client_profile.id, create_access_token({"sub": str(user.id)})
+
+
+def _make_booking(db_session, client_id, chef_id):
+    booking = Booking(
+        client_id=client_id,
+        chef_id=chef_id,
+        booking_date=date(2025, 12, 15),
+        booking_time=time(18, 0),
+        duration_hours=2.0,
+        location="Nairobi",
+        hourly_rate=50.0,
+        total_price=100.0,
+        status=BookingStatus.PENDING
+    )
+    db_session.add(booking)
+    db_session.commit()
+    return booking
+
+
+def _query_count(db_session, count_queries, request):
+    db_session.expunge_all()  # Nothing cached in the shared session can hide a lazy load.
+    chef_search_cache.clear()  # Rows added straight through the session bypass cache invalidation.
+    principal_cache.clear()  # Count the users query every time, not just on the first request.
+    with count_queries() as statements:
+        response = request()
+    assert response.status_code < 400, response.text
+    return len(statements)
+
+
+class TestListQueryCounts:
+    """Query counts of list endpoints must not grow with the number of results"""
+
+    def test_list_chefs(self, client, db_session, count_queries):
+        """
+        Test GET /api/chefs with 2 and then 6 chefs
+        Frontend: ChefSearch.jsx results grid
+        """
+        for i in range(2):
+            _make_chef(db_session, f"chef{i}@example.com")
+        small = _query_count(db_session, count_queries, lambda: client.get("/api/chefs"))
+
+        for i in range(2, 6):
+            _make_chef(db_session, f"chef{i}@example.com")
+        large = _query_count(db_session, count_queries, lambda: client.get("/api/chefs"))
+
+        assert large == small
+
+    def test_list_bookings_as_client(self, client, db_session, count_queries):
+        """
+        Test GET /api/bookings for a client who booked several different chefs
+        Frontend: ClientBookings.jsx
+        """
+        client_id, token = _make_client(db_session, "client@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for i in range(2):
+            _make_booking(db_session, client_id, _make_chef(db_session, f"chef{i}@example.com")[0])
+        small = _query_count(db_session, count_queries, lambda: client.get("/api/bookings", headers=headers))
+
+        for i in range(2, 6):
+            _make_booking(db_session, client_id, _make_chef(db_session, f"chef{i}@example.com")[0])
+        large = _query_count(db_session, count_queries, lambda: client.get("/api/bookings", headers=headers))
+
+        assert large == small
+
+    def test_list_bookings_as_chef(self, client, db_session, count_queries):
+        """
+        Test GET /api/bookings for a chef booked by several different clients
+        Frontend: ChefBookings.jsx
+        """
+        chef_id, token = _make_chef(db_session, "chef@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for i in range(2):
+            _make_booking(db_session, _make_client(db_session, f"client{i}@example.com")[0], chef_id)
+        small = _query_count(db_session, count_queries, lambda: client.get("/api/bookings", headers=headers))
+
+        for i in range(2, 6):
+            _make_booking(db_session, _make_client(db_session, f"client{i}@example.com")[0], chef_id)
+        large = _query_count(db_session, count_queries, lambda: client.get("/api/bookings", headers=headers))
+
+        assert large == small
+
+
+class TestDetailQueryCounts:
+    """Detail and write endpoints must load related users eagerly, not per attribute"""
+
+    def test_booking_write_paths(self, client, db_session, count_queries, sample_booking_data):
+        """
+        Test that creating and updating a booking cost the same with 1 or 5 existing bookings
+        """
+        chef_id, chef_token = _make_chef(db_session, "chef@example.com")
+        client_id, client_token = _make_client(db_session, "client@example.com")
+        sample_booking_data["chef_id"] = chef_id
+        days = iter(range(1, 29))
+
+        def create_and_accept():
+            sample_booking_data["booking_date"] = f"2025-12-{next(days):02d}"  # Separate days so accepting never overlaps.
+            booking_id = client.post(
+                "/api/bookings", json=sample_booking_data, headers={"Authorization": f"Bearer {client_token}"}
+            ).json()["id"]
+            return client.patch(
+                f"/api/bookings/{booking_id}", json={"status": "accepted"}, headers={"Authorization": f"Bearer {chef_token}"}
+            )
+
+        first = _query_count(db_session, count_queries, create_and_accept)
+        for _ in range(4):
+            _make_booking(db_session, client_id, chef_id)
+        later = _query_count(db_session, count_queries, create_and_accept)
+
+        assert later == first
+
+    @pytest.mark.parametrize("path", ["/api/chefs/{chef_id}", "/api/clients/{client_id}"])
+    def test_profile_reads_single_query(self, client, db_session, count_queries, path):
+        """
+        Test that a profile and its user are loaded with one SELECT
+        Frontend: ChefProfile.jsx / ClientProfile.jsx
+        """
+        chef_id, _ = _make_chef(db_session, "chef@example.com")
+        client_id, _ = _make_client(db_session, "client@example.com")
+
+        queries = _query_count(db_session, count_queries, lambda: client.get(path.format(chef_id=chef_id, client_id=client_id)))
+
+        assert queries == 1
+    
+    def test_not_modified_skips_profile_load(self, client, db_session, count_queries):
+        """
+        Test that revalidating a chef profile reads only the version counters
+        """
+        chef_id, _ = _make_chef(db_session, "chef@example.com")
+        etag = client.get(f"/api/chefs/{chef_id}").headers["ETag"]
+        
+        db_session.expunge_all()
+        with count_queries() as statements:
+            response = client.get(f"/api/chefs/{chef_id}", headers={"If-None-Match": etag})
+        
+        assert response.status_code == 304
+        assert len(statements) == 1
+        assert "bio" not in statements[0]
@@ -0,0 +1,167 @@
+"""
+Tests for Query Plans
+
+Runs each route against SQLite, captures every statement it sends and checks
+EXPLAIN QUERY PLAN for full table scans. A new filter or sort without an
+index behind it fails here instead of slowing down production.
+"""
+import re
+import pytest
+from contextlib import contextmanager
+from sqlalchemy import event
+from fastapi import status
+from app import Base
+from tests.conftest import engine
+
+# Scans of these are fine: the FTS5 table is searched through its own index.
+ALLOWED_SCANS = {"chef_search"}
+
+SCAN = re.compile(r"^SCAN (\w+)")
+
+
+@contextmanager
+def capture_statements():
+    captured = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def full_scans(captured):
+    """Return (table, statement) for every plan step that scans a whole table."""
+    tables = set(Base.metadata.tables)
+    found = []
+    with engine.connect() as connection:
+        for statement, parameters in captured:
+            if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "INSERT INTO CHEF_SEARCH")):
+                continue
+            for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters):
+                match = SCAN.match(row[3])
+                if match and match.group(1) in tables and match.group(1) not in ALLOWED_SCANS:
+                    found.append((match.group(1), statement))
+    return found
+
+
+@pytest.fixture
+def populated(client, register_user):
+    """A chef with a profile, calendar and bookings from two clients"""
+    chef = register_user("chef@example.com")
+    chef_headers = {"Authorization": f"Bearer {chef['token']}"}
+    client.put(
+        f"/api/chefs/{chef['id']}",
+        json={"cuisines": "Italian,Thai", "location": "Nairobi", "latitude": -1.2864, "longitude": 36.8172, "hourly_rate": 40.0},
+        headers=chef_headers
+    )
+    client.put(
+        f"/api/chefs/{chef['id']}/availability",
+        json={"weekly": [{"weekday": 5, "start_time": "16:00", "end_time": "23:00"}]},
+        headers=chef_headers
+    )
+    customers = [register_user(f"client{i}@example.com", role="client") for i in range(2)]
+    booking_ids = []
+    for i, customer in enumerate(customers):
+        response = client.post(
+            "/api/bookings",
+            json={"chef_id": chef["id"], "booking_date": f"2025-12-1{i}", "booking_time": "18:00", "duration_hours": 2.0, "location": "Nairobi"},
+            headers={"Authorization": f"Bearer {customer['token']}"}
+        )
+        booking_ids.append(response.json()["id"])
+    return {"chef": chef, "chef_headers": chef_headers, "customers": customers, "booking_ids": booking_ids}
+
+
+CHEF_SEARCHES = [
+    "/api/chefs",
+    "/api/chefs?sort=price&max_price=100",
+    "/api/chefs?sort=rating",
+    "/api/chefs?sort=experience",
+    "/api/chefs?sort=newest",
+    "/api/chefs?location=Nairobi",
+    "/api/chefs?cuisine=Italian,Thai&cuisine_match=all",
+    "/api/chefs?search=ital",
+    "/api/chefs?near=-1.2864,36.8172&radius_km=5",
+    "/api/chefs?available_at=2025-12-20T18:00",
+    "/api/chefs/facets?cuisine=Italian",
+]
+
+
+class TestQueryPlans:
+    """No route may fall back to a full table scan"""
+
+    @pytest.mark.parametrize("url", CHEF_SEARCHES)
+    def test_chef_search(self, client, populated, url):
+        """
+        Test each search filter and sort order
+        Frontend: ChefSearch.jsx
+        """
+        with capture_statements() as captured:
+            response = client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert full_scans(captured) == []
+
+    def test_profile_reads(self, client, populated):
+        """
+        Test chef profile, calendar and client profile reads
+        """
+        with capture_statements() as captured:
+            client.get(f"/api/chefs/{populated['chef']['id']}")
+            client.get(f"/api/chefs/{populated['chef']['id']}/availability")
+            client.get(f"/api/clients/{populated['customers'][0]['id']}")
+
+        assert full_scans(captured) == []
+
+    def test_booking_routes(self, client, populated):
+        """
+        Test listing, filtering, creating and accepting bookings
+        Frontend: ClientBookings.jsx / ChefBookings.jsx
+        """
+        customer_headers = {"Authorization": f"Bearer {populated['customers'][0]['token']}"}
+        with capture_statements() as captured:
+            client.get("/api/bookings", headers=customer_headers)
+            client.get("/api/bookings?status=pending", headers=populated["chef_headers"])
+            client.post(
+                "/api/bookings",
+                json={"chef_id": populated["chef"]["id"], "booking_date": "2025-12-20", "booking_time": "18:00", "duration_hours": 2.0, "location": "Nairobi"},
+                headers=customer_headers
+            )
+            client.patch(f"/api/bookings/{populated['booking_ids'][0]}", json={"status": "accepted"}, headers=populated["chef_headers"])
+
+        assert full_scans(captured) == []
+
+    @pytest.mark.parametrize("party", ["chef", "client"])
+    def test_booking_export_reads_in_index_order(self, client, populated, party):
+        """
+        Test that exports walk (party, start_at) in order instead of sorting every booking first
+        Frontend: ChefBookings.jsx / ClientBookings.jsx "Export"
+        """
+        headers = populated["chef_headers"] if party == "chef" else {"Authorization": f"Bearer {populated['customers'][0]['token']}"}
+        with capture_statements() as captured:
+            client.get("/api/bookings/export", headers=headers)
+            client.get("/api/bookings/export?from=2025-12-01&to=2025-12-31", headers=headers)
+
+        exports = [(statement, parameters) for statement, parameters in captured if "ORDER BY bookings.start_at" in statement]
+        assert len(exports) == 2 and full_scans(captured) == []
+        with engine.connect() as connection:
+            for statement, parameters in exports:
+                plan = [row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+                assert any(f"ix_bookings_{party}_start" in step for step in plan), plan
+                assert not any("TEMP B-TREE" in step for step in plan), plan
+
+    def test_auth_routes(self, client):
+        """
+        Test registering and logging in
+        Frontend: Register.jsx / Login.jsx
+        """
+        user = {"email": "chef@example.com", "password": "SecurePass123!", "name": "Chef", "role": "chef"}
+        with capture_statements() as captured:
+            client.post("/api/auth/register", json=user)
+            client.post("/api/auth/login", json={"email": user["email"], "password": user["password"]})
+
+        assert full_scans(captured) == []
@@ -0,0 +1,197 @@
+"""
+Tests for Rate Limiting
+
+Corresponds to frontend: Login.jsx and Register.jsx show the 429 message
+Each client gets a token bucket per route rule: small for login and
+register, larger for search, and a default for the rest. Buckets refill over
+time, and a SQLite store shares them between worker processes.
+"""
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from app.middleware.rate_limit import MemoryStore, RateLimitMiddleware, SQLiteStore, build_store, parse_rate, rate_limit_stats
+from app.utils.auth import create_access_token
+
+
+def _app(store, default="5/minute", routes=None, proxy_hops=0):
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, store=store, default=default, routes=routes or {"POST /login": "2/minute"}, exempt_paths=["/health"], proxy_hops=proxy_hops)
+
+    @app.post("/login")
+    def login():
+        return {"token": "ok"}
+
+    @app.get("/chefs")
+    def chefs():
+        return []
+
+    @app.get("/health")
+    def health():
+        return {"status": "healthy"}
+
+    return app
+
+
+class TestRateLimitMiddleware:
+    """Tests for per-client, per-route budgets"""
+
+    def test_login_budget_exhausted(self):
+        """
+        Test that a client hammering login is cut off before the route runs
+        Frontend: Login.jsx shows "Too many requests"
+        """
+        client = TestClient(_app(MemoryStore()))
+        limited_before = rate_limit_stats.limited
+
+        assert [client.post("/login").status_code for _ in range(3)] == [200, 200, 429]
+        response = client.post("/login")
+        assert response.headers["Retry-After"] == "30"  # 2/minute refills one token every 30 s.
+        assert rate_limit_stats.limited - limited_before == 2
+
+    def test_routes_have_separate_budgets(self):
+        client = TestClient(_app(MemoryStore()))
+        for _ in range(2):
+            client.post("/login")
+
+        assert client.post("/login").status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert client.get("/chefs").status_code == status.HTTP_200_OK
+
+    def test_users_have_separate_budgets(self, monkeypatch):
+        from app.utils.cache import LRUCache
+        cache = LRUCache(maxsize=10, ttl_seconds=60)
+        monkeypatch.setattr("app.middleware.rate_limit.principal_cache", cache)
+        first, second = create_access_token({'sub': '1'}), create_access_token({'sub': '2'})
+        cache.set(first, {"id": 1})  # As get_current_user leaves them once verified.
+        cache.set(second, {"id": 2})
+        client = TestClient(_app(MemoryStore(), default="1/minute"))
+
+        assert client.get("/chefs", headers={"Authorization": f"Bearer {first}"}).status_code == status.HTTP_200_OK
+        assert client.get("/chefs", headers={"Authorization": f"Bearer {first}"}).status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert client.get("/chefs", headers={"Authorization": f"Bearer {second}"}).status_code == status.HTTP_200_OK
+        assert client.get("/chefs", headers={"Authorization": "Bearer forged"}).status_code == status.HTTP_200_OK  # Anonymous: the address's budget.
+        assert client.get("/chefs", headers={"Authorization": "Bearer forged-again"}).status_code == status.HTTP_429_TOO_MANY_REQUESTS  # New junk tokens open no new buckets.
+        assert cache.stats()["hits"] == 0  # Peeks leave the auth path's hit rate alone.
+
+    def test_token_verified_once(self, client, register_user, monkeypatch):
+        """
+        Test that the limiter reuses the principal get_current_user cached instead of checking the signature again
+        """
+        from jose import jwt
+        from app.middleware.rate_limit import client_identity
+        token = register_user("chef@example.com")["token"]
+        decode = jwt.decode
+        decoded = []
+        monkeypatch.setattr(jwt, "decode", lambda *args, **kwargs: decoded.append(args[0]) or decode(*args, **kwargs))
+
+        for _ in range(3):
+            assert client.get("/api/bookings", headers={"Authorization": f"Bearer {token}"}).status_code == status.HTTP_200_OK
+
+        assert decoded == [token]
+        assert client_identity({"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())], "client": ("1.2.3.4", 1)}).startswith("user:")
+
+    def test_bucket_refills(self):
+        now = [0.0]
+        client = TestClient(_app(MemoryStore(clock=lambda: now[0])))
+        for _ in range(2):
+            client.post("/login")
+        assert client.post("/login").status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+        now[0] += 30
+        assert client.post("/login").status_code == status.HTTP_200_OK
+
+    def test_exempt_paths_never_limited(self):
+        client = TestClient(_app(MemoryStore(), default="1/minute"))
+        assert all(client.get("/health").status_code == status.HTTP_200_OK for _ in range(5))
+
+    def test_api_login_limited(self, client, sample_user_data):
+        login_data = {"email": sample_user_data["email"], "password": "WrongPassword!"}
+        codes = [client.post("/api/auth/login", json=login_data).status_code for _ in range(11)]
+
+        assert codes[:10] == [status.HTTP_401_UNAUTHORIZED] * 10
+        assert codes[10] == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+class TestStores:
+    """Tests for where buckets live"""
+
+    def test_sqlite_store_shared_between_workers(self, tmp_path):
+        path = str(tmp_path / "ratelimit.db")
+        first_worker, second_worker = TestClient(_app(SQLiteStore(path))), TestClient(_app(SQLiteStore(path)))
+
+        assert first_worker.post("/login").status_code == status.HTTP_200_OK
+        assert second_worker.post("/login").status_code == status.HTTP_200_OK
+        assert first_worker.post("/login").status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_store_failure_lets_requests_through(self, caplog, monkeypatch):
+        """Test that a locked or broken store is logged and skipped, not a 500"""
+        import sqlite3
+        from app.middleware.rate_limit import logger
+        monkeypatch.setattr(logger, "disabled", False)  # Alembic's fileConfig in the migration tests disables existing loggers.
+
+        class BrokenStore:
+            async def take(self, key, capacity, refill_per_second):
+                raise sqlite3.OperationalError("database is locked")
+
+        client = TestClient(_app(BrokenStore()))
+        errors_before = rate_limit_stats.store_errors
+
+        assert [client.post("/login").status_code for _ in range(3)] == [200, 200, 200]
+        assert rate_limit_stats.store_errors - errors_before == 3
+        assert "Rate limit store failed" in caplog.text
+
+    def test_sqlite_store_runs_off_the_event_loop(self, tmp_path):
+        import asyncio
+        import threading
+        store = SQLiteStore(str(tmp_path / "ratelimit.db"))
+        threads = []
+        take = store._take
+        store._take = lambda *args: threads.append(threading.get_ident()) or take(*args)
+
+        assert asyncio.run(store.take("bucket", 1, 1)) == 0.0
+        assert threads and threads[0] != threading.get_ident()
+
+    def test_shared_store_by_default(self, tmp_path, monkeypatch):
+        """Test that without RATE_LIMIT_STORE, workers on a host share their budgets"""
+        from config.settings import Settings
+        monkeypatch.chdir(tmp_path)
+
+        assert isinstance(build_store(Settings.model_fields["RATE_LIMIT_STORE"].default), SQLiteStore)
+        assert (tmp_path / "ratelimit.db").exists()
+
+    @pytest.mark.parametrize("rate", ["10/fortnight", "0/minute", "-5/minute", "ten/minute", "nan/minute", "inf/minute"])
+    def test_invalid_rates_rejected(self, rate):
+        with pytest.raises(ValueError):
+            parse_rate(rate)
+
+    def test_parse_rate(self):
+        assert parse_rate("10/minute") == (10.0, 10 / 60)
+
+
+class TestProxies:
+    """Tests for telling anonymous clients apart behind a proxy"""
+
+    def test_clients_behind_proxy_have_separate_budgets(self):
+        client = TestClient(_app(MemoryStore(), default="1/minute", proxy_hops=1))
+
+        assert client.get("/chefs", headers={"X-Forwarded-For": "203.0.113.1"}).status_code == status.HTTP_200_OK
+        assert client.get("/chefs", headers={"X-Forwarded-For": "203.0.113.1"}).status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert client.get("/chefs", headers={"X-Forwarded-For": "203.0.113.2"}).status_code == status.HTTP_200_OK
+
+    def test_client_written_entries_ignored(self):
+        """
+        Test that a client prepending its own X-Forwarded-For entries can't open new buckets
+        """
+        client = TestClient(_app(MemoryStore(), default="1/minute", proxy_hops=1))
+
+        assert client.get("/chefs", headers={"X-Forwarded-For": "10.0.0.1, 203.0.113.1"}).status_code == status.HTTP_200_OK
+        assert client.get("/chefs", headers={"X-Forwarded-For": "10.0.0.2, 203.0.113.1"}).status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_header_ignored_without_proxies(self):
+        client = TestClient(_app(MemoryStore(), default="1/minute"))
+
+        assert client.get("/chefs", headers={"X-Forwarded-For": "203.0.113.1"}).status_code == status.HTTP_200_OK
+        assert client.get("/chefs", headers={"X-Forwarded-For": "203.0.113.2"}).status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+# TODO: Add tests for:
+# - A Redis-backed store through RATE_LIMIT_STORE=<module>:<factory>
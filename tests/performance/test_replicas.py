@@ -0,0 +1,124 @@
+"""
+Tests for Replica Read Routing
+
+Two SQLite files stand in for the primary and a replica. The copies differ
+on purpose (the chef's name), so each response shows which database
+answered it. GETs read the replica, writes and everything around them use
+the primary, and a client that just wrote keeps reading the primary for
+REPLICA_STICKY_SECONDS.
+"""
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app import Base, create_app
+from app.db_routing import RecentWriters, RoutingSession
+from app.models.chef import Chef
+from app.models.user import User, UserRole
+from app.utils.auth import create_access_token
+
+
+def _seed(engine, name, version=1):
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user = User(email="chef@example.com", password_hash="hash", name=name, role=UserRole.CHEF)
+    db.add(user)
+    db.flush()
+    db.add(Chef(user_id=user.id, hourly_rate=30.0, version=version))
+    db.commit()
+    db.close()
+
+
+@pytest.fixture
+def databases(tmp_path, monkeypatch):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}", connect_args={"check_same_thread": False})
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}", connect_args={"check_same_thread": False})
+    _seed(primary, "Primary Chef")
+    _seed(replica, "Replica Chef", version=7)  # A lagging replica: writes checked against it would look stale.
+    now = [0.0]
+
+    monkeypatch.setattr("app.SessionLocal", sessionmaker(class_=RoutingSession, autoflush=False, bind=primary))
+    monkeypatch.setattr("app.local_readers", [])
+    monkeypatch.setattr("app.replica_engines", [replica])
+    monkeypatch.setattr("app.recent_writers", RecentWriters(5.0, clock=lambda: now[0]))
+
+    from app.controllers.chef_search import chef_search_cache
+    from app.utils.auth import principal_cache
+    chef_search_cache.clear()
+    principal_cache.clear()
+    with TestClient(create_app()) as client:
+        yield {"client": client, "primary": primary, "replica": replica, "now": now}
+
+
+def _chef(databases, **headers):
+    return databases["client"].get("/api/chefs/1", headers=headers).json()
+
+
+class TestReplicaRouting:
+    """Tests for GET routes on replicas and writes on the primary"""
+
+    def test_get_reads_replica(self, databases):
+        assert _chef(databases)["name"] == "Replica Chef"
+
+    def test_write_uses_primary_throughout(self, databases):
+        """
+        Test that a profile update reads and writes the primary only
+        Frontend: ChefProfile.jsx edit
+        """
+        token = create_access_token({"sub": "1"})
+
+        response = databases["client"].put("/api/chefs/1", json={"hourly_rate": 55.0}, headers={"Authorization": f"Bearer {token}"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["name"] == "Primary Chef"
+        with databases["replica"].connect() as connection:
+            assert connection.exec_driver_sql("SELECT hourly_rate FROM chefs").scalar() == 30.0
+
+    def test_writer_reads_own_writes_within_window(self, databases):
+        """
+        Test that the chef sees their own update right after saving it
+        Frontend: ChefProfile.jsx save, then reload
+        """
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+        databases["client"].put("/api/chefs/1", json={"hourly_rate": 55.0}, headers=headers)
+
+        assert _chef(databases, **headers)["hourly_rate"] == 55.0
+
+        databases["now"][0] += 6.0
+        assert _chef(databases, **headers)["name"] == "Replica Chef"
+
+    def test_failed_request_does_not_stick(self, databases):
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': '2'})}"}
+
+        response = databases["client"].put("/api/chefs/1", json={"hourly_rate": 55.0}, headers=headers)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert _chef(databases, **headers)["name"] == "Replica Chef"
+
+
+class TestRecentWriters:
+    """Tests for the read-your-writes window"""
+
+    def test_window_expires(self):
+        now = [0.0]
+        writers = RecentWriters(5.0, clock=lambda: now[0])
+        writers.record(["user:1"])
+
+        assert writers.wrote_recently(["user:1"]) and not writers.wrote_recently(["user:2"])
+        now[0] = 5.5
+        assert not writers.wrote_recently(["user:1"])
+
+    def test_expired_entries_pruned_when_full(self):
+        now = [0.0]
+        writers = RecentWriters(5.0, maxsize=2, clock=lambda: now[0])
+        writers.record(["user:1", "user:2"])
+        now[0] = 10.0
+        writers.record(["user:3"])
+
+        assert len(writers._written_at) == 1
+
+
+# TODO: Add tests for:
+# - Several replicas behind PostgreSQL streaming replication
+# - Replica routing in async mode (DATABASE_ASYNC)
@@ -0,0 +1,141 @@
+"""
+Tests for the SQLite Production Profile
+
+With SQLITE_OPTIMIZED, a SQLite file runs in WAL mode with tuned pragmas,
+writes go through one writer connection and reads through a reader pool, so
+concurrent bookings and searches no longer fail with "database is locked".
+"""
+import threading
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.orm import sessionmaker
+from app import Base
+from app.db_pool import build_engines
+from app.db_routing import RoutingSession
+from app.models.chef import Chef
+from app.models.user import User, UserRole
+from config.settings import settings
+
+
+@pytest.fixture
+def engines(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SQLITE_OPTIMIZED", True)
+    engine, read_engine = build_engines(f"sqlite:///{tmp_path / 'chefs.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine, read_engine
+    engine.dispose()
+    read_engine.dispose()
+
+
+@pytest.fixture
+def sessions(engines):
+    engine, read_engine = engines
+    return sessionmaker(class_=RoutingSession, autoflush=False, bind=engine, readers=[read_engine])
+
+
+def _add_chef(db, i):
+    user = User(email=f"chef{i}@example.com", password_hash="hash", name=f"Chef {i}", role=UserRole.CHEF)
+    db.add(user)
+    db.flush()
+    db.add(Chef(user_id=user.id, hourly_rate=30.0))
+    db.commit()
+
+
+class TestPragmas:
+    """Tests for the per-connection SQLite settings"""
+
+    @pytest.mark.parametrize("which", [0, 1])
+    def test_applied_on_writer_and_readers(self, engines, which):
+        with engines[which].connect() as connection:
+            pragma = lambda name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+            assert pragma("journal_mode") == "wal"
+            assert pragma("synchronous") == 1  # NORMAL
+            assert pragma("busy_timeout") == settings.SQLITE_BUSY_TIMEOUT_MS
+            assert pragma("cache_size") == -settings.SQLITE_CACHE_SIZE_KB
+
+    def test_single_writer_connection(self, engines):
+        assert engines[0].pool.size() == 1 and engines[0].pool._max_overflow == 0
+
+    def test_in_memory_database_not_split(self, monkeypatch):
+        monkeypatch.setattr(settings, "SQLITE_OPTIMIZED", True)
+        engine, read_engine = build_engines("sqlite:///:memory:")
+
+        assert read_engine is engine
+
+
+class TestRoutingSession:
+    """Tests for sending reads to readers and writes to the writer"""
+
+    def test_reads_use_reader_and_flushes_use_writer(self, engines, sessions):
+        engine, read_engine = engines
+        db = sessions()
+
+        assert db.get_bind(clause=select(User)) is read_engine
+        assert db.get_bind(clause=update(Chef).values(rating=5)) is engine
+        assert db.get_bind(clause=select(Chef).with_for_update()) is engine
+        db.close()
+
+    def test_transaction_stays_on_writer_after_first_write(self, engines, sessions):
+        engine, read_engine = engines
+        db = sessions()
+        _add_chef(db, 0)
+
+        db.execute(update(Chef).values(rating=4.5))
+        assert db.get_bind(clause=select(Chef)) is engine  # Must see its own uncommitted update.
+        assert db.execute(select(Chef.rating)).scalar() == 4.5
+
+        db.commit()
+        assert db.get_bind(clause=select(Chef)) is read_engine
+        db.close()
+
+    def test_reader_sees_committed_writes(self, sessions):
+        writer_session, reader_session = sessions(), sessions()
+        _add_chef(writer_session, 0)
+
+        assert reader_session.query(Chef).count() == 1
+        writer_session.close()
+        reader_session.close()
+
+
+class TestConcurrency:
+    """Tests for concurrent writers and readers on one database file"""
+
+    def test_no_lock_errors_under_mixed_load(self, sessions):
+        errors = []
+
+        def write(worker):
+            db = sessions()
+            try:
+                for i in range(20):
+                    _add_chef(db, f"{worker}-{i}")
+            except Exception as error:
+                errors.append(error)
+            finally:
+                db.close()
+
+        def read():
+            db = sessions()
+            try:
+                for _ in range(50):
+                    db.execute(text("SELECT count(*) FROM chefs")).all()
+                    db.query(Chef).filter(Chef.hourly_rate <= 50).all()
+            except Exception as error:
+                errors.append(error)
+            finally:
+                db.close()
+
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)] + [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        db = sessions()
+        assert db.query(Chef).count() == 80
+        db.close()
+
+
+# TODO: Add tests for:
+# - Checkpointing the WAL under sustained writes
+# - Async mode with the SQLite profile
@@ -146,6 +146,98 @@ class TestChefProfileEdit:
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
+
+class TestChefAvailabilityCalendar:
+    """Tests for weekly windows and exceptions: GET/PUT /api/chefs/:id/availability"""
+    
+    def test_replace_and_read_calendar(self, client, register_user):
+        """
+        Test saving a week plus a day off and reading it back
+        Frontend: Availability editor on ChefProfile.jsx
+        """
+        chef = register_user("chef@example.com")
+        calendar = {
+            "weekly": [{"weekday": 5, "start_time": "16:00:00", "end_time": "23:00:00"}],
+            "exceptions": [{"date": "2025-12-20", "is_available": False, "start_time": None, "end_time": None}],
+        }
+        
+        response = client.put(f"/api/chefs/{chef['id']}/availability", json=calendar, headers={"Authorization": f"Bearer {chef['token']}"})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert client.get(f"/api/chefs/{chef['id']}/availability").json() == calendar
+    
+    def test_window_must_end_after_start(self, client, register_user):
+        """
+        Test rejecting an inverted window
+        """
+        chef = register_user("chef@example.com")
+        
+        response = client.put(
+            f"/api/chefs/{chef['id']}/availability",
+            json={"weekly": [{"weekday": 5, "start_time": "23:00", "end_time": "16:00"}]},
+            headers={"Authorization": f"Bearer {chef['token']}"}
+        )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_update_other_chef_calendar_forbidden(self, client, register_user):
+        """
+        Test that chefs can only edit their own calendar
+        """
+        chef = register_user("chef@example.com")
+        other = register_user("other@example.com")
+        
+        response = client.put(f"/api/chefs/{chef['id']}/availability", json={"weekly": []}, headers={"Authorization": f"Bearer {other['token']}"})
+        
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+class TestChefProfileCaching:
+    """Tests for ETag / If-None-Match on GET /api/chefs/:id"""
+    
+    def test_unchanged_profile_returns_304(self, client, register_user):
+        """
+        Test revalidating a cached profile
+        Frontend: ChefProfile.jsx refetching on focus
+        """
+        chef = register_user("chef@example.com")
+        first = client.get(f"/api/chefs/{chef['id']}")
+        
+        response = client.get(f"/api/chefs/{chef['id']}", headers={"If-None-Match": first.headers["ETag"]})
+        
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == first.headers["ETag"]
+        assert first.headers["Cache-Control"].startswith("public")
+    
+    def test_update_changes_etag(self, client, register_user):
+        """
+        Test that an edit invalidates cached copies
+        """
+        chef = register_user("chef@example.com")
+        etag = client.get(f"/api/chefs/{chef['id']}").headers["ETag"]
+        
+        update = client.put(f"/api/chefs/{chef['id']}", json={"bio": "New bio"}, headers={"Authorization": f"Bearer {chef['token']}"})
+        response = client.get(f"/api/chefs/{chef['id']}", headers={"If-None-Match": etag})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["bio"] == "New bio"
+        assert response.headers["ETag"] == update.headers["ETag"] != etag
+    
+    def test_user_rename_changes_etag(self, client, register_user, db_session):
+        """
+        Test that the chef's name, which lives on the user row, is part of the ETag
+        """
+        from app.models import User
+        chef = register_user("chef@example.com")
+        etag = client.get(f"/api/chefs/{chef['id']}").headers["ETag"]
+        
+        db_session.get(User, chef["user_id"]).name = "Renamed Chef"
+        db_session.commit()
+        response = client.get(f"/api/chefs/{chef['id']}", headers={"If-None-Match": etag})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["name"] == "Renamed Chef"
+
 # TODO: Add tests for:
 # - Profile photo upload
 # - Updating cuisines list
@@ -121,8 +121,40 @@ class TestClientProfileEdit:
         get_response = client.get(f"/api/clients/{client_id}")
         assert get_response.json()["email"] == sample_user_data["email"]
 
+    
+    def test_update_preferred_cuisines(self, client, register_user, db_session):
+        """
+        Test that preferred cuisines are stored as shared tags
+        Frontend: Favourite cuisines multi-select
+        """
+        from app.models import Client
+        
+        client_user = register_user("client@example.com", role="client")
+        
+        response = client.put(
+            f"/api/clients/{client_user['id']}",
+            json={"preferred_cuisines": "Thai, thai ,Indian"},
+            headers={"Authorization": f"Bearer {client_user['token']}"}
+        )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["preferred_cuisines"] == ["Thai", "Indian"]
+        profile = db_session.query(Client).filter(Client.id == client_user["id"]).first()
+        assert [cuisine.slug for cuisine in profile.cuisine_tags] == ["thai", "indian"]
+
+    
+    def test_profile_revalidates_privately(self, client, register_user):
+        """
+        Test that client profiles get an ETag but stay out of shared caches
+        """
+        client_user = register_user("client@example.com", role="client")
+        first = client.get(f"/api/clients/{client_user['id']}")
+        
+        response = client.get(f"/api/clients/{client_user['id']}", headers={"If-None-Match": first.headers["ETag"]})
+        
+        assert first.headers["Cache-Control"] == "private, no-cache"
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
 
 # TODO: Add tests for:
-# - Preferred cuisines update
 # - Total bookings counter
 # - Profile completion status
@@ -200,7 +200,547 @@ class TestChefSearch:
         assert len(response.json()) == 0
 
 
+
+class TestChefPagination:
+    """Tests for cursor pagination and sorting: GET /api/chefs?sort=&limit=&cursor="""
+    
+    def _create_chefs(self, client, register_user, rates):
+        for i, rate in enumerate(rates):
+            chef = register_user(f"chef{i}@example.com")
+            client.put(
+                f"/api/chefs/{chef['id']}",
+                json={"hourly_rate": rate, "years_of_experience": i},
+                headers={"Authorization": f"Bearer {chef['token']}"}
+            )
+    
+    def test_pages_cover_all_chefs_once(self, client, register_user):
+        """
+        Test walking every page with next cursors
+        Frontend: "Load more" button on ChefSearch.jsx
+        """
+        self._create_chefs(client, register_user, [40.0, 10.0, 40.0, 25.0, 60.0])
+        
+        seen, cursor = [], None
+        while True:
+            params = {"sort": "price", "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/api/chefs", params=params)
+            assert response.status_code == status.HTTP_200_OK
+            seen.extend(response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        
+        assert [chef["hourly_rate"] for chef in seen] == [10.0, 25.0, 40.0, 40.0, 60.0]
+        assert len({chef["id"] for chef in seen}) == 5
+    
+    def test_last_page_has_no_cursor(self, client, register_user):
+        """
+        Test that a page holding the remaining chefs returns no next cursor
+        Frontend: Hides "Load more" button
+        """
+        self._create_chefs(client, register_user, [10.0, 20.0])
+        
+        response = client.get("/api/chefs?limit=2")
+        
+        assert len(response.json()) == 2
+        assert "X-Next-Cursor" not in response.headers
+    
+    def test_sort_by_experience(self, client, register_user):
+        """
+        Test sorting by years of experience, most experienced first
+        Frontend: Sort dropdown
+        """
+        self._create_chefs(client, register_user, [10.0, 20.0, 30.0])
+        
+        response = client.get("/api/chefs?sort=experience")
+        
+        assert [chef["years_of_experience"] for chef in response.json()] == [2, 1, 0]
+    
+    def test_cursor_from_other_sort_rejected(self, client, register_user):
+        """
+        Test that a cursor only works with the sort it was issued for
+        Frontend: Sort change resets pagination
+        """
+        self._create_chefs(client, register_user, [10.0, 20.0])
+        cursor = client.get("/api/chefs?sort=price&limit=1").headers["X-Next-Cursor"]
+        
+        response = client.get(f"/api/chefs?sort=rating&cursor={cursor}")
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    @pytest.mark.parametrize("values", [["price", [1], 1], ["price", {}, 1], ["price", 10.0, "1"], ["price", 10.0, True]])
+    def test_crafted_cursor_rejected(self, client, register_user, values):
+        """
+        Test that a cursor with non-scalar or mistyped keys is a 400, not a database error
+        """
+        import base64
+        import json
+        self._create_chefs(client, register_user, [10.0, 20.0])
+        cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+        
+        response = client.get(f"/api/chefs?sort=price&cursor={cursor}")
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_limit_capped_by_settings(self, client):
+        """
+        Test that page size cannot exceed MAX_ITEMS_PER_PAGE
+        """
+        response = client.get("/api/chefs?limit=100000")
+        
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+
+class TestCuisineFilter:
+    """Tests for tag-based cuisine filtering: GET /api/chefs?cuisine=&cuisine_match="""
+    
+    def _create_chef(self, client, register_user, email, cuisines):
+        chef = register_user(email)
+        client.put(
+            f"/api/chefs/{chef['id']}",
+            json={"cuisines": cuisines},
+            headers={"Authorization": f"Bearer {chef['token']}"}
+        )
+        return chef["id"]
+    
+    def test_cuisine_matches_whole_tags_only(self, client, register_user):
+        """
+        Test that "Asian" does not match a "Caucasian" chef
+        Frontend: Cuisine dropdown filter
+        """
+        asian = self._create_chef(client, register_user, "asian@example.com", "Asian,Thai")
+        self._create_chef(client, register_user, "caucasian@example.com", "Caucasian")
+        
+        response = client.get("/api/chefs?cuisine=asian")
+        
+        assert [chef["id"] for chef in response.json()] == [asian]
+    
+    def test_match_any_or_all_cuisines(self, client, register_user):
+        """
+        Test combining several cuisines with OR and AND semantics
+        Frontend: Multi-select cuisine filter
+        """
+        both = self._create_chef(client, register_user, "both@example.com", "Italian,French")
+        italian = self._create_chef(client, register_user, "italian@example.com", "Italian")
+        self._create_chef(client, register_user, "japanese@example.com", "Japanese")
+        
+        any_response = client.get("/api/chefs?cuisine=Italian,French")
+        all_response = client.get("/api/chefs?cuisine=Italian,French&cuisine_match=all")
+        
+        assert {chef["id"] for chef in any_response.json()} == {both, italian}
+        assert [chef["id"] for chef in all_response.json()] == [both]
+    
+    def test_cuisines_keep_list_shape(self, client, register_user):
+        """
+        Test that tags are returned as a clean list in canonical spelling
+        Frontend: ChefProfile.jsx renders cuisines as badges
+        """
+        self._create_chef(client, register_user, "first@example.com", "Italian")
+        chef_id = self._create_chef(client, register_user, "second@example.com", " italian , Greek,GREEK")
+        
+        response = client.get(f"/api/chefs/{chef_id}")
+        
+        assert response.json()["cuisines"] == ["Italian", "Greek"]
+    
+    def test_concurrently_created_cuisine_is_shared(self, client, register_user):
+        """
+        Test that a tag created by another request between lookup and insert is reused, not a 500
+        """
+        from sqlalchemy import event
+        from tests.conftest import engine
+        
+        raced = []
+        
+        def _insert_first(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("INSERT INTO cuisines") and not raced:
+                raced.append(statement)
+                cursor.connection.execute("INSERT INTO cuisines (name, slug) VALUES ('Ethiopian', 'ethiopian')")  # The other request wins the race.
+        
+        event.listen(engine, "before_cursor_execute", _insert_first)
+        try:
+            chef_id = self._create_chef(client, register_user, "ethiopian@example.com", "ethiopian")
+        finally:
+            event.remove(engine, "before_cursor_execute", _insert_first)
+        
+        assert raced
+        assert client.get(f"/api/chefs/{chef_id}").json()["cuisines"] == ["Ethiopian"]
+        assert [chef["id"] for chef in client.get("/api/chefs?cuisine=Ethiopian").json()] == [chef_id]
+    
+    def test_unknown_cuisine_returns_empty(self, client, register_user):
+        """
+        Test filtering by a cuisine no chef has
+        Frontend: Shows "No chefs found" message
+        """
+        self._create_chef(client, register_user, "italian@example.com", "Italian")
+        
+        response = client.get("/api/chefs?cuisine=Italian,Ethiopian&cuisine_match=all")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == []
+
+
+
+class TestFullTextSearch:
+    """Tests for ranked full-text search: GET /api/chefs?search="""
+    
+    def test_search_matches_bio_and_specialties(self, client, register_user):
+        """
+        Test that search looks beyond the chef's name
+        Frontend: Search bar input
+        """
+        chef = register_user("pasta@example.com", name="Maria Rossi")
+        client.put(
+            f"/api/chefs/{chef['id']}",
+            json={"bio": "Trained in Bologna", "specialties": "Handmade tagliatelle"},
+            headers={"Authorization": f"Bearer {chef['token']}"}
+        )
+        register_user("other@example.com", name="John Smith")
+        
+        response = client.get("/api/chefs?search=tagliatelle")
+        
+        assert [found["id"] for found in response.json()] == [chef["id"]]
+    
+    def test_search_matches_word_prefixes(self, client, register_user):
+        """
+        Test that partially typed words already match
+        Frontend: Search-as-you-type
+        """
+        register_user("gordon@example.com", name="Gordon Ramsay")
+        
+        response = client.get("/api/chefs?search=gord ram")
+        
+        assert len(response.json()) == 1
+    
+    def test_name_matches_rank_above_bio_matches(self, client, register_user):
+        """
+        Test relevance ordering: a name hit outranks a passing mention in a bio
+        Frontend: Best matches shown first
+        """
+        fan = register_user("fan@example.com", name="Alex Cook")
+        client.put(
+            f"/api/chefs/{fan['id']}",
+            json={"bio": "Learned knife skills watching Gordon on TV"},
+            headers={"Authorization": f"Bearer {fan['token']}"}
+        )
+        gordon = register_user("gordon@example.com", name="Gordon Ramsay")
+        
+        response = client.get("/api/chefs?search=gordon")
+        
+        assert [found["id"] for found in response.json()] == [gordon["id"], fan["id"]]
+    
+    def test_index_follows_profile_updates(self, client, register_user):
+        """
+        Test that edited profiles are re-indexed immediately
+        Frontend: ChefProfile.jsx edit, then search
+        """
+        chef = register_user("chef@example.com", name="Sam Lee")
+        headers = {"Authorization": f"Bearer {chef['token']}"}
+        client.put(f"/api/chefs/{chef['id']}", json={"specialties": "Sushi"}, headers=headers)
+        client.put(f"/api/chefs/{chef['id']}", json={"specialties": "Ramen"}, headers=headers)
+        
+        assert client.get("/api/chefs?search=sushi").json() == []
+        assert len(client.get("/api/chefs?search=ramen").json()) == 1
+    
+    def test_index_follows_user_rename(self, client, register_user, db_session):
+        """
+        Test that renaming the chef's user account updates the index
+        """
+        from app.models import User
+        
+        chef = register_user("chef@example.com", name="Old Name")
+        user = db_session.query(User).filter(User.id == chef["user_id"]).first()
+        user.name = "Nigella Lawson"
+        db_session.commit()
+        
+        assert client.get("/api/chefs?search=old").json() == []
+        assert len(client.get("/api/chefs?search=nigella").json()) == 1
+
+
+
+class TestRadiusSearch:
+    """Tests for location radius search: GET /api/chefs?near=lat,lng&radius_km="""
+    
+    NAIROBI_CBD = "-1.2864,36.8172"
+    
+    def _create_chef(self, client, register_user, email, latitude, longitude):
+        chef = register_user(email)
+        client.put(
+            f"/api/chefs/{chef['id']}",
+            json={"latitude": latitude, "longitude": longitude},
+            headers={"Authorization": f"Bearer {chef['token']}"}
+        )
+        return chef["id"]
+    
+    def test_radius_filters_and_orders_by_distance(self, client, register_user):
+        """
+        Test that only chefs inside the radius are returned, nearest first
+        Frontend: "Chefs near me" map view
+        """
+        westlands = self._create_chef(client, register_user, "westlands@example.com", -1.2676, 36.8108)  # ~2 km
+        cbd = self._create_chef(client, register_user, "cbd@example.com", -1.2870, 36.8180)  # ~0.1 km
+        karen = self._create_chef(client, register_user, "karen@example.com", -1.3197, 36.7076)  # ~13 km
+        self._create_chef(client, register_user, "mombasa@example.com", -4.0435, 39.6682)  # ~440 km
+        
+        near = client.get(f"/api/chefs?near={self.NAIROBI_CBD}&radius_km=5")
+        wider = client.get(f"/api/chefs?near={self.NAIROBI_CBD}&radius_km=20")
+        
+        assert [chef["id"] for chef in near.json()] == [cbd, westlands]
+        assert [chef["id"] for chef in wider.json()] == [cbd, westlands, karen]
+    
+    def test_chefs_without_coordinates_excluded(self, client, register_user):
+        """
+        Test that chefs who never set a location don't show up in radius search
+        """
+        register_user("nowhere@example.com")
+        
+        response = client.get(f"/api/chefs?near={self.NAIROBI_CBD}")
+        
+        assert response.json() == []
+    
+    def test_distance_pages_with_cursor(self, client, register_user):
+        """
+        Test paging through distance-sorted results
+        Frontend: "Load more" under the map
+        """
+        for i in range(3):
+            self._create_chef(client, register_user, f"chef{i}@example.com", -1.2864 + i * 0.01, 36.8172)
+        
+        first = client.get(f"/api/chefs?near={self.NAIROBI_CBD}&limit=2")
+        second = client.get(f"/api/chefs?near={self.NAIROBI_CBD}&limit=2&cursor={first.headers['X-Next-Cursor']}")
+        
+        assert len(first.json()) == 2
+        assert len(second.json()) == 1
+        assert second.json()[0]["latitude"] == -1.2864 + 2 * 0.01
+    
+    def test_cell_ranges_hold_under_linguistic_collation(self):
+        """
+        Test that cell ranges match under a collation like PostgreSQL's en_US.UTF-8, not only SQLite's byte order
+        """
+        from sqlalchemy import Column, MetaData, String, Table, create_engine, event, insert, select
+        from app.utils.geo import covering_cells, encode_geohash, geohash_cells_filter, next_cell
+        engine = create_engine("sqlite://")
+        
+        def _compare(a, b):
+            a, b = ([(char.isalnum(), char) for char in text] for text in (a, b))  # Punctuation sorts before digits and letters.
+            return (a > b) - (a < b)
+        
+        @event.listens_for(engine, "connect")
+        def _linguistic(dbapi_connection, connection_record):
+            dbapi_connection.create_collation("linguistic", _compare)
+        
+        places = Table("places", MetaData(), Column("geohash", String(12, collation="linguistic")))
+        places.create(engine)
+        cbd = encode_geohash(-1.2870, 36.8180)
+        with engine.begin() as connection:
+            connection.execute(insert(places), [{"geohash": cbd}])
+            found = connection.execute(select(places.c.geohash).where(geohash_cells_filter(places.c.geohash, covering_cells(-1.2864, 36.8172, 5)))).scalars().all()
+        
+        assert found == [cbd]
+        assert (next_cell("kzf0"), next_cell("kz9"), next_cell("kzz"), next_cell("zz")) == ("kzf1", "kzb", "m", None)
+    
+    def test_invalid_near_rejected(self, client):
+        """
+        Test malformed coordinates
+        """
+        response = client.get("/api/chefs?near=somewhere")
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+
+class TestRecommendedSort:
+    """Tests for the precomputed "recommended" ordering: GET /api/chefs?sort=recommended"""
+    
+    def _update(self, client, chef, **fields):
+        client.put(f"/api/chefs/{chef['id']}", json=fields, headers={"Authorization": f"Bearer {chef['token']}"})
+    
+    def test_recommended_is_default_order(self, client, register_user):
+        """
+        Test that experienced chefs rank first when no sort is given
+        Frontend: Initial results on ChefSearch.jsx
+        """
+        novice = register_user("novice@example.com")
+        veteran = register_user("veteran@example.com")
+        self._update(client, novice, years_of_experience=1, hourly_rate=40.0)
+        self._update(client, veteran, years_of_experience=15, hourly_rate=40.0)
+        
+        default = client.get("/api/chefs").json()
+        recommended = client.get("/api/chefs?sort=recommended").json()
+        
+        assert [chef["id"] for chef in default] == [veteran["id"], novice["id"]]
+        assert recommended == default
+    
+    def test_score_follows_rating_changes(self, client, register_user, db_session):
+        """
+        Test that the stored score is recomputed when a rating changes outside the API
+        """
+        from app.models import Chef
+        first = register_user("first@example.com")
+        second = register_user("second@example.com")
+        
+        chef = db_session.get(Chef, first["id"])
+        chef.rating, chef.total_bookings = 4.9, 40
+        db_session.commit()
+        
+        response = client.get("/api/chefs?sort=recommended")
+        
+        assert [chef["id"] for chef in response.json()] == [first["id"], second["id"]]
+    
+    def test_recommended_pages_with_cursor(self, client, register_user):
+        """
+        Test paging through recommended results
+        """
+        for i in range(3):
+            self._update(client, register_user(f"chef{i}@example.com"), years_of_experience=i)
+        
+        first = client.get("/api/chefs?sort=recommended&limit=2")
+        second = client.get(f"/api/chefs?sort=recommended&limit=2&cursor={first.headers['X-Next-Cursor']}")
+        
+        assert [chef["years_of_experience"] for chef in first.json() + second.json()] == [2, 1, 0]
+
+
+class TestChefFacets:
+    """Tests for filter counts: GET /api/chefs/facets"""
+    
+    def _create_chef(self, client, register_user, email, **fields):
+        chef = register_user(email)
+        client.put(f"/api/chefs/{chef['id']}", json=fields, headers={"Authorization": f"Bearer {chef['token']}"})
+        return chef
+    
+    def test_counts_per_facet(self, client, register_user):
+        """
+        Test cuisine, location and price counts for an unfiltered search
+        Frontend: Filter sidebar on ChefSearch.jsx
+        """
+        self._create_chef(client, register_user, "a@example.com", cuisines="Italian,French", location="Nairobi", hourly_rate=30.0)
+        self._create_chef(client, register_user, "b@example.com", cuisines="Italian", location="Nairobi", hourly_rate=45.0)
+        self._create_chef(client, register_user, "c@example.com", cuisines="Thai", location="Mombasa", hourly_rate=80.0)
+        
+        response = client.get("/api/chefs/facets")
+        
+        assert response.status_code == status.HTTP_200_OK
+        facets = response.json()
+        assert facets["total"] == 3
+        assert [(c["name"], c["count"]) for c in facets["cuisines"]] == [("Italian", 2), ("French", 1), ("Thai", 1)]
+        assert [(l["location"], l["count"]) for l in facets["locations"]] == [("Nairobi", 2), ("Mombasa", 1)]
+        assert [(p["min_price"], p["count"]) for p in facets["price"]] == [(25.0, 2), (75.0, 1)]
+    
+    def test_price_buckets_floor_rates(self, client, register_user):
+        """
+        Test that a rate half a width past a boundary stays in the lower bucket, and one on a boundary starts the next
+        """
+        self._create_chef(client, register_user, "a@example.com", hourly_rate=37.5)
+        self._create_chef(client, register_user, "b@example.com", hourly_rate=49.99)
+        self._create_chef(client, register_user, "c@example.com", hourly_rate=50.0)
+        
+        facets = client.get("/api/chefs/facets").json()
+        
+        assert [(p["min_price"], p["max_price"], p["count"]) for p in facets["price"]] == [(25.0, 50.0, 2), (50.0, 75.0, 1)]
+    
+    def test_facet_ignores_its_own_filter(self, client, register_user):
+        """
+        Test that picking a cuisine still counts the other cuisines, while other facets narrow
+        """
+        self._create_chef(client, register_user, "a@example.com", cuisines="Italian", location="Nairobi")
+        self._create_chef(client, register_user, "b@example.com", cuisines="Thai", location="Mombasa")
+        
+        facets = client.get("/api/chefs/facets?cuisine=Italian").json()
+        
+        assert facets["total"] == 1
+        assert {c["name"]: c["count"] for c in facets["cuisines"]} == {"Italian": 1, "Thai": 1}
+        assert [l["location"] for l in facets["locations"]] == ["Nairobi"]
+    
+    def test_unavailable_chefs_not_counted(self, client, register_user):
+        """
+        Test that only chefs shown in results are counted
+        """
+        self._create_chef(client, register_user, "a@example.com", cuisines="Italian", is_available=False)
+        
+        facets = client.get("/api/chefs/facets").json()
+        
+        assert facets["total"] == 0
+        assert facets["cuisines"] == []
+
+
+class TestAvailabilitySearch:
+    """Tests for searching by free time: GET /api/chefs?available_at= / ?date=&time=&duration="""
+    
+    SATURDAY_EVENING = "2025-12-20T18:00:00"
+    
+    def _book(self, client, register_user, chef, booking_date="2025-12-20", booking_time="17:00"):
+        customer = register_user(f"client{booking_time.replace(':', '')}@example.com", role="client")
+        response = client.post(
+            "/api/bookings",
+            json={"chef_id": chef["id"], "booking_date": booking_date, "booking_time": booking_time, "duration_hours": 2.0, "location": "Nairobi"},
+            headers={"Authorization": f"Bearer {customer['token']}"}
+        )
+        return response.json()["id"]
+    
+    def _set_calendar(self, client, chef, **calendar):
+        client.put(f"/api/chefs/{chef['id']}/availability", json=calendar, headers={"Authorization": f"Bearer {chef['token']}"})
+    
+    def _found(self, client, query):
+        return [chef["id"] for chef in client.get(f"/api/chefs?{query}").json()]
+    
+    def test_booked_chef_excluded(self, client, register_user):
+        """
+        Test that a chef with an overlapping booking is left out
+        Frontend: Date and time pickers on ChefSearch.jsx
+        """
+        booked = register_user("booked@example.com")
+        free = register_user("free@example.com")
+        self._book(client, register_user, booked)
+        
+        assert self._found(client, f"available_at={self.SATURDAY_EVENING}") == [free["id"]]
+        assert self._found(client, "date=2025-12-20&time=20:00&duration=2") == [free["id"], booked["id"]]
+    
+    def test_declined_booking_frees_chef(self, client, register_user):
+        """
+        Test that declined bookings don't block, and that cached results catch up
+        """
+        chef = register_user("chef@example.com")
+        booking_id = self._book(client, register_user, chef)
+        assert self._found(client, f"available_at={self.SATURDAY_EVENING}") == []
+        
+        client.patch(f"/api/bookings/{booking_id}", json={"status": "declined"}, headers={"Authorization": f"Bearer {chef['token']}"})
+        
+        assert self._found(client, f"available_at={self.SATURDAY_EVENING}") == [chef["id"]]
+    
+    def test_weekly_windows_and_exceptions(self, client, register_user):
+        """
+        Test that chefs are only found inside their windows and outside their days off
+        """
+        chef = register_user("chef@example.com")
+        self._set_calendar(
+            client, chef,
+            weekly=[{"weekday": 5, "start_time": "16:00", "end_time": "23:00"}],
+            exceptions=[{"date": "2025-12-27", "is_available": False}, {"date": "2025-12-22", "is_available": True, "start_time": "10:00", "end_time": "14:00"}],
+        )
+        
+        assert self._found(client, "available_at=2025-12-20T18:00&duration=3") == [chef["id"]]
+        assert self._found(client, "available_at=2025-12-20T21:00&duration=3") == []  # Runs past the window.
+        assert self._found(client, "available_at=2025-12-27T18:00&duration=3") == []  # Day off.
+        assert self._found(client, "available_at=2025-12-22T11:00&duration=2") == [chef["id"]]  # Extra hours on a Monday.
+    
+    def test_offset_times_rejected(self, client):
+        """
+        Test that a time with a UTC offset is refused rather than read as local booking time
+        """
+        response = client.get("/api/chefs", params={"available_at": "2025-12-20T18:30+03:00"})
+        
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        assert client.get("/api/chefs", params={"available_at": "2025-12-20T18:30Z"}).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    
+    def test_date_requires_time(self, client):
+        """
+        Test that date without time is rejected
+        """
+        response = client.get("/api/chefs?date=2025-12-20")
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
 # TODO: Add tests for:
-# - Pagination
-# - Sorting (by rating, price, etc.)
 # - Only show available chefs
@@ -0,0 +1,122 @@
+"""
+Tests for the Chef Search Result Cache
+
+Corresponds to frontend: src/features/search/ChefSearch.jsx
+Repeated searches are answered from memory; profile changes and new chefs
+must show up on the very next search all the same.
+"""
+from fastapi import status
+from app.utils.cache import LRUCache
+
+
+def _update(client, chef, **fields):
+    response = client.put(f"/api/chefs/{chef['id']}", json=fields, headers={"Authorization": f"Bearer {chef['token']}"})
+    assert response.status_code == status.HTTP_200_OK
+
+
+def _cache_stats(client):
+    return client.get("/api/metrics").json()["chef_search_cache"]
+
+
+class TestSearchCache:
+    """Tests for cached GET /api/chefs results and their invalidation"""
+
+    def test_repeated_search_is_a_hit(self, client, register_user):
+        """
+        Test that the same filters, written differently, hit the cache
+        Frontend: Going back to the results grid from a profile
+        """
+        chef = register_user("chef@example.com")
+        _update(client, chef, cuisines="Italian, French")
+
+        before = _cache_stats(client)
+
+        first = client.get("/api/chefs?cuisine=Italian,French")
+        second = client.get("/api/chefs?cuisine=french, ITALIAN")
+
+        assert second.json() == first.json()
+        after = _cache_stats(client)
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 1
+
+    def test_update_refreshes_pages_showing_the_chef(self, client, register_user):
+        """
+        Test that a price change shows up immediately on a cached page
+        Frontend: ChefProfile.jsx edit, then back to search
+        """
+        chef = register_user("chef@example.com")
+        client.get("/api/chefs")
+
+        _update(client, chef, hourly_rate=75.0)
+        response = client.get("/api/chefs")
+
+        assert response.json()[0]["hourly_rate"] == 75.0
+
+    def test_update_adds_chef_to_pages_it_now_matches(self, client, register_user):
+        """
+        Test that a chef appears in a cached search they newly qualify for
+        """
+        chef = register_user("chef@example.com")
+        assert client.get("/api/chefs?location=Nairobi").json() == []
+
+        _update(client, chef, location="Nairobi")
+        response = client.get("/api/chefs?location=Nairobi")
+
+        assert [result["id"] for result in response.json()] == [chef["id"]]
+
+    def test_registration_adds_new_chef(self, client, register_user):
+        """
+        Test that a newly registered chef shows up in a cached search
+        """
+        first = register_user("first@example.com")
+        client.get("/api/chefs")
+
+        second = register_user("second@example.com")
+        response = client.get("/api/chefs")
+
+        assert [result["id"] for result in response.json()] == [second["id"], first["id"]]
+
+    def test_unrelated_pages_stay_cached(self, client, register_user):
+        """
+        Test that an update only drops the pages it can affect
+        """
+        chef = register_user("chef@example.com")
+        _update(client, chef, hourly_rate=80.0, location="Nairobi")
+        client.get("/api/chefs?location=Mombasa")
+        before = _cache_stats(client)
+
+        _update(client, chef, hourly_rate=90.0)
+        client.get("/api/chefs?location=Mombasa")
+
+        assert _cache_stats(client)["hits"] - before["hits"] == 1
+
+
+class TestLRUCache:
+    """Tests for the bounded cache behind search results"""
+
+    def test_least_recently_used_entry_evicted(self):
+        cache = LRUCache(maxsize=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    def test_entries_expire(self):
+        now = [0.0]
+        cache = LRUCache(maxsize=2, ttl_seconds=30, clock=lambda: now[0])
+        cache.set("a", 1)
+
+        now[0] = 31.0
+
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_zero_size_disables_cache(self):
+        cache = LRUCache(maxsize=0, ttl_seconds=30)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None